@@ -4,7 +4,6 @@ Uses Playwright for JavaScript-rendered pages
 """
 import os
 import re
-import json
 import time
 import asyncio
 from datetime import datetime
@@ -19,6 +18,9 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from utils.storage import get_storage
 from utils.ai_extractor import extract_story_data
+from utils.prefilter import get_prefilter
+from utils.raw_archive import RawArchive
+from utils.url_canon import canonicalize
 
 load_dotenv()
 
@@ -91,14 +93,17 @@ class GoFundMeScraper:
             seen_urls = set()
             for link in links[:limit]:
                 href = await link.get_attribute('href')
-                if not href or href in seen_urls:
+                if not href:
                     continue
                 
-                full_url = f"https://www.gofundme.com{href}" if href.startswith('/') else href
+                # Search result links carry ?qid=... tracking params
+                full_url = canonicalize(f"https://www.gofundme.com{href}" if href.startswith('/') else href)
                 
                 # Skip non-campaign links
                 if '/f/' not in full_url or 'sign-up' in full_url or 'create' in full_url:
                     continue
+                if full_url in seen_urls:
+                    continue
                 
                 seen_urls.add(full_url)
                 campaigns.append({
@@ -195,6 +200,10 @@ class GoFundMeScraper:
             if not title or len(story) < 50:
                 return None
             
+            # Skip campaigns with no medical/cost vocabulary (memorials, pets, etc.)
+            if not get_prefilter().is_relevant(f"{title}\n\n{story}"):
+                return None
+            
             campaign_id = url.split('/')[-1]
             
             return {
@@ -218,6 +227,7 @@ class GoFundMeScraper:
         """Run full GoFundMe scrape"""
         all_campaigns = []
         campaign_urls = []
+        archive = None
         
         print("=" * 60)
         print("OASARA GOFUNDME SCRAPER - DATA LIBERATION PHASE 3")
@@ -244,26 +254,27 @@ class GoFundMeScraper:
             
             print(f"\n{len(unique_campaigns)} unique campaigns to scrape")
             
-            # Scrape each campaign
+            # Scrape each campaign, streaming results to the raw archive
+            archive = RawArchive(self.output_dir, 'gofundme')
             for campaign in tqdm(unique_campaigns, desc="Scraping campaigns"):
                 data = await self._scrape_campaign(campaign['url'])
                 if data:
                     data['search_query'] = campaign.get('search_query', '')
                     all_campaigns.append(data)
+                    archive.write(data)
                 await asyncio.sleep(1.5)
             
         finally:
             await self._close_browser()
+            if archive:
+                archive.close()
         
         print(f"\n{'=' * 60}")
         print(f"SCRAPE COMPLETE: {len(all_campaigns)} campaigns scraped")
         print(f"{'=' * 60}")
         
-        # Save raw data
-        output_file = self.output_dir / f"gofundme_raw_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-        with open(output_file, 'w') as f:
-            json.dump(all_campaigns, f, indent=2, default=str)
-        print(f"Raw data saved to: {output_file}")
+        if archive:
+            print(f"Raw data: {archive.summary()}")
         
         return all_campaigns
     
@@ -12,15 +12,13 @@ Sources:
 """
 import os
 import re
-import json
 import time
-import requests
+import hashlib
 from datetime import datetime
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Callable
 from pathlib import Path
 from dotenv import load_dotenv
 from tqdm import tqdm
-from bs4 import BeautifulSoup
 from urllib.parse import urljoin, urlparse
 
 # Add parent to path for utils
@@ -29,28 +27,54 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from utils.storage import get_storage
 from utils.ai_extractor import extract_story_data
+from utils.prefilter import get_prefilter
+from utils.raw_archive import RawArchive
+from utils.crawl_scheduler import CrawlScheduler
+from utils.http_cache import get_http_cache
+from utils.html_parser import HtmlNode, parse_html, extract_article
+from news.discovery import FeedDiscovery
+from utils.url_canon import canonicalize, dedup_key
 
 load_dotenv(override=True)
 
+# Crawl politeness (utils/crawl_scheduler.py): global worker cap across
+# domains, in-flight cap and minimum delay between requests per domain
+NEWS_MAX_WORKERS = int(os.getenv('NEWS_MAX_WORKERS', '16'))
+NEWS_DOMAIN_CONCURRENCY = int(os.getenv('NEWS_DOMAIN_CONCURRENCY', '2'))
+NEWS_DOMAIN_DELAY = float(os.getenv('NEWS_DOMAIN_DELAY', '1.0'))
+NEWS_RESPECT_ROBOTS = os.getenv('NEWS_RESPECT_ROBOTS', 'true').lower() == 'true'
+
+# Keep fetched article HTML in output/html/ (corpus for scripts/bench_html_parser.py)
+NEWS_SAVE_HTML = os.getenv('NEWS_SAVE_HTML', 'false').lower() == 'true'
+
 # News sources and their search/RSS endpoints
 NEWS_SOURCES = {
     'kff': {
         'name': 'KFF Health News',
         'search_url': 'https://kffhealthnews.org/?s={query}',
         'base_url': 'https://kffhealthnews.org',
+        'feeds': ['https://kffhealthnews.org/feed/'],
     },
     'npr': {
         'name': 'NPR Health',
         'search_url': 'https://www.npr.org/search?query={query}&page=1',
         'base_url': 'https://www.npr.org',
+        'feeds': ['https://feeds.npr.org/1128/rss.xml'],  # Health
     },
     'propublica': {
         'name': 'ProPublica',
         'search_url': 'https://www.propublica.org/search?q={query}',
         'base_url': 'https://www.propublica.org',
+        'feeds': ['https://www.propublica.org/feeds/propublica/main'],
     },
 }
 
+# Article discovery for NEWS_SOURCES: 'feeds' (RSS/Atom + sitemaps, see
+# news/discovery.py), 'search' (HTML site search pages) or 'both' (default,
+# so the KFF/NPR site searches keep running; 'feeds' drops them).
+# DuckDuckGo queries run in every mode - they cover outlets beyond NEWS_SOURCES.
+NEWS_DISCOVERY = os.getenv('NEWS_DISCOVERY', 'both').lower()
+
 # Search queries for finding healthcare stories
 SEARCH_QUERIES = [
     # Medical bills
@@ -102,49 +126,68 @@ class NewsScraper:
         self.scraped_count = 0
         self.output_dir = Path(__file__).parent / 'output'
         self.output_dir.mkdir(exist_ok=True)
-        self.session = requests.Session()
-        self.session.headers.update(HEADERS)
-
-    def _fetch_page(self, url: str, timeout: int = 30) -> Optional[BeautifulSoup]:
-        """Fetch and parse a web page"""
-        try:
-            resp = self.session.get(url, timeout=timeout)
-            if resp.status_code == 200:
-                return BeautifulSoup(resp.text, 'html.parser')
-            else:
-                print(f"  HTTP {resp.status_code} for {url}")
-                return None
-        except Exception as e:
-            print(f"  Error fetching {url}: {e}")
-            return None
+        self.scheduler = CrawlScheduler(
+            headers=HEADERS,
+            max_workers=NEWS_MAX_WORKERS,
+            per_domain_concurrency=NEWS_DOMAIN_CONCURRENCY,
+            default_delay=NEWS_DOMAIN_DELAY,
+            respect_robots=NEWS_RESPECT_ROBOTS,
+            cache=get_http_cache()
+        )
+
+    def _parse_html(self, html: str) -> HtmlNode:
+        return parse_html(html)
+
+    def _parse_handler(self, parse: Callable, *args) -> Callable:
+        """Crawl handler: parse the response body, then hand the document to parse(doc, *args)"""
+        return lambda resp: parse(self._parse_html(resp.text), *args)
+
+    def _article_handler(self, url: str) -> Callable:
+        parse = self._parse_handler(self._parse_article, url)
+        if not NEWS_SAVE_HTML:
+            return parse
+
+        html_dir = self.output_dir / 'html'
+        html_dir.mkdir(exist_ok=True)
+
+        def save_and_parse(resp):
+            name = hashlib.sha1(url.encode()).hexdigest()[:16]
+            (html_dir / f"{name}.html").write_text(resp.text, encoding='utf-8')
+            return parse(resp)
+        return save_and_parse
+
+    def _fetch_page(self, url: str) -> Optional[HtmlNode]:
+        """Fetch and parse a web page (through the politeness scheduler)"""
+        return self.scheduler.fetch(url, lambda resp: self._parse_html(resp.text))
 
     def _search_google_news(self, query: str, limit: int = 10) -> List[Dict[str, str]]:
         """Search Google News for healthcare articles"""
-        articles = []
+        doc = self._fetch_page(self._ddg_url(query))
+        return self._parse_ddg_results(doc, query, limit) if doc else []
 
+    def _ddg_url(self, query: str) -> str:
         # Use DuckDuckGo HTML search (more reliable than Google)
-        search_url = f"https://html.duckduckgo.com/html/?q={query.replace(' ', '+')}"
+        return f"https://html.duckduckgo.com/html/?q={query.replace(' ', '+')}"
 
+    def _parse_ddg_results(self, doc: HtmlNode, query: str, limit: int) -> List[Dict[str, str]]:
+        articles = []
         try:
-            soup = self._fetch_page(search_url)
-            if not soup:
-                return articles
-
             # Extract results
-            results = soup.select('.result__a')
+            results = doc.css('.result__a')
             for result in results[:limit]:
                 href = result.get('href', '')
-                title = result.get_text(strip=True)
+                title = result.text()
 
-                # Skip non-article links
-                if not href or 'duckduckgo' in href:
+                if not href:
                     continue
 
-                # Extract actual URL from DDG redirect
-                if 'uddg=' in href:
-                    import urllib.parse
-                    parsed = urllib.parse.parse_qs(urllib.parse.urlparse(href).query)
-                    href = parsed.get('uddg', [href])[0]
+                # Result links are //duckduckgo.com/l/?uddg=<target> redirects;
+                # canonicalize unwraps them (and drops tracking params)
+                href = canonicalize(urljoin('https://duckduckgo.com', href))
+
+                # Skip non-article links
+                if 'duckduckgo' in href:
+                    continue
 
                 articles.append({
                     'url': href,
@@ -159,20 +202,22 @@ class NewsScraper:
 
     def _search_kff(self, query: str, limit: int = 10) -> List[Dict[str, str]]:
         """Search KFF Health News"""
-        articles = []
-        search_url = NEWS_SOURCES['kff']['search_url'].format(query=query.replace(' ', '+'))
+        doc = self._fetch_page(self._kff_url(query))
+        return self._parse_kff_results(doc, query, limit) if doc else []
 
-        soup = self._fetch_page(search_url)
-        if not soup:
-            return articles
+    def _kff_url(self, query: str) -> str:
+        return NEWS_SOURCES['kff']['search_url'].format(query=query.replace(' ', '+'))
+
+    def _parse_kff_results(self, doc: HtmlNode, query: str, limit: int) -> List[Dict[str, str]]:
+        articles = []
 
         # KFF search results
-        results = soup.select('article a, .entry-title a, h2 a')
+        results = doc.css('article a, .entry-title a, h2 a')
         seen_urls = set()
 
         for result in results:
             href = result.get('href', '')
-            title = result.get_text(strip=True)
+            title = result.text()
 
             if not href or href in seen_urls:
                 continue
@@ -196,20 +241,22 @@ class NewsScraper:
 
     def _search_npr(self, query: str, limit: int = 10) -> List[Dict[str, str]]:
         """Search NPR Health"""
-        articles = []
-        search_url = f"https://www.npr.org/search?query={query.replace(' ', '+')}&page=1"
+        doc = self._fetch_page(self._npr_url(query))
+        return self._parse_npr_results(doc, query, limit) if doc else []
+
+    def _npr_url(self, query: str) -> str:
+        return NEWS_SOURCES['npr']['search_url'].format(query=query.replace(' ', '+'))
 
-        soup = self._fetch_page(search_url)
-        if not soup:
-            return articles
+    def _parse_npr_results(self, doc: HtmlNode, query: str, limit: int) -> List[Dict[str, str]]:
+        articles = []
 
         # NPR search results
-        results = soup.select('article a, .title a, h2 a')
+        results = doc.css('article a, .title a, h2 a')
         seen_urls = set()
 
         for result in results:
             href = result.get('href', '')
-            title = result.get_text(strip=True)
+            title = result.text()
 
             if not href or href in seen_urls or len(title) < 10:
                 continue
@@ -237,100 +284,22 @@ class NewsScraper:
         if self.storage.story_exists(url):
             return None
 
-        soup = self._fetch_page(url)
-        if not soup:
-            return None
-
-        # Extract title
-        title = ''
-        for selector in ['h1', 'meta[property="og:title"]', '.headline', '.entry-title']:
-            elem = soup.select_one(selector)
-            if elem:
-                title = elem.get('content') if elem.name == 'meta' else elem.get_text(strip=True)
-                if title:
-                    break
-
-        if not title:
+        doc = self._fetch_page(url)
+        if not doc:
             return None
+        return self._parse_article(doc, url)
 
-        # Extract content
-        content = ''
-
-        # Try common article body selectors
-        body_selectors = [
-            'article .story-text',
-            'article .entry-content',
-            '.article-body',
-            '.story-body',
-            '.post-content',
-            '.article__body',
-            'article p',
-            '.content p',
-        ]
-
-        for selector in body_selectors:
-            paragraphs = soup.select(selector)
-            if paragraphs:
-                content = '\n\n'.join(p.get_text(strip=True) for p in paragraphs if len(p.get_text(strip=True)) > 30)
-                if len(content) > 200:
-                    break
-
-        if len(content) < 100:
-            # Fallback: get all paragraphs from main content
-            main = soup.select_one('main, article, .content, .post')
-            if main:
-                paragraphs = main.find_all('p')
-                content = '\n\n'.join(p.get_text(strip=True) for p in paragraphs if len(p.get_text(strip=True)) > 30)
-
-        if len(content) < 100:
+    def _parse_article(self, doc: HtmlNode, url: str) -> Optional[Dict[str, Any]]:
+        """Pull title, body, images, date and author out of a fetched article"""
+        article = extract_article(doc, url)
+        if not article:
             return None
 
-        # Extract images
-        images = []
-        og_image = soup.select_one('meta[property="og:image"]')
-        if og_image:
-            img_url = og_image.get('content')
-            if img_url:
-                images.append(img_url)
-
-        # Article images
-        for img in soup.select('article img, .article-body img, .story-body img')[:3]:
-            src = img.get('src') or img.get('data-src')
-            if src and src not in images:
-                if not src.startswith('http'):
-                    src = urljoin(url, src)
-                images.append(src)
-
-        # Extract publish date
-        publish_date = None
-        date_selectors = [
-            'meta[property="article:published_time"]',
-            'time[datetime]',
-            '.publish-date',
-            '.date',
-        ]
-        for selector in date_selectors:
-            elem = soup.select_one(selector)
-            if elem:
-                date_str = elem.get('content') or elem.get('datetime') or elem.get_text(strip=True)
-                if date_str:
-                    publish_date = date_str
-                    break
-
-        # Extract author
-        author = ''
-        author_selectors = [
-            'meta[name="author"]',
-            '.author',
-            '.byline',
-            '[rel="author"]',
-        ]
-        for selector in author_selectors:
-            elem = soup.select_one(selector)
-            if elem:
-                author = elem.get('content') or elem.get_text(strip=True)
-                if author:
-                    break
+        # Prefer the page's own canonical link (AMP/mobile/syndicated copies
+        # point back at the original), unless it's just the homepage
+        declared = article.pop('canonical', None)
+        if declared and urlparse(declared).path.strip('/'):
+            url = canonicalize(declared)
 
         # Determine source from URL
         domain = urlparse(url).netloc.lower()
@@ -348,11 +317,7 @@ class NewsScraper:
 
         return {
             'url': url,
-            'title': title,
-            'content': content,
-            'images': images[:5],
-            'author': author,
-            'publish_date': publish_date,
+            **article,
             'source_name': source_name,
             'source': 'news',
             'scraped_at': datetime.now().isoformat(),
@@ -360,17 +325,11 @@ class NewsScraper:
 
     def _is_healthcare_relevant(self, text: str) -> bool:
         """Quick relevance check for healthcare content"""
-        text_lower = text.lower()
-        keywords = [
-            'bill', 'cost', 'hospital', 'insurance', 'medical', 'healthcare',
-            'debt', 'denied', 'coverage', 'surgery', 'treatment', 'patient',
-            'doctor', 'prescription', 'ambulance', 'emergency', 'diagnosis',
-            'premium', 'deductible', 'copay', 'claim', 'itemized'
-        ]
-        return sum(1 for kw in keywords if kw in text_lower) >= 3
-
-    def run_full_scrape(self, articles_per_query: int = 5) -> List[Dict[str, Any]]:
+        return get_prefilter('news').is_relevant(text, min_keywords=3)
+
+    def run_full_scrape(self, articles_per_query: int = 5, discovery: Optional[str] = None) -> List[Dict[str, Any]]:
         """Run full news scrape across all sources"""
+        discovery = (discovery or NEWS_DISCOVERY).lower()
         all_articles = []
         article_urls = []
 
@@ -378,66 +337,82 @@ class NewsScraper:
         print("OASARA NEWS SCRAPER - DATA LIBERATION PHASE 3")
         print("=" * 60)
 
-        # Search KFF Health News
-        print("\n📰 Searching KFF Health News...")
-        for query in SEARCH_QUERIES[:8]:  # Limit queries per source
-            print(f"  Query: '{query}'")
-            results = self._search_kff(query, articles_per_query)
-            article_urls.extend(results)
-            print(f"    Found {len(results)} articles")
-            time.sleep(1)
-
-        # Search NPR
-        print("\n📰 Searching NPR Health...")
-        for query in SEARCH_QUERIES[:8]:
-            print(f"  Query: '{query}'")
-            results = self._search_npr(query, articles_per_query)
+        # All searches go through one crawl: different sites run in parallel,
+        # each site paced by its own delay / robots.txt crawl-delay
+        searches = [('DuckDuckGo', self._ddg_url, self._parse_ddg_results, GOOGLE_NEWS_QUERIES)]
+        if discovery in ('search', 'both'):
+            searches = [
+                ('KFF Health News', self._kff_url, self._parse_kff_results, SEARCH_QUERIES[:8]),
+                ('NPR Health', self._npr_url, self._parse_npr_results, SEARCH_QUERIES[:8]),
+            ] + searches
+
+        if discovery in ('feeds', 'both'):
+            print("\n📡 Discovering articles from feeds and sitemaps...")
+            feeds = FeedDiscovery(self.scheduler, NEWS_SOURCES, SEARCH_QUERIES, self.output_dir)
+            article_urls.extend(feeds.discover(limit_per_source=articles_per_query * len(SEARCH_QUERIES)))
+            print(f"  {feeds.summary()}")
+
+        jobs, labels = [], {}
+        for label, build_url, parse, queries in searches:
+            for query in queries:
+                url = build_url(query)
+                labels[url] = (label, query)
+                jobs.append((url, self._parse_handler(parse, query, articles_per_query)))
+
+        print(f"\n📰 Searching {len(searches)} sources ({len(jobs)} queries)...")
+        for url, results in self.scheduler.crawl(jobs):
+            label, query = labels[url]
+            results = results or []
             article_urls.extend(results)
-            print(f"    Found {len(results)} articles")
-            time.sleep(1)
-
-        # Search via DuckDuckGo for broader coverage
-        print("\n📰 Searching news via DuckDuckGo...")
-        for query in GOOGLE_NEWS_QUERIES:
-            print(f"  Query: '{query}'")
-            results = self._search_google_news(query, articles_per_query)
-            article_urls.extend(results)
-            print(f"    Found {len(results)} articles")
-            time.sleep(2)
+            print(f"  [{label}] '{query}': {len(results)} articles")
 
-        # Deduplicate URLs
+        # Deduplicate URLs (mobile/AMP/tracking variants collapse to one)
         seen_urls = set()
         unique_articles = []
         for article in article_urls:
-            url = article['url']
-            # Normalize URL
-            url = url.split('?')[0].rstrip('/')
-            if url not in seen_urls:
-                seen_urls.add(url)
+            article['url'] = canonicalize(article['url'])
+            key = dedup_key(article['url'])
+            if key not in seen_urls:
+                seen_urls.add(key)
                 unique_articles.append(article)
 
         print(f"\n{len(unique_articles)} unique articles to scrape")
 
-        # Scrape each article
-        for article in tqdm(unique_articles, desc="Extracting articles"):
-            data = self._extract_article(article['url'])
+        # Fetch articles concurrently across domains, streaming relevant ones to the raw archive
+        pending = {
+            article['url']: article for article in unique_articles
+            if not self.storage.story_exists(article['url'])
+        }
+        jobs = [(url, self._article_handler(url)) for url in pending]
+
+        archive = RawArchive(self.output_dir, 'news')
+        fetched_keys = set()
+        for url, data in tqdm(self.scheduler.crawl(jobs), total=len(jobs), desc="Extracting articles"):
+            article = pending[url]
             if data:
+                # The page's declared canonical URL may reveal a copy of an
+                # article already fetched this run or already stored
+                key = dedup_key(data['url'])
+                if key in fetched_keys or (data['url'] != url and self.storage.story_exists(data['url'])):
+                    continue
+                fetched_keys.add(key)
+
                 # Quick relevance check
                 full_text = f"{data['title']} {data['content']}"
                 if self._is_healthcare_relevant(full_text):
                     data['search_query'] = article.get('query', '')
                     all_articles.append(data)
-            time.sleep(1.5)
+                    archive.write(data)
 
         print(f"\n{'=' * 60}")
         print(f"SCRAPE COMPLETE: {len(all_articles)} relevant articles")
         print(f"{'=' * 60}")
 
-        # Save raw data
-        output_file = self.output_dir / f"news_raw_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-        with open(output_file, 'w') as f:
-            json.dump(all_articles, f, indent=2, default=str)
-        print(f"Raw data saved to: {output_file}")
+        archive.close()
+        print(f"Raw data: {archive.summary()}")
+        print(f"Crawl: {self.scheduler.summary()}")
+        if self.scheduler.cache:
+            print(f"HTTP cache: {self.scheduler.cache.summary()}")
 
         return all_articles
 
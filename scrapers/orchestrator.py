@@ -12,7 +12,7 @@ import json
 import time
 import argparse
 import subprocess
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from typing import Dict, Any, List, Optional
 from dataclasses import dataclass, asdict
@@ -25,7 +25,10 @@ SCRAPERS_DIR = Path(__file__).parent
 sys.path.insert(0, str(SCRAPERS_DIR))
 
 from utils.storage import get_storage
+from utils.extraction_cache import get_extraction_cache
+from utils.near_dup import get_near_dup_index
 from processing.ocr_redaction import BillProcessor
+from processing.renditions import RenditionBuilder, RENDITION_RETRY_HOURS
 
 
 @dataclass
@@ -89,10 +92,8 @@ class Orchestrator:
             elif scraper_name == 'twitter':
                 from twitter.scraper import TwitterScraper
                 scraper = TwitterScraper()
-                posts = scraper.run_full_scrape(
-                    query_limit=kwargs.get('limit', 50),
-                    account_limit=kwargs.get('account_limit', 30)
-                )
+                # Incremental (since_id) search; caps come from TWITTER_MAX_TWEETS_*
+                posts = scraper.run_full_scrape()
                 saved = scraper.extract_and_save(posts) if posts else 0
                 
             elif scraper_name == 'gofundme':
@@ -211,6 +212,13 @@ class Orchestrator:
             'total_errors': total_errors,
             'scrapers': [asdict(r) for r in self.results],
         }
+
+        cache = get_extraction_cache()
+        if cache:
+            summary['extraction_cache'] = cache.stats()
+        near_dup = get_near_dup_index()
+        if near_dup:
+            summary['near_duplicates'] = near_dup.stats()
         
         self.log("\n" + "=" * 60)
         self.log("SCRAPE SUMMARY")
@@ -220,6 +228,10 @@ class Orchestrator:
         self.log(f"Total images uploaded: {total_images}")
         self.log(f"Total videos processed: {total_videos}")
         self.log(f"Total duration: {total_duration/60:.1f} minutes")
+        for kind, counts in summary.get('extraction_cache', {}).get('session', {}).items():
+            self.log(f"Extraction cache ({kind}): {counts['hits']} hits, {counts['hit_rate'] * 100:.1f}% hit rate")
+        for source, counts in summary.get('near_duplicates', {}).items():
+            self.log(f"Near-duplicates ({source}): {counts['suppressed']} suppressed of {counts['checked']} checked")
         self.log("=" * 60)
         
         return summary
@@ -259,6 +271,35 @@ class Orchestrator:
         
         self.log(f"Processed OCR for {processed} stories")
     
+    def process_pending_renditions(self, limit: int = 20):
+        """
+        Build faststart MP4 + HLS + poster for story videos that don't have them
+        Never-tried videos go first; failed ones wait RENDITION_RETRY_HOURS
+        """
+        self.log("Building web renditions for story videos...")
+        
+        retry_before = (datetime.now(timezone.utc) - timedelta(hours=RENDITION_RETRY_HOURS)).strftime('%Y-%m-%dT%H:%M:%SZ')
+        result = self.storage.supabase.table('stories') \
+            .select('id, source_platform, video_url, nas_video_path, video_thumbnail_url') \
+            .not_.is_('video_url', 'null').is_('video_hls_url', 'null') \
+            .or_(f'video_renditions_attempted_at.is.null,video_renditions_attempted_at.lt."{retry_before}"') \
+            .order('video_renditions_attempted_at', nullsfirst=True).limit(limit).execute()
+        
+        if not result.data:
+            self.log("No videos pending renditions")
+            return
+        
+        builder = RenditionBuilder()
+        for story in result.data:
+            fields = builder.render_story(story) or {}
+            fields['video_renditions_attempted_at'] = datetime.now(timezone.utc).isoformat()
+            try:
+                self.storage.supabase.table('stories').update(fields).eq('id', story['id']).execute()
+            except Exception as e:
+                self.log(f"Rendition update error for story {story['id']}: {e}", level='ERROR')
+        
+        self.log(f"Renditions: {builder.summary()}")
+    
     def sync_to_nas(self):
         """
         Sync R2 bucket to NAS using rclone
@@ -323,6 +364,7 @@ Examples:
   python orchestrator.py --scrapers reddit twitter # Run specific scrapers
   python orchestrator.py --limit 100              # Increase per-source limit
   python orchestrator.py --ocr                    # Process pending OCR
+  python orchestrator.py --renditions             # Faststart MP4/HLS/poster for story videos
   python orchestrator.py --sync                   # Sync to NAS
   python orchestrator.py --stats                  # Show current stats
   python orchestrator.py --dry-run                # Preview without running
@@ -334,6 +376,7 @@ Examples:
                         help='Specific scrapers to run')
     parser.add_argument('--limit', type=int, default=50, help='Posts per source (default: 50)')
     parser.add_argument('--ocr', action='store_true', help='Process pending OCR tasks')
+    parser.add_argument('--renditions', action='store_true', help='Build web renditions for story videos')
     parser.add_argument('--sync', action='store_true', help='Sync R2 to NAS')
     parser.add_argument('--stats', action='store_true', help='Show current stats')
     parser.add_argument('--dry-run', action='store_true', help='Preview without running')
@@ -356,10 +399,13 @@ Examples:
     if args.ocr:
         orchestrator.process_pending_ocr()
     
+    if args.renditions:
+        orchestrator.process_pending_renditions()
+    
     if args.sync:
         orchestrator.sync_to_nas()
     
-    if not any([args.all, args.scrapers, args.ocr, args.sync, args.stats]):
+    if not any([args.all, args.scrapers, args.ocr, args.renditions, args.sync, args.stats]):
         parser.print_help()
 
 
@@ -1,5 +1,9 @@
 from .ocr_redaction import BillProcessor, process_story_images
+from .transcription import TranscriptionService, get_transcriber
+from .keyframes import KeyframeScanner, get_keyframe_scanner, process_story_video
+from .renditions import RenditionBuilder
 
-__all__ = ['BillProcessor', 'process_story_images']
-
-
+__all__ = [
+    'BillProcessor', 'process_story_images', 'TranscriptionService', 'get_transcriber',
+    'KeyframeScanner', 'get_keyframe_scanner', 'process_story_video', 'RenditionBuilder',
+]
@@ -0,0 +1,280 @@
+"""
+Keyframe OCR for bills shown inside videos
+People hold their bill up to the camera or show it as a screenshot; this
+finds those frames and runs them through BillProcessor, at a bounded cost
+per video so the whole NAS archive can be scanned:
+
+    scanner = get_keyframe_scanner()
+    result = scanner.scan('/mnt/nas/oasara/scraped/youtube/videos/abc.mp4')
+    result['amounts'], result['ocr_text'], result['frames']
+    print(scanner.summary())
+
+1. Scene pass: ffmpeg decodes keyframes only (-skip_frame nokey), scales
+   them to KEYFRAME_PREVIEW_WIDTH and keeps those past the scene-change
+   threshold - never a full-rate decode, and at most
+   KEYFRAME_MAX_CANDIDATES previews from the first KEYFRAME_SCAN_SECONDS
+2. Dedup: a 64-bit perceptual hash (DCT of the 32x32 grayscale preview)
+   drops frames within KEYFRAME_HASH_DISTANCE bits of one already kept,
+   so a bill shown for a minute (or cut back to) is read once
+3. Ranking: previews are scored by the density of high-contrast edges
+   (text-heavy frames score high, faces and scenery low); the top
+   KEYFRAME_MAX_OCR above KEYFRAME_MIN_TEXT_SCORE are re-extracted at
+   KEYFRAME_OCR_WIDTH and OCRed, everything else never reaches OCR
+"""
+import os
+import re
+import time
+import shutil
+import tempfile
+import threading
+import subprocess
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+from PIL import Image
+from dotenv import load_dotenv
+
+from .ocr_redaction import BillProcessor
+
+load_dotenv()
+
+KEYFRAME_OCR_ENABLED = os.getenv('KEYFRAME_OCR_ENABLED', 'true').lower() == 'true'
+KEYFRAME_SCENE_THRESHOLD = float(os.getenv('KEYFRAME_SCENE_THRESHOLD', '0.3'))
+KEYFRAME_PREVIEW_WIDTH = int(os.getenv('KEYFRAME_PREVIEW_WIDTH', '320'))
+KEYFRAME_OCR_WIDTH = int(os.getenv('KEYFRAME_OCR_WIDTH', '1600'))
+KEYFRAME_SCAN_SECONDS = int(os.getenv('KEYFRAME_SCAN_SECONDS', '1800'))    # 0 = whole video
+KEYFRAME_MAX_CANDIDATES = int(os.getenv('KEYFRAME_MAX_CANDIDATES', '120'))
+KEYFRAME_MAX_OCR = int(os.getenv('KEYFRAME_MAX_OCR', '6'))
+KEYFRAME_HASH_DISTANCE = int(os.getenv('KEYFRAME_HASH_DISTANCE', '10'))
+KEYFRAME_MIN_TEXT_SCORE = float(os.getenv('KEYFRAME_MIN_TEXT_SCORE', '0.02'))
+
+_PTS_TIME = re.compile(r'pts_time:\s*([\d.]+)')
+
+# Orthonormal DCT-II basis for the 32x32 pHash
+_N = 32
+_DCT = np.sqrt(2.0 / _N) * np.cos(np.pi * np.outer(np.arange(_N), 2 * np.arange(_N) + 1) / (2 * _N))
+_DCT[0] /= np.sqrt(2.0)
+
+
+def phash(image: Image.Image) -> int:
+    """64-bit perceptual hash: low 8x8 DCT coefficients above/below their median"""
+    pixels = np.asarray(image.convert('L').resize((_N, _N), Image.LANCZOS), dtype=np.float64)
+    low = (_DCT @ pixels @ _DCT.T)[:8, :8].flatten()
+    bits = low > np.median(low[1:])  # DC term would dominate the median
+    return int(''.join('1' if b else '0' for b in bits), 2)
+
+
+def hamming(a: int, b: int) -> int:
+    return bin(a ^ b).count('1')
+
+
+def text_score(image: Image.Image) -> float:
+    """Share of pixels on a strong horizontal edge - high for printed text"""
+    pixels = np.asarray(image.convert('L'), dtype=np.int16)
+    if pixels.shape[1] < 2:
+        return 0.0
+    return float((np.abs(np.diff(pixels, axis=1)) > 48).mean())
+
+
+def sample_keyframes(
+    video_path: str,
+    out_dir: str,
+    threshold: float = KEYFRAME_SCENE_THRESHOLD,
+    width: int = KEYFRAME_PREVIEW_WIDTH,
+    max_frames: int = KEYFRAME_MAX_CANDIDATES,
+    scan_seconds: int = KEYFRAME_SCAN_SECONDS,
+    timeout: int = 600
+) -> List[Tuple[float, str]]:
+    """
+    Low-res previews of the scene-change keyframes (plus the first frame)
+    as [(seconds, jpg path)]. Raises RuntimeError if ffmpeg fails.
+    """
+    cmd = ['ffmpeg', '-nostdin', '-y', '-hide_banner', '-skip_frame', 'nokey']
+    if scan_seconds:
+        cmd += ['-t', str(scan_seconds)]
+    cmd += [
+        '-i', video_path, '-an', '-sn',
+        '-vf', f"scale={width}:-2,select='eq(n,0)+gt(scene,{threshold})',showinfo",
+        '-vsync', 'vfr', '-frames:v', str(max_frames), '-q:v', '4',
+        os.path.join(out_dir, 'preview_%04d.jpg'),
+    ]
+    result = subprocess.run(cmd, capture_output=True, text=True, timeout=timeout)
+    if result.returncode != 0:
+        raise RuntimeError(f"ffmpeg failed for {video_path}: {result.stderr.strip()[-300:]}")
+    # showinfo logs one line per frame that passed select, in output order
+    times = [float(t) for line in result.stderr.splitlines()
+             if 'Parsed_showinfo' in line for t in _PTS_TIME.findall(line)]
+    previews = sorted(Path(out_dir).glob('preview_*.jpg'))
+    return [(times[i] if i < len(times) else 0.0, str(path)) for i, path in enumerate(previews)]
+
+
+def extract_frame(video_path: str, seconds: float, dst: str, width: int = KEYFRAME_OCR_WIDTH, timeout: int = 60):
+    """Decode the keyframe at `seconds` at OCR resolution (never upscaled)"""
+    cmd = [
+        'ffmpeg', '-nostdin', '-y', '-loglevel', 'error', '-skip_frame', 'nokey',
+        '-ss', f'{seconds:.3f}', '-i', video_path, '-an', '-sn',
+        '-vf', f"scale='min({width},iw)':-2", '-frames:v', '1', '-q:v', '2', dst,
+    ]
+    result = subprocess.run(cmd, capture_output=True, text=True, timeout=timeout)
+    if result.returncode != 0 or not os.path.exists(dst):
+        raise RuntimeError(f"ffmpeg could not extract {seconds:.1f}s of {video_path}: {result.stderr.strip()[:300]}")
+
+
+class KeyframeScanner:
+    """Scene-change keyframe sampling + pHash dedup in front of BillProcessor"""
+
+    def __init__(
+        self,
+        processor: Optional[BillProcessor] = None,
+        threshold: float = KEYFRAME_SCENE_THRESHOLD,
+        max_ocr: int = KEYFRAME_MAX_OCR,
+        hash_distance: int = KEYFRAME_HASH_DISTANCE,
+        min_text_score: float = KEYFRAME_MIN_TEXT_SCORE
+    ):
+        self._processor = processor
+        self.threshold = threshold
+        self.max_ocr = max_ocr
+        self.hash_distance = hash_distance
+        self.min_text_score = min_text_score
+        self._lock = threading.Lock()
+        self.stats = {
+            'videos': 0,
+            'failed': 0,
+            'keyframes': 0,
+            'unique': 0,
+            'ocr_frames': 0,
+            'bill_frames': 0,
+            'sample_seconds': 0.0,
+            'ocr_seconds': 0.0,
+        }
+
+    @property
+    def processor(self) -> BillProcessor:
+        """BillProcessor, created on first use (its init probes the OCR backends)"""
+        with self._lock:
+            if self._processor is None:
+                self._processor = BillProcessor()
+        return self._processor
+
+    def _add(self, **amounts):
+        with self._lock:
+            for key, value in amounts.items():
+                self.stats[key] += value
+
+    def _select(self, previews: List[Tuple[float, str]]) -> Tuple[List[Tuple[float, float]], int]:
+        """(seconds, text score) of the frames worth OCR, in time order, and the unique count"""
+        kept: List[Tuple[float, float, int]] = []
+        for seconds, path in previews:
+            with Image.open(path) as image:
+                digest = phash(image)
+                if any(hamming(digest, h) <= self.hash_distance for _, _, h in kept):
+                    continue
+                kept.append((seconds, text_score(image), digest))
+        texty = [(s, score) for s, score, _ in kept if score >= self.min_text_score]
+        best = sorted(texty, key=lambda item: item[1], reverse=True)[:self.max_ocr]
+        return sorted(best), len(kept)
+
+    def scan(self, video_path: str, save_dir: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """
+        OCR the distinct text-heavy keyframes of one video. Redacted frames
+        with dollar amounts are written to save_dir when given. Returns None
+        if the video can't be decoded.
+        """
+        workdir = tempfile.mkdtemp(prefix='keyframes-')
+        try:
+            start = time.monotonic()
+            try:
+                previews = sample_keyframes(video_path, workdir, threshold=self.threshold)
+                selected, unique = self._select(previews)
+            except Exception as e:
+                self._add(failed=1)
+                print(f"Keyframe sampling failed for {video_path}: {e}")
+                return None
+            sampled = time.monotonic()
+
+            frames = []
+            for seconds, score in selected:
+                frame_path = os.path.join(workdir, f"frame_{seconds:09.3f}.jpg")
+                try:
+                    extract_frame(video_path, seconds, frame_path)
+                    result = self.processor.process_image(frame_path)
+                except Exception as e:
+                    print(f"Frame OCR failed at {seconds:.1f}s of {video_path}: {e}")
+                    continue
+                frame = {
+                    'time': seconds,
+                    'text_score': round(score, 3),
+                    'amounts': result['amounts'],
+                    'shock_value': result['shock_value'],
+                    'pii_found': result['pii_found'],
+                    'summary': result['summary'],
+                    'redacted_text': result['redacted_text'],
+                    'redacted_path': None,
+                }
+                if save_dir and result['amounts'] and result.get('redacted_image') is not None:
+                    Path(save_dir).mkdir(parents=True, exist_ok=True)
+                    dst = Path(save_dir) / f"{Path(video_path).stem}_{int(seconds * 1000):08d}.jpg"
+                    result['redacted_image'].save(dst, quality=90)
+                    frame['redacted_path'] = str(dst)
+                frames.append(frame)
+            done = time.monotonic()
+        finally:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+        bills = [f for f in frames if f['amounts']]
+        amounts = sorted({a for f in bills for a in f['amounts']}, reverse=True)
+        self._add(
+            videos=1, keyframes=len(previews), unique=unique, ocr_frames=len(frames),
+            bill_frames=len(bills), sample_seconds=sampled - start, ocr_seconds=done - sampled
+        )
+        return {
+            'path': video_path,
+            'keyframes': len(previews),
+            'unique': unique,
+            'frames': frames,
+            'amounts': amounts,
+            'shock_value': amounts[0] if amounts else 0,
+            'ocr_text': '\n\n---\n\n'.join(f['redacted_text'] for f in bills if f['redacted_text']),
+            'seconds': done - start,
+        }
+
+    def summary(self) -> str:
+        s = self.stats
+        if not s['videos'] and not s['failed']:
+            return "no videos scanned"
+        per_video = (s['sample_seconds'] + s['ocr_seconds']) / s['videos'] if s['videos'] else 0.0
+        return (f"{s['videos']} videos ({s['failed']} failed): {s['keyframes']} scene keyframes -> "
+                f"{s['unique']} distinct -> {s['ocr_frames']} OCRed, {s['bill_frames']} with amounts; "
+                f"sampling {s['sample_seconds']:.0f}s, OCR {s['ocr_seconds']:.0f}s, {per_video:.1f}s per video")
+
+
+def process_story_video(story: Dict[str, Any], video_path: str, save_dir: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Add amounts/text read from the video's keyframes to a story record
+    (merged with any image OCR already on it)
+    """
+    result = get_keyframe_scanner().scan(video_path, save_dir=save_dir)
+    if not result or not result['amounts']:
+        return story
+
+    amounts = set(story.get('ocr_amounts') or []) | set(result['amounts'])
+    story['ocr_amounts'] = sorted(amounts, reverse=True)
+    story['ocr_text'] = '\n\n---\n\n'.join(t for t in (story.get('ocr_text'), result['ocr_text']) if t)
+
+    # Update cost if not already set
+    if not story.get('cost_us'):
+        story['cost_us'] = result['shock_value']
+
+    return story
+
+
+# Singleton instance
+_scanner = None
+
+def get_keyframe_scanner() -> KeyframeScanner:
+    """Process-wide scanner, so BillProcessor probes its OCR backends once"""
+    global _scanner
+    if _scanner is None:
+        _scanner = KeyframeScanner()
+    return _scanner
@@ -0,0 +1,276 @@
+"""
+Web renditions for NAS-hosted videos
+Story pages used to stream the raw download (often a 1080p file of several
+hundred MB) over the NAS tunnel. For each story video this writes, under
+NAS_MOUNT_PATH/VIDEO_WEB_DIR/<platform>/<name>/:
+
+    video.mp4        H.264/AAC, moov atom first (+faststart) so playback
+                     starts before the file is downloaded; remuxed when the
+                     source already fits, else capped at the top rung
+    hls/master.m3u8  segmented HLS ladder (VIDEO_RENDITIONS, height:kbps),
+                     rungs taller than the source skipped, keyframes aligned
+                     to HLS_SEGMENT_SECONDS so players can switch bitrates
+    poster.jpg       keyframe ~10% in (skips black intros)
+
+    builder = RenditionBuilder()
+    fields = builder.render_story(story)   # {'video_url', 'video_hls_url', 'video_poster_url', ...}
+    print(builder.summary())
+
+Only ffmpeg is needed (the source is probed from `ffmpeg -i` output).
+"""
+import os
+import re
+import time
+import shutil
+import tempfile
+import threading
+import subprocess
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import requests
+from dotenv import load_dotenv
+
+load_dotenv()
+
+NAS_MOUNT_PATH = os.getenv('NAS_MOUNT_PATH', '/mnt/nas/oasara')
+NAS_WEB_URL = os.getenv('NAS_WEB_URL', 'http://10.0.0.30:5000/oasara')
+# Public base that serves NAS_MOUNT_PATH (the tunnel the site loads media from)
+VIDEO_PUBLIC_URL = os.getenv('VIDEO_PUBLIC_URL', 'https://oasara-media.daylightfreedom.net').rstrip('/')
+VIDEO_WEB_DIR = os.getenv('VIDEO_WEB_DIR', 'web')
+VIDEO_RENDITIONS = os.getenv('VIDEO_RENDITIONS', '720:2500,360:800')   # height:kbps
+HLS_SEGMENT_SECONDS = int(os.getenv('HLS_SEGMENT_SECONDS', '4'))
+VIDEO_X264_PRESET = os.getenv('VIDEO_X264_PRESET', 'veryfast')
+# Hours before a video whose renditions failed is tried again
+RENDITION_RETRY_HOURS = float(os.getenv('RENDITION_RETRY_HOURS', '24'))
+
+_DURATION = re.compile(r'Duration:\s*(\d+):(\d+):([\d.]+)')
+_VIDEO = re.compile(r'Stream #\S+.*?: Video: (\w+).*?, (\d{2,5})x(\d{2,5})[,\s]')
+_FPS = re.compile(r'([\d.]+) fps')
+_AUDIO = re.compile(r'Stream #\S+.*?: Audio: (\w+)')
+
+
+def parse_ladder(spec: str = VIDEO_RENDITIONS) -> List[Tuple[int, int]]:
+    """'720:2500,360:800' -> [(720, 2500), (360, 800)], tallest first"""
+    rungs = []
+    for item in spec.split(','):
+        height, _, kbps = item.strip().partition(':')
+        if height and kbps:
+            rungs.append((int(height), int(kbps)))
+    return sorted(rungs, reverse=True)
+
+
+def probe(src: str, timeout: int = 60) -> Dict[str, Any]:
+    """Duration, size and codecs from `ffmpeg -i`. Raises RuntimeError if there is no video stream."""
+    result = subprocess.run(['ffmpeg', '-nostdin', '-hide_banner', '-i', src],
+                            capture_output=True, text=True, timeout=timeout)
+    video = _VIDEO.search(result.stderr)
+    if not video:
+        raise RuntimeError(f"No video stream in {src}: {result.stderr.strip()[-300:]}")
+    duration = _DURATION.search(result.stderr)
+    fps = _FPS.search(result.stderr[video.start():])
+    audio = _AUDIO.search(result.stderr)
+    return {
+        'duration': (int(duration.group(1)) * 3600 + int(duration.group(2)) * 60
+                     + float(duration.group(3))) if duration else 0.0,
+        'video_codec': video.group(1),
+        'width': int(video.group(2)),
+        'height': int(video.group(3)),
+        'fps': float(fps.group(1)) if fps else 30.0,
+        'audio_codec': audio.group(1) if audio else None,
+    }
+
+
+def _run(cmd: List[str], timeout: int):
+    result = subprocess.run(cmd, capture_output=True, text=True, timeout=timeout)
+    if result.returncode != 0:
+        raise RuntimeError(f"ffmpeg failed: {result.stderr.strip()[-300:]}")
+
+
+def make_faststart(src: str, dst: str, info: Dict[str, Any], max_height: int, kbps: int, timeout: int = 3600) -> bool:
+    """Progressive MP4 with the moov atom first; returns True if it was a remux (no re-encode)"""
+    remux = (info['video_codec'] == 'h264' and info['audio_codec'] in (None, 'aac')
+             and info['height'] <= max_height and Path(src).suffix.lower() in ('.mp4', '.m4v', '.mov'))
+    cmd = ['ffmpeg', '-nostdin', '-y', '-loglevel', 'error', '-i', src, '-map', '0:v:0', '-map', '0:a:0?']
+    if remux:
+        cmd += ['-c', 'copy']
+    else:
+        cmd += [
+            '-vf', f"scale=-2:'min({max_height},ih)'", '-c:v', 'libx264', '-preset', VIDEO_X264_PRESET,
+            '-crf', '23', '-maxrate', f'{kbps}k', '-bufsize', f'{kbps * 2}k', '-pix_fmt', 'yuv420p',
+            '-c:a', 'aac', '-b:a', '128k',
+        ]
+    _run(cmd + ['-movflags', '+faststart', dst], timeout)
+    return remux
+
+
+def make_hls(src: str, out_dir: str, info: Dict[str, Any], ladder: List[Tuple[int, int]],
+             segment_seconds: int = HLS_SEGMENT_SECONDS, timeout: int = 3600) -> List[Dict[str, Any]]:
+    """Encode every rung in one ffmpeg pass (one decode); returns the rungs written"""
+    rungs = [(h, k) for h, k in ladder if h <= info['height']]
+    if not rungs:  # Source below the smallest rung: one rung at source height
+        rungs = [(info['height'] - info['height'] % 2, ladder[-1][1])]
+    has_audio = info['audio_codec'] is not None
+    gop = max(int(round(info['fps'] * segment_seconds)), 1)
+
+    n = len(rungs)
+    graph = f"[0:v]split={n}" + ''.join(f'[s{i}]' for i in range(n)) + ';' + ';'.join(
+        f"[s{i}]scale=-2:{h}[o{i}]" for i, (h, _) in enumerate(rungs)
+    )
+    cmd = ['ffmpeg', '-nostdin', '-y', '-loglevel', 'error', '-i', src, '-filter_complex', graph]
+    streams = []
+    for i, (height, kbps) in enumerate(rungs):
+        cmd += ['-map', f'[o{i}]', f'-c:v:{i}', 'libx264', f'-b:v:{i}', f'{kbps}k',
+                f'-maxrate:v:{i}', f'{int(kbps * 1.1)}k', f'-bufsize:v:{i}', f'{int(kbps * 1.5)}k']
+        stream = f'v:{i}'
+        if has_audio:
+            cmd += ['-map', 'a:0', f'-c:a:{i}', 'aac', f'-b:a:{i}', '128k' if i == 0 else '96k', '-ac', '2']
+            stream += f',a:{i}'
+        streams.append(f'{stream},name:{height}p')
+    cmd += [
+        '-preset', VIDEO_X264_PRESET, '-pix_fmt', 'yuv420p',
+        '-g', str(gop), '-keyint_min', str(gop), '-sc_threshold', '0',
+        '-f', 'hls', '-hls_time', str(segment_seconds), '-hls_playlist_type', 'vod',
+        '-hls_flags', 'independent_segments',
+        '-hls_segment_filename', os.path.join(out_dir, '%v', 'seg_%04d.ts'),
+        '-master_pl_name', 'master.m3u8',
+        '-var_stream_map', ' '.join(streams),
+        os.path.join(out_dir, '%v', 'index.m3u8'),
+    ]
+    _run(cmd, timeout)
+    return [{'height': h, 'kbps': k, 'playlist': f'{h}p/index.m3u8'} for h, k in rungs]
+
+
+def make_poster(src: str, dst: str, info: Dict[str, Any], width: int = 1280, timeout: int = 120):
+    """One JPEG ~10% into the video (at most 10s in, past black intros)"""
+    seconds = min(info['duration'] * 0.1, 10.0)
+    _run(['ffmpeg', '-nostdin', '-y', '-loglevel', 'error', '-ss', f'{seconds:.3f}', '-i', src,
+          '-vf', f"scale='min({width},iw)':-2", '-frames:v', '1', '-q:v', '3', dst], timeout)
+
+
+class RenditionBuilder:
+    """Faststart MP4 + HLS ladder + poster per video, with size/time stats"""
+
+    def __init__(self, ladder: Optional[List[Tuple[int, int]]] = None, web_root: Optional[str] = None):
+        self.ladder = ladder or parse_ladder()
+        self.nas_root = Path(NAS_MOUNT_PATH)
+        self.web_root = Path(web_root) if web_root else self.nas_root / VIDEO_WEB_DIR
+        self._lock = threading.Lock()
+        self.stats = {
+            'videos': 0,
+            'failed': 0,
+            'remuxed': 0,
+            'source_bytes': 0,
+            'mp4_bytes': 0,
+            'top_rung_bytes': 0,
+            'seconds': 0.0,
+        }
+
+    def _add(self, **amounts):
+        with self._lock:
+            for key, value in amounts.items():
+                self.stats[key] += value
+
+    def public_url(self, path: Path) -> str:
+        return f"{VIDEO_PUBLIC_URL}/{path.relative_to(self.nas_root).as_posix()}"
+
+    def build(self, src: str, out_dir: Path) -> Dict[str, Any]:
+        """Write video.mp4, hls/ and poster.jpg for src into out_dir"""
+        start = time.monotonic()
+        info = probe(src)
+        top_height, top_kbps = self.ladder[0]
+
+        # Build into a scratch dir beside the output, then swap in, so a
+        # half-written ladder is never served
+        out_dir.parent.mkdir(parents=True, exist_ok=True)
+        tmp_dir = Path(tempfile.mkdtemp(prefix=f'.{out_dir.name}-', dir=out_dir.parent))
+        os.chmod(tmp_dir, 0o755)  # mkdtemp is owner-only; the web server must read it
+        try:
+            mp4 = tmp_dir / 'video.mp4'
+            remuxed = make_faststart(src, str(mp4), info, top_height, top_kbps)
+            renditions = make_hls(src, str(tmp_dir / 'hls'), info, self.ladder)
+            make_poster(src, str(tmp_dir / 'poster.jpg'), info)
+            if out_dir.exists():
+                shutil.rmtree(out_dir)
+            tmp_dir.rename(out_dir)
+        except Exception:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            raise
+
+        top = out_dir / 'hls' / renditions[0]['playlist']
+        top_bytes = sum(p.stat().st_size for p in top.parent.glob('*.ts'))
+        elapsed = time.monotonic() - start
+        self._add(videos=1, remuxed=int(remuxed), source_bytes=os.path.getsize(src),
+                  mp4_bytes=(out_dir / 'video.mp4').stat().st_size, top_rung_bytes=top_bytes, seconds=elapsed)
+        return {
+            'mp4': out_dir / 'video.mp4',
+            'hls': out_dir / 'hls' / 'master.m3u8',
+            'poster': out_dir / 'poster.jpg',
+            'renditions': renditions,
+            'remuxed': remuxed,
+            'seconds': elapsed,
+        }
+
+    def _local_source(self, story: Dict[str, Any], workdir: str) -> Optional[str]:
+        """The story's video as a local file: NAS path, NAS/tunnel URL mapped to NAS, or downloaded"""
+        nas_path = story.get('nas_video_path')
+        if nas_path and os.path.exists(nas_path):
+            return nas_path
+        url = story.get('video_url') or ''
+        for base in (VIDEO_PUBLIC_URL, NAS_WEB_URL.rstrip('/')):
+            if url.startswith(base + '/'):
+                path = self.nas_root / url[len(base) + 1:]
+                if path.exists():
+                    return str(path)
+        if not url.startswith('http'):
+            return None
+        dst = os.path.join(workdir, Path(url.split('?')[0]).name or 'video.mp4')
+        with requests.get(url, stream=True, timeout=60) as response:
+            response.raise_for_status()
+            with open(dst, 'wb') as f:
+                for chunk in response.iter_content(chunk_size=1024 * 1024):
+                    f.write(chunk)
+        return dst
+
+    def render_story(self, story: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Build renditions for a story's video; returns the story fields to
+        update, or None if the video couldn't be fetched or encoded
+        """
+        workdir = tempfile.mkdtemp(prefix='renditions-')
+        try:
+            src = self._local_source(story, workdir)
+            if not src:
+                self._add(failed=1)
+                return None
+            key = Path(src).stem if src.startswith(str(self.nas_root)) else str(story.get('id', Path(src).stem))
+            out_dir = self.web_root / (story.get('source_platform') or 'video') / key
+            result = self.build(src, out_dir)
+        except Exception as e:
+            self._add(failed=1)
+            print(f"Rendition error for story {story.get('id')}: {e}")
+            return None
+        finally:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+        fields = {
+            'video_url': self.public_url(result['mp4']),
+            'video_hls_url': self.public_url(result['hls']),
+            'video_poster_url': self.public_url(result['poster']),
+            'video_renditions': result['renditions'],
+        }
+        if not story.get('video_thumbnail_url'):
+            fields['video_thumbnail_url'] = fields['video_poster_url']
+        if not story.get('nas_video_path') and src.startswith(str(self.nas_root)):
+            # video_url now points at the rendition; keep a handle on the original
+            fields['nas_video_path'] = src
+        return fields
+
+    def summary(self) -> str:
+        s = self.stats
+        if not s['videos'] and not s['failed']:
+            return "no videos rendered"
+        mb = 1024 * 1024
+        return (f"{s['videos']} videos ({s['failed']} failed, {s['remuxed']} remuxed) in {s['seconds']:.0f}s: "
+                f"{s['source_bytes'] / mb:.0f}MB sources -> {s['mp4_bytes'] / mb:.0f}MB faststart MP4, "
+                f"{s['top_rung_bytes'] / mb:.0f}MB top HLS rung")
@@ -0,0 +1,318 @@
+"""
+Persistent Whisper transcription service
+Loads the model once per process and works through a queue of audio/video
+files, instead of load_model() + one transcribe() per video:
+
+    transcriber = get_transcriber()
+    future = transcriber.submit('/mnt/nas/.../abc.m4a')   # queued
+    result = future.result()                              # {text, language, ...}
+    print(transcriber.summary())
+
+- Audio prep: ffmpeg extracts a mono 16 kHz PCM track (what Whisper
+  resamples to anyway) on a small CPU pool, overlapping with inference.
+  At most prep_workers + 1 WAVs exist at once, so a long queue doesn't
+  fill /tmp with files waiting for the model
+- VAD: faster-whisper's Silero VAD skips silence; the openai-whisper
+  backend gets ffmpeg silenceremove during audio prep instead
+- One inference thread owns the model, so GPU memory holds one copy
+- Backends: faster-whisper (CTranslate2; int8 on CPU, float16 on GPU,
+  optional batched pipeline) or openai-whisper. An unavailable backend
+  falls back to the other one.
+"""
+import os
+import time
+import wave
+import shutil
+import tempfile
+import threading
+import subprocess
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, Optional, Tuple
+from dotenv import load_dotenv
+
+load_dotenv()
+
+WHISPER_BACKEND = os.getenv('WHISPER_BACKEND', 'faster-whisper').lower()
+WHISPER_MODEL = os.getenv('WHISPER_MODEL', 'large-v3')
+WHISPER_DEVICE = os.getenv('WHISPER_DEVICE', 'auto').lower()            # auto, cuda, cpu
+WHISPER_COMPUTE_TYPE = os.getenv('WHISPER_COMPUTE_TYPE', 'auto').lower()  # faster-whisper only
+WHISPER_VAD = os.getenv('WHISPER_VAD', 'true').lower() == 'true'
+WHISPER_BATCH_SIZE = int(os.getenv('WHISPER_BATCH_SIZE', '8'))           # faster-whisper batched pipeline; 1 = off
+WHISPER_PREP_WORKERS = int(os.getenv('WHISPER_PREP_WORKERS', '2'))
+WHISPER_LANGUAGE = os.getenv('WHISPER_LANGUAGE', 'en') or None
+
+BACKENDS = ['faster-whisper', 'openai-whisper']
+
+SAMPLE_RATE = 16000
+
+# Trim silences over 1s when the backend has no VAD of its own
+SILENCE_FILTER = 'silenceremove=stop_periods=-1:stop_duration=1:stop_threshold=-40dB'
+
+
+def _cuda_available() -> bool:
+    try:
+        import ctranslate2
+        return ctranslate2.get_cuda_device_count() > 0
+    except ImportError:
+        pass
+    try:
+        import torch
+        return torch.cuda.is_available()
+    except ImportError:
+        return False
+
+
+def extract_audio(src: str, dst: str, trim_silence: bool = False, timeout: int = 600) -> float:
+    """
+    Write src's audio as mono 16 kHz 16-bit WAV to dst; returns its duration
+    in seconds. Raises RuntimeError if ffmpeg fails.
+    """
+    cmd = ['ffmpeg', '-nostdin', '-y', '-loglevel', 'error', '-i', src,
+           '-vn', '-ac', '1', '-ar', str(SAMPLE_RATE), '-c:a', 'pcm_s16le']
+    if trim_silence:
+        cmd += ['-af', SILENCE_FILTER]
+    cmd.append(dst)
+    result = subprocess.run(cmd, capture_output=True, text=True, timeout=timeout)
+    if result.returncode != 0:
+        raise RuntimeError(f"ffmpeg failed for {src}: {result.stderr.strip()[:300]}")
+    with wave.open(dst, 'rb') as f:
+        return f.getnframes() / float(f.getframerate())
+
+
+class _FasterWhisperBackend:
+    name = 'faster-whisper'
+    has_vad = True
+
+    def __init__(self, model: str, device: str, compute_type: str, batch_size: int):
+        from faster_whisper import WhisperModel
+        if compute_type == 'auto':
+            compute_type = 'float16' if device == 'cuda' else 'int8'
+        self.model = WhisperModel(model, device=device, compute_type=compute_type)
+        self.compute_type = compute_type
+        self.pipeline = None
+        if batch_size > 1:
+            try:
+                from faster_whisper import BatchedInferencePipeline
+                self.pipeline = BatchedInferencePipeline(model=self.model)
+            except ImportError:  # faster-whisper < 1.1
+                pass
+        self.batch_size = batch_size
+
+    def transcribe(self, audio_path: str, vad: bool, language: Optional[str]) -> Tuple[str, str, Optional[float]]:
+        if self.pipeline is not None:
+            segments, info = self.pipeline.transcribe(
+                audio_path, batch_size=self.batch_size, language=language, vad_filter=vad
+            )
+        else:
+            segments, info = self.model.transcribe(
+                audio_path, beam_size=5, language=language, vad_filter=vad
+            )
+        # Segments are generated lazily - joining them runs the decode
+        text = ' '.join(segment.text.strip() for segment in segments)
+        return text, info.language, getattr(info, 'duration_after_vad', None)
+
+
+class _OpenAIWhisperBackend:
+    name = 'openai-whisper'
+    has_vad = False
+    compute_type = 'float32'
+
+    def __init__(self, model: str, device: str, compute_type: str, batch_size: int):
+        import whisper
+        self.model = whisper.load_model(model, device=device)
+        self.fp16 = device == 'cuda'
+        if self.fp16:
+            self.compute_type = 'float16'
+
+    def transcribe(self, audio_path: str, vad: bool, language: Optional[str]) -> Tuple[str, str, Optional[float]]:
+        result = self.model.transcribe(audio_path, fp16=self.fp16, language=language)
+        return result['text'].strip(), result.get('language', language or ''), None
+
+
+_BACKEND_CLASSES = {
+    'faster-whisper': _FasterWhisperBackend,
+    'openai-whisper': _OpenAIWhisperBackend,
+}
+
+
+class TranscriptionService:
+    """
+    Queue-fed Whisper worker: audio prep on WHISPER_PREP_WORKERS threads,
+    inference on one thread that owns the (lazily loaded) model
+    """
+
+    def __init__(
+        self,
+        model: str = WHISPER_MODEL,
+        backend: str = WHISPER_BACKEND,
+        device: str = WHISPER_DEVICE,
+        compute_type: str = WHISPER_COMPUTE_TYPE,
+        vad: bool = WHISPER_VAD,
+        batch_size: int = WHISPER_BATCH_SIZE,
+        prep_workers: int = WHISPER_PREP_WORKERS,
+        language: Optional[str] = WHISPER_LANGUAGE
+    ):
+        if backend not in _BACKEND_CLASSES:
+            raise ValueError(f"Unknown Whisper backend '{backend}' (choose from {', '.join(BACKENDS)})")
+        self.model_name = model
+        self.backend_name = backend
+        self.device = device if device != 'auto' else ('cuda' if _cuda_available() else 'cpu')
+        self.compute_type = compute_type
+        self.vad = vad
+        self.batch_size = batch_size
+        self.language = language
+
+        self._backend = None
+        self._load_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._prep_pool = ThreadPoolExecutor(max_workers=max(prep_workers, 1), thread_name_prefix='whisper-prep')
+        # WAVs prepped but not yet transcribed (or being prepped)
+        self._prepped = threading.BoundedSemaphore(max(prep_workers, 1) + 1)
+        self._infer_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix='whisper')
+        self.stats = {
+            'files': 0,
+            'failed': 0,
+            'audio_seconds': 0.0,
+            'speech_seconds': 0.0,
+            'prep_seconds': 0.0,
+            'inference_seconds': 0.0,
+            'load_seconds': 0.0,
+        }
+
+    # ---- Model ------------------------------------------------------------
+
+    @property
+    def backend(self):
+        """Backend instance, loaded on first use (falls back if not installed)"""
+        if self._backend is None:
+            with self._load_lock:
+                if self._backend is None:
+                    start = time.monotonic()
+                    order = [self.backend_name] + [b for b in BACKENDS if b != self.backend_name]
+                    for name in order:
+                        try:
+                            self._backend = _BACKEND_CLASSES[name](
+                                self.model_name, self.device, self.compute_type, self.batch_size
+                            )
+                            break
+                        except ImportError:
+                            continue
+                    else:
+                        raise ImportError("No Whisper backend installed (pip install faster-whisper)")
+                    self.stats['load_seconds'] = time.monotonic() - start
+                    print(f"🎙️ Loaded Whisper {self.model_name} ({self._backend.name}, {self.device}, "
+                          f"{self._backend.compute_type}) in {self.stats['load_seconds']:.1f}s")
+        return self._backend
+
+    # ---- Pipeline ---------------------------------------------------------
+
+    def _add(self, **amounts):
+        with self._stats_lock:
+            for key, value in amounts.items():
+                self.stats[key] += value
+
+    def _prepare(self, source: str, workdir: str) -> Tuple[str, float]:
+        start = time.monotonic()
+        # The openai-whisper backend has no VAD, so strip silence here instead
+        has_vad = self._backend.has_vad if self._backend else self.backend_name == 'faster-whisper'
+        trim = self.vad and not has_vad
+        wav_path = os.path.join(workdir, f"{Path(source).stem}.wav")
+        duration = extract_audio(source, wav_path, trim_silence=trim)
+        self._add(prep_seconds=time.monotonic() - start)
+        return wav_path, duration
+
+    def _infer(self, source: str, wav_path: str, duration: float, workdir: str) -> Dict[str, Any]:
+        try:
+            start = time.monotonic()
+            text, language, speech = self.backend.transcribe(wav_path, self.vad, self.language)
+            elapsed = time.monotonic() - start
+            speech = speech if speech is not None else duration
+            self._add(files=1, audio_seconds=duration, speech_seconds=speech, inference_seconds=elapsed)
+            return {
+                'path': source,
+                'text': text,
+                'language': language,
+                'duration': duration,
+                'speech_duration': speech,
+                'seconds': elapsed,
+            }
+        finally:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    def _run(self, source: str, result: Future):
+        """Prep on this (prep pool) thread, then hand off to the inference thread"""
+        self._prepped.acquire()
+        workdir = tempfile.mkdtemp(prefix='whisper-')
+        try:
+            wav_path, duration = self._prepare(source, workdir)
+        except Exception as e:
+            shutil.rmtree(workdir, ignore_errors=True)
+            self._prepped.release()
+            self._add(failed=1)
+            result.set_exception(e)
+            return
+
+        def infer():
+            try:
+                result.set_result(self._infer(source, wav_path, duration, workdir))
+            except Exception as e:
+                self._add(failed=1)
+                result.set_exception(e)
+            finally:
+                self._prepped.release()
+
+        self._infer_pool.submit(infer)
+
+    def submit(self, path: str) -> Future:
+        """Queue an audio or video file; the future resolves to its transcript dict"""
+        result: Future = Future()
+        self._prep_pool.submit(self._run, str(path), result)
+        return result
+
+    def transcribe(self, path: str) -> Optional[Dict[str, Any]]:
+        """Transcribe one file and wait (None on failure)"""
+        try:
+            return self.submit(path).result()
+        except Exception as e:
+            print(f"Transcription error for {path}: {e}")
+            return None
+
+    def transcribe_many(self, paths: Iterable[str]) -> Iterator[Tuple[str, Optional[Dict[str, Any]]]]:
+        """Queue every file up front and yield (path, result or None) in submission order"""
+        futures = [(str(path), self.submit(path)) for path in paths]
+        for path, future in futures:
+            try:
+                yield path, future.result()
+            except Exception as e:
+                print(f"Transcription error for {path}: {e}")
+                yield path, None
+
+    def close(self):
+        self._prep_pool.shutdown(wait=True)
+        self._infer_pool.shutdown(wait=True)
+
+    # ---- Stats ------------------------------------------------------------
+
+    def summary(self) -> str:
+        s = self.stats
+        if not s['files'] and not s['failed']:
+            return "no files transcribed"
+        realtime = s['audio_seconds'] / s['inference_seconds'] if s['inference_seconds'] else 0.0
+        skipped = 1 - s['speech_seconds'] / s['audio_seconds'] if s['audio_seconds'] else 0.0
+        backend = self._backend.name if self._backend else self.backend_name
+        return (f"{s['files']} files ({s['failed']} failed), {s['audio_seconds'] / 60:.1f} min audio "
+                f"in {s['inference_seconds']:.0f}s inference = {realtime:.1f}x realtime "
+                f"[{backend}/{self.model_name} on {self.device}, VAD skipped {skipped:.0%}, "
+                f"audio prep {s['prep_seconds']:.0f}s, model load {s['load_seconds']:.0f}s]")
+
+
+# Singleton instance
+_transcriber = None
+
+def get_transcriber() -> TranscriptionService:
+    """Process-wide service, so the model is loaded at most once"""
+    global _transcriber
+    if _transcriber is None:
+        _transcriber = TranscriptionService()
+    return _transcriber
@@ -0,0 +1,365 @@
+"""
+Async Reddit JSON API client
+Fetches subreddit listings and search queries concurrently over one pooled
+aiohttp session, paced by Reddit's X-Ratelimit-Remaining / X-Ratelimit-Reset
+headers instead of fixed sleeps
+
+Also fetches comment trees for accepted posts, expanding truncated threads
+with batched api/morechildren calls (up to 100 ids per request)
+"""
+import time
+import asyncio
+from typing import Any, Dict, List, Optional, Tuple
+import aiohttp
+
+REDDIT_BASE = 'https://www.reddit.com'
+
+# Requests kept in reserve so a burst from another process doesn't trip a 429
+RATELIMIT_RESERVE = 2
+
+# api/morechildren accepts at most 100 comment ids per request
+MORECHILDREN_BATCH = 100
+
+# Bot/removed comments never carry story details
+SKIP_AUTHORS = {'AutoModerator', '[deleted]'}
+SKIP_BODIES = {'[deleted]', '[removed]'}
+
+# Assumed budget when a window rolls over before fresh headers arrive
+DEFAULT_REMAINING = 10.0
+DEFAULT_WINDOW = 60.0
+
+
+class RateLimitPacer:
+    """
+    Spreads requests evenly over what's left of the current rate-limit window
+
+    Reddit returns, on every response:
+        X-Ratelimit-Remaining: requests left in this window (float)
+        X-Ratelimit-Reset:     seconds until the window resets
+
+    The first request goes out alone as a probe; everything else waits
+    until its headers tell us the real budget.
+    """
+
+    def __init__(self):
+        self.remaining = DEFAULT_REMAINING
+        self.reset_at = time.monotonic() + DEFAULT_WINDOW
+        self._next_slot = 0.0
+        self._lock = asyncio.Lock()
+        self._calibrated = asyncio.Event()
+        self._probing = False
+        self.waited = 0.0
+
+    async def acquire(self):
+        """Wait for our slot"""
+        if not self._calibrated.is_set():
+            if not self._probing:
+                self._probing = True
+                return
+            await self._calibrated.wait()
+
+        async with self._lock:
+            now = time.monotonic()
+            if now >= self.reset_at:
+                # Window rolled over - optimistic until headers say otherwise
+                self.remaining = max(self.remaining, DEFAULT_REMAINING)
+                self.reset_at = now + DEFAULT_WINDOW
+
+            usable = self.remaining - RATELIMIT_RESERVE
+            if usable <= 0:
+                slot = self.reset_at
+            else:
+                interval = max(self.reset_at - now, 0) / usable
+                slot = max(now, self._next_slot + interval)
+            self._next_slot = slot
+            self.remaining -= 1
+
+        delay = slot - time.monotonic()
+        if delay > 0:
+            self.waited += delay
+            await asyncio.sleep(delay)
+
+    def update(self, headers) -> None:
+        """Sync budget from response headers"""
+        remaining = headers.get('X-Ratelimit-Remaining') or headers.get('x-ratelimit-remaining')
+        reset = headers.get('X-Ratelimit-Reset') or headers.get('x-ratelimit-reset')
+        try:
+            if remaining is not None:
+                self.remaining = float(remaining)
+            if reset is not None:
+                self.reset_at = time.monotonic() + float(reset)
+        except ValueError:
+            pass
+        self.calibrated()
+
+    def calibrated(self) -> None:
+        """Release requests held behind the probe"""
+        self._calibrated.set()
+
+    def backoff(self, retry_after: Optional[float]) -> None:
+        """After a 429: nothing left until reset (or Retry-After)"""
+        self.remaining = 0
+        if retry_after:
+            self.reset_at = max(self.reset_at, time.monotonic() + retry_after)
+
+
+def _walk_comments(children: List[Dict], comments: List[Dict], more_ids: List[str]) -> None:
+    """Flatten a comment listing, collecting ids hidden behind 'more' stubs"""
+    for child in children:
+        kind = child.get('kind')
+        data = child.get('data', {})
+        if kind == 't1':
+            comments.append({
+                'id': data.get('id'),
+                'author': data.get('author'),
+                'body': data.get('body', ''),
+                'score': data.get('score', 0),
+                'is_submitter': bool(data.get('is_submitter')),
+                'parent_id': data.get('parent_id'),
+                'created_utc': data.get('created_utc', 0),
+            })
+            replies = data.get('replies')
+            if isinstance(replies, dict):
+                _walk_comments(replies.get('data', {}).get('children', []), comments, more_ids)
+        elif kind == 'more':
+            # 'Continue this thread' stubs have no children ids - skip them
+            more_ids.extend(data.get('children', []))
+
+
+def select_comments(comments: List[Dict], op_author: Optional[str], top_n: int = 10) -> List[Dict]:
+    """OP-authored comments (chronological) followed by the top-scored others"""
+    unique = {}
+    for comment in comments:
+        if comment['author'] in SKIP_AUTHORS or comment['body'].strip() in SKIP_BODIES:
+            continue
+        unique.setdefault(comment['id'], comment)
+
+    op, others = [], []
+    for comment in unique.values():
+        is_op = comment['is_submitter'] or (op_author and comment['author'] == op_author)
+        (op if is_op else others).append(dict(comment, is_op=bool(is_op)))
+
+    op.sort(key=lambda c: c['created_utc'])
+    others.sort(key=lambda c: c['score'], reverse=True)
+    return op + others[:top_n]
+
+
+class AsyncRedditClient:
+    """Concurrent Reddit listing/search fetcher"""
+
+    def __init__(self, headers: Dict[str, str], max_concurrency: int = 8, max_retries: int = 3):
+        self.headers = headers
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.pacer = RateLimitPacer()
+        self.session: Optional[aiohttp.ClientSession] = None
+        self.request_count = 0
+
+    async def __aenter__(self) -> 'AsyncRedditClient':
+        connector = aiohttp.TCPConnector(limit=self.max_concurrency, ttl_dns_cache=300)
+        self.session = aiohttp.ClientSession(
+            headers=self.headers,
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=30)
+        )
+        return self
+
+    async def __aexit__(self, *exc):
+        if self.session:
+            await self.session.close()
+
+    async def get_json(self, url: str, params: Optional[Dict[str, Any]] = None) -> Optional[Any]:
+        """GET with pacing and 429 handling"""
+        for _ in range(self.max_retries + 1):
+            await self.pacer.acquire()
+            self.request_count += 1
+            try:
+                async with self.session.get(url, params=params) as resp:
+                    self.pacer.update(resp.headers)
+                    if resp.status == 429:
+                        retry_after = resp.headers.get('Retry-After')
+                        self.pacer.backoff(float(retry_after) if retry_after and retry_after.isdigit() else None)
+                        print(f"  Rate limited on {url}, waiting for reset...")
+                        continue
+                    resp.raise_for_status()
+                    return await resp.json(content_type=None)
+            finally:
+                # A failed probe must not leave everyone else waiting
+                self.pacer.calibrated()
+        return None
+
+    async def fetch_listing(self, url: str, params: Dict[str, Any], limit: int) -> List[Dict]:
+        """Page through a listing with the 'after' cursor"""
+        posts = []
+        after = None
+        while len(posts) < limit:
+            page_params = dict(params, limit=min(100, limit - len(posts)))
+            if after:
+                page_params['after'] = after
+
+            data = await self.get_json(url, page_params)
+            if not data:
+                break
+
+            children = data.get('data', {}).get('children', [])
+            if not children:
+                break
+            posts.extend(child.get('data', {}) for child in children)
+
+            after = data.get('data', {}).get('after')
+            if not after:
+                break
+        return posts
+
+    async def fetch_subreddit(self, subreddit: str, sort: str = 'top', time_filter: str = 'year', limit: int = 100) -> List[Dict]:
+        try:
+            return await self.fetch_listing(
+                f"{REDDIT_BASE}/r/{subreddit}/{sort}.json", {'t': time_filter}, limit
+            )
+        except Exception as e:
+            print(f"  Error fetching r/{subreddit}: {e}")
+            return []
+
+    async def search(self, query: str, limit: int = 50) -> List[Dict]:
+        try:
+            return await self.fetch_listing(
+                f"{REDDIT_BASE}/search.json",
+                {'q': query, 'sort': 'relevance', 't': 'year', 'type': 'link'},
+                limit
+            )
+        except Exception as e:
+            print(f"  Error searching '{query[:30]}': {e}")
+            return []
+
+    async def fetch_all(
+        self,
+        subreddits: List[str],
+        queries: List[str],
+        subreddit_limit: int,
+        search_limit: int
+    ) -> Tuple[Dict[str, List[Dict]], Dict[str, List[Dict]]]:
+        """All subreddit listings and searches, concurrently"""
+        sub_results, search_results = await asyncio.gather(
+            asyncio.gather(*(self.fetch_subreddit(s, limit=subreddit_limit) for s in subreddits)),
+            asyncio.gather(*(self.search(q, limit=search_limit) for q in queries)),
+        )
+        return dict(zip(subreddits, sub_results)), dict(zip(queries, search_results))
+
+    async def fetch_comments(
+        self,
+        post_id: str,
+        op_author: Optional[str] = None,
+        top_n: int = 10,
+        max_more_batches: int = 2
+    ) -> List[Dict]:
+        """
+        OP and top comments for one post
+
+        One request for the tree (top-sorted), then at most `max_more_batches`
+        morechildren requests of up to 100 ids each for truncated branches.
+        """
+        try:
+            data = await self.get_json(
+                f"{REDDIT_BASE}/comments/{post_id}.json",
+                {'sort': 'top', 'limit': 200, 'depth': 8, 'raw_json': 1}
+            )
+            if not isinstance(data, list) or len(data) < 2:
+                return []
+
+            comments, more_ids = [], []
+            _walk_comments(data[1].get('data', {}).get('children', []), comments, more_ids)
+
+            batches = 0
+            while more_ids and batches < max_more_batches:
+                batch, more_ids = more_ids[:MORECHILDREN_BATCH], more_ids[MORECHILDREN_BATCH:]
+                result = await self.get_json(
+                    f"{REDDIT_BASE}/api/morechildren.json",
+                    {
+                        'api_type': 'json',
+                        'link_id': f"t3_{post_id}",
+                        'children': ','.join(batch),
+                        'sort': 'top',
+                        'raw_json': 1,
+                    }
+                )
+                batches += 1
+                things = (result or {}).get('json', {}).get('data', {}).get('things', [])
+                # Things come back flat; nested 'more' stubs feed the next batch
+                _walk_comments(things, comments, more_ids)
+
+            return select_comments(comments, op_author, top_n)
+        except Exception as e:
+            print(f"  Error fetching comments for {post_id}: {e}")
+            return []
+
+    async def fetch_comments_for_posts(
+        self,
+        posts: List[Dict],
+        top_n: int = 10,
+        max_posts_in_flight: int = 4,
+        max_more_batches: int = 2
+    ) -> Dict[str, List[Dict]]:
+        """Comments for many posts, at most `max_posts_in_flight` trees at a time"""
+        semaphore = asyncio.Semaphore(max_posts_in_flight)
+
+        async def one(post):
+            async with semaphore:
+                return await self.fetch_comments(post['id'], post.get('author'), top_n, max_more_batches)
+
+        results = await asyncio.gather(*(one(p) for p in posts))
+        return {p['id']: comments for p, comments in zip(posts, results)}
+
+
+def fetch_all_reddit(
+    headers: Dict[str, str],
+    subreddits: List[str],
+    queries: List[str],
+    subreddit_limit: int = 50,
+    search_limit: int = 30,
+    max_concurrency: int = 8
+) -> Tuple[Dict[str, List[Dict]], Dict[str, List[Dict]]]:
+    """
+    Sync entry point for RedditScraper
+
+    Returns:
+        (posts by subreddit, posts by search query)
+    """
+    async def _run():
+        async with AsyncRedditClient(headers, max_concurrency=max_concurrency) as client:
+            start = time.monotonic()
+            result = await client.fetch_all(subreddits, queries, subreddit_limit, search_limit)
+            elapsed = time.monotonic() - start
+            print(f"  {client.request_count} Reddit requests in {elapsed:.1f}s "
+                  f"({client.pacer.waited:.1f}s total pacing)")
+            return result
+
+    return asyncio.run(_run())
+
+
+def fetch_reddit_comments(
+    headers: Dict[str, str],
+    posts: List[Dict],
+    top_n: int = 10,
+    max_concurrency: int = 8,
+    max_posts_in_flight: int = 4,
+    max_more_batches: int = 2
+) -> Dict[str, List[Dict]]:
+    """
+    Sync entry point for RedditScraper comment ingestion
+
+    Returns:
+        {post id: [comment dicts, OP replies first]}
+    """
+    async def _run():
+        async with AsyncRedditClient(headers, max_concurrency=max_concurrency) as client:
+            start = time.monotonic()
+            result = await client.fetch_comments_for_posts(
+                posts, top_n=top_n,
+                max_posts_in_flight=max_posts_in_flight,
+                max_more_batches=max_more_batches
+            )
+            elapsed = time.monotonic() - start
+            print(f"  {client.request_count} comment requests for {len(posts)} posts in {elapsed:.1f}s")
+            return result
+
+    return asyncio.run(_run())
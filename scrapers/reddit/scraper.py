@@ -5,7 +5,6 @@ Uses Reddit JSON API (no auth required) + Pushshift archive
 import os
 import re
 import time
-import json
 import requests
 from datetime import datetime, timedelta
 from typing import List, Dict, Any, Optional
@@ -19,9 +18,26 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from utils.storage import get_storage
 from utils.ai_extractor import extract_story_data
+from utils.prefilter import get_prefilter
+from utils.raw_archive import RawArchive
+from utils.url_canon import canonicalize, dedup_key
+from reddit.async_client import fetch_all_reddit, fetch_reddit_comments
 
 load_dotenv()
 
+# Fetch all listings concurrently, paced by Reddit's rate-limit headers
+REDDIT_ASYNC = os.getenv('REDDIT_ASYNC', 'true').lower() == 'true'
+REDDIT_MAX_CONCURRENCY = int(os.getenv('REDDIT_MAX_CONCURRENCY', '8'))
+
+# Optional comment ingestion: OP replies + top comments for accepted posts
+REDDIT_COMMENTS = os.getenv('REDDIT_COMMENTS', 'false').lower() == 'true'
+REDDIT_TOP_COMMENTS = int(os.getenv('REDDIT_TOP_COMMENTS', '10'))
+REDDIT_COMMENT_POSTS_IN_FLIGHT = int(os.getenv('REDDIT_COMMENT_POSTS_IN_FLIGHT', '4'))
+REDDIT_MORECHILDREN_BATCHES = int(os.getenv('REDDIT_MORECHILDREN_BATCHES', '2'))
+
+# Per-comment character cap when appended to post content
+MAX_COMMENT_CHARS = 1500
+
 # Subreddits to scrape (healthcare focused)
 SUBREDDITS = [
     'HealthInsurance',
@@ -99,7 +115,7 @@ class RedditScraper:
         self.session = requests.Session()
         self.session.headers.update(HEADERS)
     
-    def _fetch_subreddit_json(self, subreddit: str, sort: str = 'top', time: str = 'year', limit: int = 100) -> List[Dict]:
+    def _fetch_subreddit_json(self, subreddit: str, sort: str = 'top', time_filter: str = 'year', limit: int = 100) -> List[Dict]:
         """Fetch posts from subreddit using JSON API"""
         posts = []
         after = None
@@ -107,7 +123,7 @@ class RedditScraper:
         while len(posts) < limit:
             url = f"https://www.reddit.com/r/{subreddit}/{sort}.json"
             params = {
-                't': time,
+                't': time_filter,
                 'limit': min(100, limit - len(posts)),
             }
             if after:
@@ -190,14 +206,7 @@ class RedditScraper:
     
     def _is_relevant(self, text: str) -> bool:
         """Quick relevance check before AI filter"""
-        text_lower = text.lower()
-        keywords = [
-            'bill', 'cost', 'paid', 'insurance', 'hospital', 'doctor',
-            'surgery', 'treatment', 'medical', 'healthcare', 'debt',
-            'denied', 'coverage', 'abroad', 'mexico', 'thailand',
-            'dental', 'procedure', 'prescription', 'insulin'
-        ]
-        return any(kw in text_lower for kw in keywords)
+        return get_prefilter('reddit').is_relevant(text)
     
     def _extract_images(self, post: Dict) -> List[str]:
         """Extract image URLs from post data"""
@@ -256,138 +265,196 @@ class RedditScraper:
             print(f"  Error downloading image: {e}")
             return None
     
-    def run_full_scrape(self, subreddit_limit: int = 50, search_limit: int = 30) -> List[Dict[str, Any]]:
+    def _collect_post(
+        self,
+        post: Dict,
+        seen: set,
+        stats: Dict[str, int],
+        subreddit: Optional[str] = None,
+        search_query: Optional[str] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Filter one raw post and build its record, cheapest checks first:
+        run index -> length/keywords -> storage lookup -> image downloads
+        """
+        post_id = post.get('id')
+        source_url = canonicalize(f"https://reddit.com{post.get('permalink', '')}")
+        
+        # Already handled this run (from another listing or query), a
+        # crosspost of a post already seen, or a link post to an article
+        # another post already brought in
+        own_key = dedup_key(source_url)
+        keys = {own_key}
+        parent = post.get('crosspost_parent') or ''
+        if parent.startswith('t3_'):
+            keys.add(f"reddit:{parent[3:]}")
+        linked = post.get('url_overridden_by_dest') or ''
+        if linked and not post.get('is_self'):
+            keys.add(dedup_key(linked))
+        if keys & seen:
+            stats['duplicates'] += 1
+            return None
+        # The parent/linked keys only claim the original once this post is kept;
+        # a filtered (often empty) crosspost mustn't hide the original
+        seen.add(own_key)
+        
+        title = post.get('title', '')
+        selftext = post.get('selftext', '')
+        full_text = f"{title}\n\n{selftext}"
+        
+        # Skip very short posts, then quick relevance check
+        if len(full_text) < 100 or not self._is_relevant(full_text):
+            stats['filtered'] += 1
+            return None
+        
+        if self.storage.story_exists(source_url):
+            stats['existing'] += 1
+            return None
+        
+        # Only now is it worth downloading images
+        uploaded_images = []
+        for img_url in self._extract_images(post)[:3]:
+            result = self._download_image(img_url, post_id or 'unknown')
+            if result:
+                uploaded_images.append(result)
+        
+        post_data = {
+            'id': post_id,
+            'author': post.get('author'),
+            'subreddit': subreddit or post.get('subreddit', 'unknown'),
+            'title': title,
+            'content': full_text,
+            'score': post.get('score', 0),
+            'num_comments': post.get('num_comments', 0),
+            'created_utc': datetime.fromtimestamp(post.get('created_utc', 0)).isoformat(),
+            'source_url': source_url,
+            'source': 'reddit',
+            'images': uploaded_images,
+        }
+        if search_query:
+            post_data['search_query'] = search_query
+        
+        seen.update(keys)
+        return post_data
+    
+    def _append_comments(self, content: str, comments: List[Dict]) -> str:
+        """Append OP replies and top comments to the post text for extraction"""
+        op = [c for c in comments if c['is_op']]
+        others = [c for c in comments if not c['is_op']]
+        
+        sections = [content]
+        if op:
+            sections.append("--- Replies from the original poster ---\n" +
+                            "\n\n".join(c['body'][:MAX_COMMENT_CHARS] for c in op))
+        if others:
+            sections.append("--- Top comments ---\n" +
+                            "\n\n".join(f"[{c['score']} points] {c['body'][:MAX_COMMENT_CHARS]}" for c in others))
+        return "\n\n".join(sections)
+    
+    def run_full_scrape(
+        self,
+        subreddit_limit: int = 50,
+        search_limit: int = 30,
+        use_async: Optional[bool] = None,
+        include_comments: Optional[bool] = None
+    ) -> List[Dict[str, Any]]:
         """Run full Reddit scrape"""
         all_posts = []
+        use_async = REDDIT_ASYNC if use_async is None else use_async
+        include_comments = REDDIT_COMMENTS if include_comments is None else include_comments
         
         print("=" * 60)
         print("OASARA REDDIT SCRAPER - DATA LIBERATION PHASE 3")
         print("Using Reddit JSON API (no auth required)")
         print("=" * 60)
         
+        # Fetch every listing up front over one pooled connection
+        subreddit_posts, search_posts = {}, {}
+        if use_async:
+            print("\nFetching subreddits and searches concurrently...")
+            subreddit_posts, search_posts = fetch_all_reddit(
+                HEADERS, SUBREDDITS, SEARCH_QUERIES,
+                subreddit_limit=subreddit_limit,
+                search_limit=search_limit,
+                max_concurrency=REDDIT_MAX_CONCURRENCY
+            )
+        
+        # One index for the whole run: every post id / URL seen so far.
+        # Consulted before any storage lookup or image download.
+        seen = set()
+        stats = {'duplicates': 0, 'filtered': 0, 'existing': 0}
+        
+        # Raw items stream to disk as they're collected; posts that get
+        # comments are written again afterwards (the index keeps the latest)
+        archive = RawArchive(self.output_dir, 'reddit')
+        
         # Scrape subreddits
         for subreddit in SUBREDDITS:
             print(f"\nScraping r/{subreddit}...")
-            raw_posts = self._fetch_subreddit_json(subreddit, limit=subreddit_limit)
+            if use_async:
+                raw_posts = subreddit_posts.get(subreddit, [])
+            else:
+                raw_posts = self._fetch_subreddit_json(subreddit, limit=subreddit_limit)
             
             relevant = 0
             for post in raw_posts:
-                # Build full text
-                title = post.get('title', '')
-                selftext = post.get('selftext', '')
-                full_text = f"{title}\n\n{selftext}"
-                
-                # Quick relevance check
-                if not self._is_relevant(full_text):
-                    continue
-                
-                # Skip very short posts
-                if len(full_text) < 100:
-                    continue
-                
-                # Check for duplicates
-                source_url = f"https://reddit.com{post.get('permalink', '')}"
-                if self.storage.story_exists(source_url):
-                    continue
-                
-                # Extract and download images
-                images = self._extract_images(post)
-                uploaded_images = []
-                for img_url in images[:3]:
-                    result = self._download_image(img_url, post.get('id', 'unknown'))
-                    if result:
-                        uploaded_images.append(result)
-                
-                post_data = {
-                    'id': post.get('id'),
-                    'subreddit': subreddit,
-                    'title': title,
-                    'content': full_text,
-                    'score': post.get('score', 0),
-                    'num_comments': post.get('num_comments', 0),
-                    'created_utc': datetime.fromtimestamp(post.get('created_utc', 0)).isoformat(),
-                    'source_url': source_url,
-                    'source': 'reddit',
-                    'images': uploaded_images,
-                }
-                
-                all_posts.append(post_data)
-                relevant += 1
+                post_data = self._collect_post(post, seen, stats, subreddit=subreddit)
+                if post_data:
+                    all_posts.append(post_data)
+                    archive.write(post_data)
+                    relevant += 1
             
             print(f"  Found {relevant} relevant posts")
-            time.sleep(3)  # Be nice to Reddit
+            if not use_async:
+                time.sleep(3)  # Be nice to Reddit
         
         # Run search queries
         for query in SEARCH_QUERIES:
             print(f"\nSearching: '{query}'...")
-            raw_posts = self._search_reddit_json(query, limit=search_limit)
+            if use_async:
+                raw_posts = search_posts.get(query, [])
+            else:
+                raw_posts = self._search_reddit_json(query, limit=search_limit)
             
             relevant = 0
             for post in raw_posts:
-                title = post.get('title', '')
-                selftext = post.get('selftext', '')
-                full_text = f"{title}\n\n{selftext}"
-                
-                if not self._is_relevant(full_text):
-                    continue
-                
-                if len(full_text) < 100:
-                    continue
-                
-                source_url = f"https://reddit.com{post.get('permalink', '')}"
-                if self.storage.story_exists(source_url):
-                    continue
-                
-                # Check if already in all_posts
-                if any(p['id'] == post.get('id') for p in all_posts):
-                    continue
-                
-                images = self._extract_images(post)
-                uploaded_images = []
-                for img_url in images[:3]:
-                    result = self._download_image(img_url, post.get('id', 'unknown'))
-                    if result:
-                        uploaded_images.append(result)
-                
-                post_data = {
-                    'id': post.get('id'),
-                    'subreddit': post.get('subreddit', 'unknown'),
-                    'title': title,
-                    'content': full_text,
-                    'score': post.get('score', 0),
-                    'num_comments': post.get('num_comments', 0),
-                    'created_utc': datetime.fromtimestamp(post.get('created_utc', 0)).isoformat(),
-                    'source_url': source_url,
-                    'source': 'reddit',
-                    'images': uploaded_images,
-                    'search_query': query,
-                }
-                
-                all_posts.append(post_data)
-                relevant += 1
+                post_data = self._collect_post(post, seen, stats, search_query=query)
+                if post_data:
+                    all_posts.append(post_data)
+                    archive.write(post_data)
+                    relevant += 1
             
             print(f"  Found {relevant} relevant posts")
-            time.sleep(3)
+            if not use_async:
+                time.sleep(3)
         
-        # Deduplicate
-        seen_ids = set()
-        unique_posts = []
-        for post in all_posts:
-            if post['id'] not in seen_ids:
-                seen_ids.add(post['id'])
-                unique_posts.append(post)
+        # Comment trees only for posts that survived every filter
+        if include_comments and all_posts:
+            print(f"\nFetching OP replies and top comments for {len(all_posts)} posts...")
+            comments = fetch_reddit_comments(
+                HEADERS, all_posts,
+                top_n=REDDIT_TOP_COMMENTS,
+                max_concurrency=REDDIT_MAX_CONCURRENCY,
+                max_posts_in_flight=REDDIT_COMMENT_POSTS_IN_FLIGHT,
+                max_more_batches=REDDIT_MORECHILDREN_BATCHES
+            )
+            for post in all_posts:
+                post_comments = comments.get(post['id']) or []
+                if post_comments:
+                    post['comments'] = post_comments
+                    post['content'] = self._append_comments(post['content'], post_comments)
+                    archive.write(post)
         
         print(f"\n{'=' * 60}")
-        print(f"SCRAPE COMPLETE: {len(unique_posts)} unique posts")
+        print(f"SCRAPE COMPLETE: {len(all_posts)} unique posts")
+        print(f"  Skipped: {stats['duplicates']} duplicates in run, "
+              f"{stats['filtered']} filtered, {stats['existing']} already stored")
         print(f"{'=' * 60}")
         
-        # Save raw data
-        output_file = self.output_dir / f"reddit_raw_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-        with open(output_file, 'w') as f:
-            json.dump(unique_posts, f, indent=2, default=str)
-        print(f"Raw data saved to: {output_file}")
+        archive.close()
+        print(f"Raw data: {archive.summary()}")
         
-        return unique_posts
+        return all_posts
     
     def extract_and_save(self, posts: List[Dict[str, Any]]) -> int:
         """Extract structured data with AI and save to database"""
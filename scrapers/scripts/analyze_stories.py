@@ -10,6 +10,7 @@ Usage:
     python analyze_stories.py --delete           # Actually delete non-compliant stories
     python analyze_stories.py --limit 50         # Analyze only 50 stories
     python analyze_stories.py --status pending   # Only analyze pending stories
+    python analyze_stories.py --no-cache         # Force fresh Claude decisions
 """
 import os
 import sys
@@ -25,6 +26,7 @@ from tqdm import tqdm
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from utils.ai_extractor import check_relevance
+from utils.extraction_cache import get_extraction_cache
 from supabase import create_client
 
 load_dotenv()
@@ -59,9 +61,10 @@ def get_stories(status: str = None, limit: int = None, is_scraped: bool = True)
     return result.data or []
 
 
-def analyze_story(story: Dict[str, Any]) -> Dict[str, Any]:
+def analyze_story(story: Dict[str, Any], use_cache: bool = True) -> Dict[str, Any]:
     """
     Analyze a single story against OASARA criteria
+    Unchanged stories reuse the cached decision (same content + prompt version)
 
     Returns:
         Dict with 'decision', 'story_id', 'title', 'source_platform'
@@ -78,7 +81,11 @@ def analyze_story(story: Dict[str, Any]) -> Dict[str, Any]:
     if story.get('cost_abroad'):
         content += f"\n\nAbroad Cost: ${story['cost_abroad']}"
 
-    decision = check_relevance(content)
+    decision = check_relevance(
+        content,
+        use_cache=use_cache,
+        source=story.get('source_platform', 'unknown')
+    )
 
     return {
         'story_id': story['id'],
@@ -202,6 +209,7 @@ Examples:
     python analyze_stories.py --delete           # Delete non-compliant stories
     python analyze_stories.py --limit 50         # Analyze 50 stories
     python analyze_stories.py --status pending   # Only pending stories
+    python analyze_stories.py --no-cache         # Ignore cached decisions
         """
     )
 
@@ -220,6 +228,8 @@ Examples:
                         help='Output report to JSON file')
     parser.add_argument('--dry-run', action='store_true',
                         help='Show what would be done without making changes')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='Bypass the extraction cache and re-ask Claude for every story')
 
     args = parser.parse_args()
 
@@ -242,19 +252,25 @@ Examples:
 
     print(f"Found {len(stories)} stories to analyze.\n")
 
+    cache = get_extraction_cache()
+
     results = []
     for story in tqdm(stories, desc="Analyzing stories"):
-        result = analyze_story(story)
+        hits_before = cache.session_count('relevance') if cache else 0
+        result = analyze_story(story, use_cache=not args.no_cache)
         results.append(result)
 
-        # Rate limiting for Claude API
-        import time
-        time.sleep(1)
+        # Rate limiting for Claude API (cache hits never reach the API)
+        if not cache or cache.session_count('relevance') == hits_before:
+            import time
+            time.sleep(1)
 
     # Generate report
     output_file = args.output or f"compliance_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
     report = generate_report(results, output_file)
     print_summary(report)
+    if cache and not args.no_cache:
+        cache.print_stats()
 
     # Take action on rejected stories
     if args.flag or args.delete:
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Condensation Benchmark
+Compares plain truncation (content[:4000] / content[:10000]) against
+token-budgeted condensation (utils/condense.py) on saved raw scrapes
+
+Offline metrics (no API calls):
+- Estimated tokens sent per item
+- Recall of dollar amounts / procedure / insurance terms from the full text
+
+Live metrics (--live N, calls Claude on N items per variant):
+- Populated extraction fields (cost_us, cost_abroad, procedure, ...)
+
+Usage:
+    python bench_condense.py                          # All */output/*_raw_* archives
+    python bench_condense.py ../news/output/news_raw_20250101_001.ndjson.gz
+    python bench_condense.py --live 20                # Also compare real extractions
+"""
+import re
+import sys
+import json
+import glob
+import argparse
+from pathlib import Path
+from typing import Any, Dict, List
+
+# Add parent to path for utils
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from utils.raw_archive import read_archive
+from utils.condense import (
+    condense, estimate_tokens, MONEY_RE, PROCEDURE_TERMS, INSURANCE_TERMS,
+    RELEVANCE_TOKEN_BUDGET, EXTRACTION_TOKEN_BUDGET,
+)
+
+SCRAPERS_DIR = Path(__file__).parent.parent
+KEY_FIELDS = ['cost_us', 'cost_abroad', 'procedure', 'country_abroad', 'savings_amount', 'key_quote']
+
+
+def raw_paths() -> List[str]:
+    """Raw archives (*.ndjson.gz) and legacy dumps (*.json) from every scraper"""
+    return sorted(
+        glob.glob(str(SCRAPERS_DIR / '*' / 'output' / '*_raw_*.ndjson.gz')) +
+        glob.glob(str(SCRAPERS_DIR / '*' / 'output' / '*_raw_*.json'))
+    )
+
+
+def load_items(paths: List[str]) -> List[Dict[str, Any]]:
+    """Load items from raw archives or legacy JSON dumps"""
+    items = []
+    for path in paths:
+        try:
+            data = list(read_archive(Path(path)))
+        except Exception as e:
+            print(f"  Skipping {path}: {e}")
+            continue
+        for item in data:
+            content = item.get('content') or item.get('text') or ''
+            if item.get('title') and not content.startswith(item['title']):
+                content = f"{item['title']}\n\n{content}"
+            if len(content) >= 100:
+                items.append({'source': item.get('source', Path(path).name.split('_')[0]), 'content': content})
+    return items
+
+
+def _terms(pattern: re.Pattern, text: str) -> set:
+    return {m.lower().replace(' ', '') for m in pattern.findall(text)} if text else set()
+
+
+def recall(full: str, sent: str) -> Dict[str, float]:
+    """Fraction of salient terms in the full text that survive into the sent text"""
+    out = {}
+    for name, pattern in [('money', MONEY_RE), ('procedure', PROCEDURE_TERMS), ('insurance', INSURANCE_TERMS)]:
+        wanted = _terms(pattern, full)
+        if wanted:
+            out[name] = len(wanted & _terms(pattern, sent)) / len(wanted)
+    return out
+
+
+def offline_benchmark(items: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Token and salient-term recall comparison"""
+    results = {}
+    for stage, trunc_chars, budget in [
+        ('relevance', 4000, RELEVANCE_TOKEN_BUDGET),
+        ('extraction', 10000, EXTRACTION_TOKEN_BUDGET),
+    ]:
+        totals = {'truncate': {'tokens': 0}, 'condense': {'tokens': 0}}
+        recall_sums = {'truncate': {}, 'condense': {}}
+        recall_counts = {}
+
+        for item in items:
+            variants = {
+                'truncate': item['content'][:trunc_chars],
+                'condense': condense(item['content'], budget),
+            }
+            for name, sent in variants.items():
+                totals[name]['tokens'] += estimate_tokens(sent)
+                for term, value in recall(item['content'], sent).items():
+                    recall_sums[name][term] = recall_sums[name].get(term, 0) + value
+                    if name == 'truncate':
+                        recall_counts[term] = recall_counts.get(term, 0) + 1
+
+        for name in totals:
+            totals[name]['recall'] = {
+                term: round(recall_sums[name].get(term, 0) / count, 3)
+                for term, count in recall_counts.items()
+            }
+        results[stage] = totals
+    return results
+
+
+def live_benchmark(items: List[Dict[str, Any]], n: int) -> Dict[str, Any]:
+    """Run real extractions on both variants and count populated key fields"""
+    from utils.ai_extractor import router, EXTRACTION_PROMPT
+
+    counts = {'truncate': {f: 0 for f in KEY_FIELDS}, 'condense': {f: 0 for f in KEY_FIELDS}}
+    tokens = {'truncate': 0, 'condense': 0}
+    parsed = {'truncate': 0, 'condense': 0}
+
+    for item in items[:n]:
+        variants = {
+            'truncate': item['content'][:10000],
+            'condense': condense(item['content'], EXTRACTION_TOKEN_BUDGET),
+        }
+        for name, sent in variants.items():
+            try:
+                call = router.complete(
+                    'extraction',
+                    EXTRACTION_PROMPT.format(source=item['source'], content=sent),
+                    max_tokens=2000,
+                    source=f"bench_{name}"
+                )
+                tokens[name] += call.input_tokens
+                text = re.sub(r'^```json?\n?|\n?```$', '', call.text.strip())
+                data = json.loads(text)
+                parsed[name] += 1
+                for field in KEY_FIELDS:
+                    if data.get(field) not in (None, '', [], 0):
+                        counts[name][field] += 1
+            except Exception as e:
+                print(f"  {name} extraction failed: {e}")
+
+    return {'items': min(n, len(items)), 'input_tokens': tokens, 'parsed': parsed, 'fields_populated': counts}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Truncation vs condensation benchmark')
+    parser.add_argument('files', nargs='*', help='Raw archives (default: */output/*_raw_*)')
+    parser.add_argument('--live', type=int, default=0, help='Also run N real extractions per variant')
+    args = parser.parse_args()
+
+    paths = args.files or raw_paths()
+    items = load_items(paths)
+    if not items:
+        print("No items found - pass raw archive files or run a scrape first.")
+        sys.exit(0)
+
+    print(f"Benchmarking {len(items)} items from {len(paths)} files\n")
+    offline = offline_benchmark(items)
+    for stage, totals in offline.items():
+        t, c = totals['truncate'], totals['condense']
+        saved = 1 - c['tokens'] / t['tokens'] if t['tokens'] else 0
+        print(f"{stage.upper()}: truncate {t['tokens']:,} tokens -> condense {c['tokens']:,} tokens "
+              f"({saved * 100:.1f}% fewer)")
+        for term in t['recall']:
+            print(f"  {term:<10} recall: truncate {t['recall'][term]:.3f} | condense {c['recall'][term]:.3f}")
+
+    if args.live:
+        print(f"\nRunning live extraction on {args.live} items per variant...")
+        live = live_benchmark(items, args.live)
+        print(json.dumps(live, indent=2))
+
+
+if __name__ == '__main__':
+    main()
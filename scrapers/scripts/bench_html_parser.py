@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+"""
+HTML Parser Benchmark
+Pages/s for each utils/html_parser.py backend on article HTML, against the
+old BeautifulSoup(html.parser) + per-selector extraction, and how often
+each backend's single-pass extract_article agrees with the old code
+
+Corpus: saved article HTML (news/output/html/*.html, written when the news
+scraper runs with NEWS_SAVE_HTML=true) when present, otherwise synthetic
+article pages with realistic boilerplate.
+
+Usage:
+    python bench_html_parser.py                  # Saved HTML or 300 synthetic pages
+    python bench_html_parser.py --synthetic 1000
+    python bench_html_parser.py page1.html page2.html
+"""
+import sys
+import time
+import random
+import argparse
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+from urllib.parse import urljoin
+
+# Add parent to path for utils
+SCRAPERS_DIR = Path(__file__).parent.parent
+sys.path.insert(0, str(SCRAPERS_DIR))
+
+from bs4 import BeautifulSoup
+from utils.html_parser import BACKENDS, get_backend, parse_html, extract_article
+
+HTML_DIR = SCRAPERS_DIR / 'news' / 'output' / 'html'
+
+
+def legacy_extract(html: str, url: str) -> Optional[Dict[str, Any]]:
+    """NewsScraper._extract_article before the parser backend (html.parser, ~20 selector passes)"""
+    soup = BeautifulSoup(html, 'html.parser')
+
+    # Extract title
+    title = ''
+    for selector in ['h1', 'meta[property="og:title"]', '.headline', '.entry-title']:
+        elem = soup.select_one(selector)
+        if elem:
+            title = elem.get('content') if elem.name == 'meta' else elem.get_text(strip=True)
+            if title:
+                break
+
+    if not title:
+        return None
+
+    # Extract content
+    content = ''
+
+    # Try common article body selectors
+    body_selectors = [
+        'article .story-text',
+        'article .entry-content',
+        '.article-body',
+        '.story-body',
+        '.post-content',
+        '.article__body',
+        'article p',
+        '.content p',
+    ]
+
+    for selector in body_selectors:
+        paragraphs = soup.select(selector)
+        if paragraphs:
+            content = '\n\n'.join(p.get_text(strip=True) for p in paragraphs if len(p.get_text(strip=True)) > 30)
+            if len(content) > 200:
+                break
+
+    if len(content) < 100:
+        # Fallback: get all paragraphs from main content
+        main = soup.select_one('main, article, .content, .post')
+        if main:
+            paragraphs = main.find_all('p')
+            content = '\n\n'.join(p.get_text(strip=True) for p in paragraphs if len(p.get_text(strip=True)) > 30)
+
+    if len(content) < 100:
+        return None
+
+    # Extract images
+    images = []
+    og_image = soup.select_one('meta[property="og:image"]')
+    if og_image:
+        img_url = og_image.get('content')
+        if img_url:
+            images.append(img_url)
+
+    # Article images
+    for img in soup.select('article img, .article-body img, .story-body img')[:3]:
+        src = img.get('src') or img.get('data-src')
+        if src and src not in images:
+            if not src.startswith('http'):
+                src = urljoin(url, src)
+            images.append(src)
+
+    # Extract publish date
+    publish_date = None
+    date_selectors = [
+        'meta[property="article:published_time"]',
+        'time[datetime]',
+        '.publish-date',
+        '.date',
+    ]
+    for selector in date_selectors:
+        elem = soup.select_one(selector)
+        if elem:
+            date_str = elem.get('content') or elem.get('datetime') or elem.get_text(strip=True)
+            if date_str:
+                publish_date = date_str
+                break
+
+    # Extract author
+    author = ''
+    author_selectors = [
+        'meta[name="author"]',
+        '.author',
+        '.byline',
+        '[rel="author"]',
+    ]
+    for selector in author_selectors:
+        elem = soup.select_one(selector)
+        if elem:
+            author = elem.get('content') or elem.get_text(strip=True)
+            if author:
+                break
+
+    return {
+        'title': title,
+        'content': content,
+        'images': images[:5],
+        'author': author,
+        'publish_date': publish_date,
+    }
+
+
+NAV = ''.join(f'<li class="nav-item"><a href="/section/{i}">Section {i}</a></li>' for i in range(40))
+SCRIPT = '<script>window.__DATA__ = {' + ', '.join(f'"k{i}": {i}' for i in range(300)) + '};</script>'
+PARAGRAPHS = [
+    "When the itemized bill arrived, it listed $48,000 for a two-night stay and a CT scan.",
+    "Her insurer denied the claim, saying the emergency visit was not medically necessary.",
+    "Hospital pricing data shows the same procedure costs a fraction of that in Mexico.",
+    "Patients who appeal denials win more often than not, but few know they can appeal.",
+    "The ambulance company was out of network, so the family received a surprise bill.",
+]
+
+
+def synthetic_page(rng: random.Random, i: int) -> str:
+    """An article page with nav, scripts, sidebar and a 10-40 paragraph body"""
+    body = ''.join(
+        f'<p>{" ".join(rng.sample(PARAGRAPHS, 3))} <a href="/related/{j}">Related</a></p>'
+        for j in range(rng.randint(10, 40))
+    )
+    layout = rng.choice(['article-body', 'story-body', 'entry-content', None])
+    wrapped = f'<div class="{layout}">{body}</div>' if layout else body
+    return f"""<!DOCTYPE html><html><head><title>Story {i}</title>
+<meta property="og:title" content="Story {i}: a $48,000 bill">
+<meta property="og:image" content="https://cdn.example.com/{i}.jpg">
+<meta name="author" content="Reporter {i % 7}">
+<meta property="article:published_time" content="2025-0{i % 9 + 1}-15T10:00:00Z">
+{SCRIPT}</head><body><header><ul class="nav">{NAV}</ul></header>
+<main><article><h1 class="headline">Story {i}: the $48,000 bill</h1>
+<div class="byline">By Reporter {i % 7}</div><time datetime="2025-01-15">Jan 15</time>
+<img src="/img/{i}-1.jpg">{wrapped}<img data-src="/img/{i}-2.jpg"></article>
+<aside class="sidebar">{NAV}</aside></main><footer>{NAV}</footer>{SCRIPT}</body></html>"""
+
+
+def load_corpus(files: List[str], synthetic: int) -> List[str]:
+    if not synthetic:
+        paths = [Path(f) for f in files] or sorted(HTML_DIR.glob('*.html'))
+        pages = [p.read_text(encoding='utf-8', errors='replace') for p in paths]
+        if pages:
+            print(f"Saved HTML corpus: {len(pages):,} pages")
+            return pages
+    rng = random.Random(7)
+    pages = [synthetic_page(rng, i) for i in range(synthetic or 300)]
+    print(f"Synthetic corpus: {len(pages):,} pages")
+    return pages
+
+
+def timed(name: str, fn: Callable[[str], Any], corpus: List[str]) -> List[Any]:
+    start = time.perf_counter()
+    results = [fn(html) for html in corpus]
+    elapsed = time.perf_counter() - start
+    print(f"  {name:<40} {elapsed * 1000:9.1f}ms  {len(corpus) / elapsed:>8,.1f} pages/s")
+    return results
+
+
+def squash(value: Any) -> Any:
+    """Compare text ignoring whitespace (get_text(strip=True) drops spaces between inline tags)"""
+    return ''.join(value.split()) if isinstance(value, str) else value
+
+
+def agreement(old: List[Optional[dict]], new: List[Optional[dict]]) -> Dict[str, float]:
+    fields = ['title', 'content', 'images', 'author', 'publish_date']
+    same = dict.fromkeys(fields + ['accepted'], 0)
+    for a, b in zip(old, new):
+        same['accepted'] += (a is None) == (b is None)
+        for field in fields:
+            same[field] += squash((a or {}).get(field)) == squash((b or {}).get(field))
+    return {k: v / len(old) for k, v in same.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='HTML parser backend benchmark')
+    parser.add_argument('files', nargs='*', help=f'HTML files (default: {HTML_DIR}/*.html)')
+    parser.add_argument('--synthetic', type=int, default=0, help='Use N synthetic pages instead of saved HTML')
+    args = parser.parse_args()
+
+    corpus = load_corpus(args.files, args.synthetic)
+    url = 'https://news.example.com/story'
+    print(f"Average size: {sum(map(len, corpus)) / len(corpus) / 1024:,.0f} KB\n")
+
+    print("Parse only:")
+    timed('bs4 html.parser (old)', lambda h: BeautifulSoup(h, 'html.parser'), corpus)
+    available = []
+    for name in BACKENDS:
+        backend = get_backend(name)
+        if backend.name != name:
+            print(f"  {name:<40} not installed (falls back to {backend.name})")
+            continue
+        available.append(name)
+        timed(name, backend.parse, corpus)
+
+    print("\nParse + extract title/body/images/date/author:")
+    old = timed('bs4 html.parser + selector passes (old)', lambda h: legacy_extract(h, url), corpus)
+    results = {
+        name: timed(f"{name} + single-pass extract_article",
+                    lambda h, n=name: extract_article(parse_html(h, n), url), corpus)
+        for name in available
+    }
+
+    print("\nAgreement with the old extraction (whitespace-insensitive):")
+    for name, new in results.items():
+        rates = agreement(old, new)
+        print(f"  {name:<12} " + '  '.join(f"{k} {v:.1%}" for k, v in rates.items()))
+
+
+if __name__ == '__main__':
+    main()
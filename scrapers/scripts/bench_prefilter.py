@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Keyword Prefilter Benchmark
+Times the shared single-pass prefilter (utils/prefilter.py) against the old
+per-keyword `kw in text.lower()` loops on a corpus of posts
+
+Corpus: saved raw scrapes (*/output/*_raw_*) when present, otherwise a
+synthetic mix of healthcare and off-topic posts with realistic lengths.
+
+Usage:
+    python bench_prefilter.py                     # Raw archives or 20k synthetic posts
+    python bench_prefilter.py --synthetic 50000
+    python bench_prefilter.py ../reddit/output/reddit_raw_20250101_001.ndjson.gz
+"""
+import sys
+import time
+import random
+import argparse
+from pathlib import Path
+from typing import Callable, List
+
+# Add parent to path for utils
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from utils.prefilter import HEALTHCARE_KEYWORDS, KeywordPrefilter, SCRAPER_KEYWORDS, get_prefilter
+from bench_condense import load_items, raw_paths
+
+# The scrapers' keyword lists, as the old substring loops used them
+LEGACY_REDDIT = SCRAPER_KEYWORDS['reddit']
+LEGACY_NEWS = SCRAPER_KEYWORDS['news']
+
+FILLER = (
+    "so i was at work yesterday and my manager told me that the whole team would have to stay late "
+    "again this week which honestly is getting old because we have not had a weekend off in a month "
+    "and everyone is tired of it but nobody wants to say anything to the owner about the schedule"
+).split()
+HEALTH_SENTENCES = [
+    "The hospital sent me an itemized bill for $48,000 after my appendectomy.",
+    "Insurance denied the claim because they said prior authorization was missing.",
+    "I flew to Mexico for dental implants and paid $3,200 instead of $25,000.",
+    "My deductible is $7,000 and the copay for the MRI was another $400.",
+    "Medical debt went to collections and now my credit is ruined.",
+    "Insulin costs me $900 a month without coverage.",
+    "The ambulance ride was out of network, so the surprise bill was $2,800.",
+]
+
+
+def synthetic_corpus(n: int, seed: int = 11) -> List[str]:
+    """Posts of 30-600 words, ~40% containing healthcare sentences"""
+    rng = random.Random(seed)
+    corpus = []
+    for _ in range(n):
+        words = [rng.choice(FILLER) for _ in range(rng.randint(30, 600))]
+        text = ' '.join(words).capitalize() + '.'
+        if rng.random() < 0.4:
+            sentences = rng.sample(HEALTH_SENTENCES, rng.randint(1, 3))
+            text = f"{text} {' '.join(sentences)}"
+        corpus.append(text)
+    return corpus
+
+
+def timed(name: str, fn: Callable[[str], object], corpus: List[str]) -> List[object]:
+    start = time.perf_counter()
+    results = [fn(text) for text in corpus]
+    elapsed = time.perf_counter() - start
+    print(f"  {name:<38} {elapsed * 1000:8.1f}ms  {len(corpus) / elapsed:>10,.0f} posts/s")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Keyword prefilter microbenchmark')
+    parser.add_argument('files', nargs='*', help='Raw archives (default: */output/*_raw_*)')
+    parser.add_argument('--synthetic', type=int, default=0, help='Use N synthetic posts instead of dumps')
+    args = parser.parse_args()
+
+    corpus = []
+    if not args.synthetic:
+        paths = args.files or raw_paths()
+        corpus = [item['content'] for item in load_items(paths)]
+    if not corpus:
+        corpus = synthetic_corpus(args.synthetic or 20000)
+        print(f"Synthetic corpus: {len(corpus):,} posts")
+    else:
+        print(f"Raw-archive corpus: {len(corpus):,} posts")
+    print(f"Average length: {sum(map(len, corpus)) / len(corpus):,.0f} chars\n")
+
+    prefilter = KeywordPrefilter()
+    all_keywords = list(prefilter.keyword_categories)
+
+    print(f"Backend: {prefilter.backend}\n")
+    print(f"Per-category counts ({len(all_keywords)} keywords, {len(HEALTHCARE_KEYWORDS)} categories):")
+    legacy_counts = timed(
+        'per-keyword loops',
+        lambda t: (lambda low: {c: sum(low.count(kw) for kw in kws)
+                                for c, kws in HEALTHCARE_KEYWORDS.items()})(t.lower()),
+        corpus
+    )
+    new_counts = timed('single-pass prefilter.scan', lambda t: prefilter.scan(t).hits, corpus)
+
+    print(f"\nReddit check (any of {len(LEGACY_REDDIT)} keywords):")
+    legacy_reddit = timed('any(kw in text_lower)',
+                          lambda t: (lambda low: any(kw in low for kw in LEGACY_REDDIT))(t.lower()), corpus)
+    new_reddit = timed("get_prefilter('reddit').is_relevant", get_prefilter('reddit').is_relevant, corpus)
+
+    print(f"\nNews check (>= 3 distinct of {len(LEGACY_NEWS)} keywords):")
+    legacy_news = timed('sum(kw in text_lower) >= 3',
+                        lambda t: (lambda low: sum(1 for kw in LEGACY_NEWS if kw in low))(t.lower()) >= 3, corpus)
+    news = get_prefilter('news')
+    new_news = timed("get_prefilter('news').is_relevant(3)",
+                     lambda t: news.is_relevant(t, min_keywords=3), corpus)
+
+    print("\nAgreement with the old substring filters (differences are substring-only hits, e.g. 'claim' in 'disclaimer'):")
+    print(f"  reddit: {sum(a == b for a, b in zip(legacy_reddit, new_reddit)) / len(corpus):.3%} "
+          f"(old passed {sum(legacy_reddit):,}, new passes {sum(new_reddit):,})")
+    print(f"  news:   {sum(a == b for a, b in zip(legacy_news, new_news)) / len(corpus):.3%} "
+          f"(old passed {sum(legacy_news):,}, new passes {sum(new_news):,})")
+    drift = sum(1 for a, b in zip(legacy_counts, new_counts) if a != b)
+    print(f"  per-category counts differing (substring and nested-phrase hits): {drift:,}")
+
+
+if __name__ == '__main__':
+    main()
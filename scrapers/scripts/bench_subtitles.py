@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Subtitle Parser Benchmark
+MB/s and transcript tokens for utils/subtitles.py against the old
+YouTubeScraper._read_subtitles (whole-file read, three regexes per line,
+rolling captions kept), and how many segments/timestamps survive
+
+Corpus: the YouTube scraper's subtitle files (<NAS>/scraped/youtube/
+transcripts/*.srt, mostly auto-subs) when present, otherwise synthetic
+auto-subs in yt-dlp's converted-SRT layout (each line shown 3 times).
+
+Usage:
+    python bench_subtitles.py                      # NAS transcripts or 200 synthetic videos
+    python bench_subtitles.py --synthetic 1000
+    python bench_subtitles.py a.en.srt b.en.vtt
+"""
+import os
+import re
+import sys
+import time
+import random
+import argparse
+import tempfile
+from pathlib import Path
+from typing import List
+
+# Add parent to path for utils
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from utils.subtitles import parse_subtitles, segments_text
+from utils.condense import estimate_tokens
+
+TRANSCRIPTS_DIR = Path(os.getenv('NAS_MOUNT_PATH', '/mnt/nas/oasara')) / 'scraped' / 'youtube' / 'transcripts'
+
+WORDS = (
+    'so my hospital bill came to forty thousand dollars for a two night stay and insurance '
+    'denied the claim because they said the surgery was not medically necessary I flew to '
+    'mexico for the same procedure and paid eight thousand including the hotel the doctor '
+    'was amazing you guys this is why people go abroad um like honestly'
+).split()
+
+
+def legacy_read(srt_path: str) -> str:
+    """YouTubeScraper._read_subtitles before utils/subtitles.py"""
+    with open(srt_path, 'r', encoding='utf-8') as f:
+        content = f.read()
+    lines = []
+    for line in content.split('\n'):
+        if re.match(r'^\d+$', line.strip()):
+            continue
+        if re.match(r'^\d{2}:\d{2}:\d{2}', line):
+            continue
+        if line.strip():
+            line = re.sub(r'<[^>]+>', '', line)
+            lines.append(line.strip())
+    return ' '.join(lines)
+
+
+def _ts(seconds: float) -> str:
+    ms = int(round(seconds * 1000))
+    h, ms = divmod(ms, 3600000)
+    m, ms = divmod(ms, 60000)
+    s, ms = divmod(ms, 1000)
+    return f"{h:02d}:{m:02d}:{s:02d},{ms:03d}"
+
+
+def synthetic_autosub(rng: random.Random, minutes: int) -> str:
+    """Rolling-caption SRT as yt-dlp converts YouTube auto-subs: [prev, new] cue, then a 10ms [new] cue"""
+    cues = []
+    t, previous = 0.0, ''
+    while t < minutes * 60:
+        line = ' '.join(rng.choice(WORDS) for _ in range(rng.randint(5, 9)))
+        duration = rng.uniform(1.5, 3.5)
+        cues.append((t, t + duration, f"{previous}\n{line}" if previous else line))
+        cues.append((t + duration, t + duration + 0.01, line))
+        t += duration + 0.01
+        previous = line
+    return ''.join(f"{i}\n{_ts(a)} --> {_ts(b)}\n{text}\n\n" for i, (a, b, text) in enumerate(cues, 1))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the subtitle parser')
+    parser.add_argument('files', nargs='*', help='SRT/VTT files (default: NAS transcripts)')
+    parser.add_argument('--synthetic', type=int, default=None, help='Use N synthetic auto-sub files')
+    parser.add_argument('--repeat', type=int, default=3, help='Timed passes (best is reported)')
+    args = parser.parse_args()
+
+    tmp = None
+    files: List[str] = args.files
+    if not files and not args.synthetic and TRANSCRIPTS_DIR.exists():
+        files = [str(p) for p in sorted(TRANSCRIPTS_DIR.glob('*.srt')) + sorted(TRANSCRIPTS_DIR.glob('*.vtt'))]
+    if not files:
+        rng = random.Random(42)
+        tmp = tempfile.TemporaryDirectory(prefix='subs-')
+        for i in range(args.synthetic or 200):
+            path = Path(tmp.name) / f"video{i:04d}.en.srt"
+            path.write_text(synthetic_autosub(rng, rng.randint(3, 20)), encoding='utf-8')
+            files.append(str(path))
+        print(f"Synthetic corpus: {len(files)} auto-sub files")
+    else:
+        print(f"Corpus: {len(files)} subtitle files")
+
+    total_mb = sum(os.path.getsize(f) for f in files) / 1024 / 1024
+
+    def timed(fn):
+        best, out = float('inf'), None
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            out = [fn(f) for f in files]
+            best = min(best, time.perf_counter() - start)
+        return best, out
+
+    def parse(path):
+        segments = parse_subtitles(path)
+        return segments, segments_text(segments)
+
+    legacy_time, legacy_texts = timed(legacy_read)
+    new_time, parsed = timed(parse)
+    new_segments = [segments for segments, _ in parsed]
+    new_texts = [text for _, text in parsed]
+
+    legacy_tokens = sum(estimate_tokens(t) for t in legacy_texts)
+    new_tokens = sum(estimate_tokens(t) for t in new_texts)
+    segments = sum(len(s) for s in new_segments)
+
+    print(f"{total_mb:.1f}MB of subtitles")
+    print(f"  legacy:  {legacy_time * 1000:8.1f}ms ({total_mb / legacy_time:6.1f}MB/s), "
+          f"{legacy_tokens:,} tokens, no timestamps")
+    print(f"  stream:  {new_time * 1000:8.1f}ms ({total_mb / new_time:6.1f}MB/s), "
+          f"{new_tokens:,} tokens, {segments:,} timestamped segments")
+    if legacy_tokens:
+        print(f"  tokens:  -{1 - new_tokens / legacy_tokens:.0%} "
+              f"({legacy_tokens / max(new_tokens, 1):.1f}x less transcript sent to the LLM)")
+
+    if tmp:
+        tmp.cleanup()
+
+
+if __name__ == '__main__':
+    main()
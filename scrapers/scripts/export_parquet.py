@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Parquet Analytics Export
+Incrementally exports the stories table and raw scrape archives to
+partitioned Parquet (utils/parquet_export.py) and runs canned reports
+on the local copy
+
+Usage:
+    python export_parquet.py                       # Export new stories + raw items
+    python export_parquet.py --raw-only            # Raw archives only (no database)
+    python export_parquet.py --full                # Re-export everything
+    python export_parquet.py --report costs        # Cost distribution by procedure/country
+    python export_parquet.py --report acceptance   # Raw items vs stored stories by subreddit/source
+"""
+import os
+import sys
+import time
+import argparse
+from pathlib import Path
+from dotenv import load_dotenv
+
+# Add parent to path for utils
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+from utils.parquet_export import EXPORT_DIR, export_stories, export_raw, scan
+
+load_dotenv()
+
+
+def report_costs(export_dir: Path, source: str = None, since_month: str = None):
+    """US vs abroad cost distribution by procedure and country"""
+    table = scan(
+        'stories', ['procedure_type', 'country_abroad', 'cost_us', 'cost_abroad'],
+        source=source, since_month=since_month,
+        filter=ds.field('cost_us') > 0, export_dir=export_dir
+    )
+    if table.num_rows == 0:
+        print("No stories with costs exported yet.")
+        return
+
+    grouped = table.group_by(['procedure_type', 'country_abroad']).aggregate([
+        ('cost_us', 'count'),
+        ('cost_us', 'approximate_median'),
+        ('cost_us', 'max'),
+        ('cost_abroad', 'approximate_median'),
+    ]).sort_by([('cost_us_count', 'descending')])
+
+    print(f"{'procedure':<24} {'country':<16} {'n':>5} {'median US':>12} {'max US':>12} {'median abroad':>14}")
+    for row in grouped.slice(0, 40).to_pylist():
+        abroad = row['cost_abroad_approximate_median']
+        print(f"{(row['procedure_type'] or '-')[:24]:<24} {(row['country_abroad'] or '-')[:16]:<16} "
+              f"{row['cost_us_count']:>5} {row['cost_us_approximate_median']:>12,.0f} "
+              f"{row['cost_us_max']:>12,.0f} {abroad if abroad is not None else float('nan'):>14,.0f}")
+
+
+def report_acceptance(export_dir: Path, source: str = None, since_month: str = None):
+    """Share of raw items that became stories, and engagement of accepted vs dropped"""
+    raw = scan('raw', ['subreddit', 'source_url', 'engagement', 'source'],
+               source=source, since_month=since_month, export_dir=export_dir)
+    if raw.num_rows == 0:
+        print("No raw items exported yet.")
+        return
+    stored = scan('stories', ['source_url'], export_dir=export_dir).column('source_url')
+
+    accepted = pc.is_in(raw.column('source_url'), value_set=pc.unique(stored.combine_chunks()))
+    key = pc.if_else(pc.is_null(raw.column('subreddit')), raw.column('source'),
+                     pc.binary_join_element_wise('r/', raw.column('subreddit'), ''))
+    table = pa.table({
+        'key': key,
+        'accepted': pc.cast(accepted, pa.int64()),
+        'engagement_accepted': pc.if_else(accepted, raw.column('engagement'), None),
+        'engagement_dropped': pc.if_else(accepted, None, raw.column('engagement')),
+    })
+    grouped = table.group_by('key').aggregate([
+        ('accepted', 'count'),
+        ('accepted', 'sum'),
+        ('engagement_accepted', 'mean'),
+        ('engagement_dropped', 'mean'),
+    ]).sort_by([('accepted_count', 'descending')])
+
+    print(f"{'subreddit/source':<28} {'items':>7} {'stored':>7} {'rate':>7} {'eng. stored':>12} {'eng. dropped':>13}")
+    for row in grouped.to_pylist():
+        n, ok = row['accepted_count'], row['accepted_sum']
+        eng_ok = row['engagement_accepted_mean']
+        eng_drop = row['engagement_dropped_mean']
+        print(f"{(row['key'] or '-')[:28]:<28} {n:>7} {ok:>7} {ok / n:>7.1%} "
+              f"{eng_ok if eng_ok is not None else float('nan'):>12,.0f} "
+              f"{eng_drop if eng_drop is not None else float('nan'):>13,.0f}")
+
+
+REPORTS = {
+    'costs': report_costs,
+    'acceptance': report_acceptance,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Incremental Parquet export + local reports')
+    parser.add_argument('--export-dir', type=str, default=None, help=f'Default: {EXPORT_DIR}')
+    parser.add_argument('--full', action='store_true', help='Ignore export state and re-export everything')
+    parser.add_argument('--raw-only', action='store_true', help='Only export raw archives')
+    parser.add_argument('--stories-only', action='store_true', help='Only export the stories table')
+    parser.add_argument('--report', choices=list(REPORTS), default=None, help='Run a report instead of exporting')
+    parser.add_argument('--source', type=str, default=None, help='Report: limit to one source partition')
+    parser.add_argument('--since-month', type=str, default=None, help='Report: YYYY-MM lower bound')
+    args = parser.parse_args()
+
+    export_dir = Path(args.export_dir) if args.export_dir else EXPORT_DIR
+
+    if args.report:
+        start = time.perf_counter()
+        REPORTS[args.report](export_dir, source=args.source, since_month=args.since_month)
+        print(f"\n({time.perf_counter() - start:.2f}s)")
+        return
+
+    if not args.raw_only:
+        from supabase import create_client
+
+        supabase_url = os.getenv('SUPABASE_URL')
+        supabase_key = os.getenv('SUPABASE_SERVICE_KEY')
+        if not supabase_url or not supabase_key:
+            print("ERROR: SUPABASE_URL and SUPABASE_SERVICE_KEY required in .env (or use --raw-only)")
+            sys.exit(1)
+
+        start = time.perf_counter()
+        result = export_stories(create_client(supabase_url, supabase_key), export_dir, full=args.full)
+        print(f"Stories: {result['rows']:,} new rows -> {result['partitions']} partitions "
+              f"({time.perf_counter() - start:.1f}s)")
+
+    if not args.stories_only:
+        start = time.perf_counter()
+        result = export_raw(export_dir, full=args.full)
+        print(f"Raw archives: {result['rows']:,} new items -> {result['partitions']} partitions "
+              f"({time.perf_counter() - start:.1f}s)")
+
+    print(f"Export directory: {export_dir}")
+
+
+if __name__ == '__main__':
+    main()
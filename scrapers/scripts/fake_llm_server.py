@@ -0,0 +1,302 @@
+#!/usr/bin/env python3
+"""
+Deterministic Stand-in for the Anthropic Messages API
+Local fake server for load testing the extraction path without burning quota
+
+- POST /v1/messages returns canned ACCEPT/REJECT/REVIEW_NEEDED decisions or
+  templated extraction JSON (amounts pulled from the prompt content)
+- Configurable latency distribution (fixed / uniform / lognormal)
+- 429 / 529 injection with retry-after headers, plus an optional RPM limit
+- GET /stats returns request counters
+
+Point ai_extractor at it with ANTHROPIC_BASE_URL=http://127.0.0.1:8765
+
+Usage:
+    python fake_llm_server.py                                   # port 8765, 200ms fixed
+    python fake_llm_server.py --latency lognormal --latency-ms 800 --sigma 0.5
+    python fake_llm_server.py --rate-429 0.05 --rate-529 0.02 --retry-after 1
+    python fake_llm_server.py --rpm 50                          # real rate limiting
+"""
+import re
+import json
+import math
+import time
+import random
+import hashlib
+import argparse
+import threading
+from collections import deque
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Optional, Tuple
+
+RELEVANCE_MARKER = 'Respond with ONLY: ACCEPT, REJECT, or REVIEW_NEEDED'
+MONEY_RE = re.compile(r'\$\s?(\d[\d,]*)')
+
+
+@dataclass
+class FakeConfig:
+    """Server behaviour knobs"""
+    latency: str = 'fixed'          # fixed | uniform | lognormal
+    latency_ms: float = 200.0       # fixed value / uniform upper bound / lognormal median
+    sigma: float = 0.5              # lognormal shape
+    rate_429: float = 0.0           # fraction of requests rejected with 429
+    rate_529: float = 0.0           # fraction of requests rejected with 529 (overloaded)
+    retry_after: float = 1.0        # seconds, sent in retry-after header
+    rpm: int = 0                    # requests/minute limit (0 = unlimited)
+    accept_ratio: float = 0.6       # share of relevance calls answered ACCEPT
+    review_ratio: float = 0.1       # share answered REVIEW_NEEDED (rest REJECT)
+    seed: int = 42
+
+
+@dataclass
+class FakeStats:
+    requests: int = 0
+    ok: int = 0
+    injected_429: int = 0
+    injected_529: int = 0
+    rate_limited: int = 0
+    by_kind: Dict[str, int] = field(default_factory=dict)
+
+
+def _unit(*parts: Any) -> float:
+    """Deterministic value in [0, 1) from the given parts"""
+    digest = hashlib.sha256('|'.join(str(p) for p in parts).encode()).digest()
+    return int.from_bytes(digest[:8], 'big') / 2 ** 64
+
+
+def relevance_response(content: str, config: FakeConfig) -> str:
+    """Canned decision - same content always gets the same answer"""
+    u = _unit('relevance', config.seed, content)
+    if u < config.accept_ratio:
+        return 'ACCEPT - specific costs and actionable details'
+    if u < config.accept_ratio + config.review_ratio:
+        return 'REVIEW_NEEDED - borderline, limited specifics'
+    return 'REJECT - off-topic or lacks specific details'
+
+
+def extraction_response(content: str, model: str) -> str:
+    """Templated extraction JSON using amounts found in the prompt"""
+    body = content.split('---', 2)[1] if content.count('---') >= 2 else content
+    amounts = sorted(
+        {int(a.replace(',', '')) for a in MONEY_RE.findall(body) if a.replace(',', '').isdigit()},
+        reverse=True
+    )
+    cost_us = amounts[0] if amounts else None
+    cost_abroad = amounts[-1] if len(amounts) > 1 else None
+    first_line = body.strip().split('\n', 1)[0][:90] or 'Healthcare story'
+
+    return json.dumps({
+        'title': first_line,
+        'summary': f"Stand-in summary generated by {model}.",
+        'content': body.strip()[:2000],
+        'story_type': 'comparison' if cost_abroad else 'horror',
+        'procedure': None,
+        'cost_us': cost_us,
+        'cost_abroad': cost_abroad,
+        'country_abroad': None,
+        'facility_abroad': None,
+        'insurance_involved': 'insurance' in body.lower(),
+        'insurance_denied': 'denied' in body.lower(),
+        'savings_amount': cost_us - cost_abroad if cost_us and cost_abroad else None,
+        'emotional_tags': ['shock'] if cost_us and cost_us > 10000 else [],
+        'issues': ['denied_coverage'] if 'denied' in body.lower() else [],
+        'viral_score': 5,
+        'key_quote': None,
+    })
+
+
+class FakeLLMServer:
+    """Threaded HTTP server implementing the subset of /v1/messages we use"""
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 8765, config: Optional[FakeConfig] = None):
+        self.config = config or FakeConfig()
+        self.stats = FakeStats()
+        self._lock = threading.Lock()
+        self._rng = random.Random(self.config.seed)
+        self._window: deque = deque()
+        self._counter = 0
+        self.httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self.httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> 'FakeLLMServer':
+        """Serve in a background thread (for load-test scripts)"""
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def _latency(self) -> float:
+        """Sample latency in seconds"""
+        c = self.config
+        with self._lock:
+            if c.latency == 'uniform':
+                ms = self._rng.uniform(0, c.latency_ms)
+            elif c.latency == 'lognormal':
+                ms = self._rng.lognormvariate(math.log(max(c.latency_ms, 1)), c.sigma)
+            else:
+                ms = c.latency_ms
+        return ms / 1000
+
+    def _admit(self) -> Tuple[int, Optional[str]]:
+        """Decide whether this request is served, injected-failed or rate limited"""
+        c = self.config
+        with self._lock:
+            self._counter += 1
+            self.stats.requests += 1
+            n = self._counter
+
+            if c.rpm:
+                now = time.monotonic()
+                while self._window and now - self._window[0] > 60:
+                    self._window.popleft()
+                if len(self._window) >= c.rpm:
+                    self.stats.rate_limited += 1
+                    return 429, 'rate_limit_error'
+                self._window.append(now)
+
+        u = _unit('fault', c.seed, n)
+        if u < c.rate_429:
+            with self._lock:
+                self.stats.injected_429 += 1
+            return 429, 'rate_limit_error'
+        if u < c.rate_429 + c.rate_529:
+            with self._lock:
+                self.stats.injected_529 += 1
+            return 529, 'overloaded_error'
+        return 200, None
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):
+                pass  # Quiet - stats are available at /stats
+
+            def _send_json(self, status: int, payload: Dict[str, Any], headers: Optional[Dict[str, str]] = None):
+                body = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header('content-type', 'application/json')
+                self.send_header('content-length', str(len(body)))
+                for key, value in (headers or {}).items():
+                    self.send_header(key, value)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):
+                if self.path.rstrip('/') == '/stats':
+                    with server._lock:
+                        self._send_json(200, server.stats.__dict__)
+                else:
+                    self._send_json(404, {'type': 'error', 'error': {'type': 'not_found_error', 'message': self.path}})
+
+            def do_POST(self):
+                if not self.path.startswith('/v1/messages'):
+                    self._send_json(404, {'type': 'error', 'error': {'type': 'not_found_error', 'message': self.path}})
+                    return
+
+                length = int(self.headers.get('content-length', 0))
+                request = json.loads(self.rfile.read(length) or b'{}')
+
+                status, error_type = server._admit()
+                if status != 200:
+                    self._send_json(
+                        status,
+                        {'type': 'error', 'error': {'type': error_type, 'message': 'Injected by fake server'}},
+                        {'retry-after': str(server.config.retry_after)}
+                    )
+                    return
+
+                time.sleep(server._latency())
+
+                model = request.get('model', 'fake-model')
+                messages = request.get('messages') or [{}]
+                content = messages[-1].get('content', '')
+                if isinstance(content, list):
+                    content = ' '.join(block.get('text', '') for block in content if isinstance(block, dict))
+
+                if RELEVANCE_MARKER in content:
+                    kind, text = 'relevance', relevance_response(content, server.config)
+                else:
+                    kind, text = 'extraction', extraction_response(content, model)
+
+                with server._lock:
+                    server.stats.ok += 1
+                    server.stats.by_kind[kind] = server.stats.by_kind.get(kind, 0) + 1
+
+                self._send_json(200, {
+                    'id': f"msg_fake_{server.stats.requests}",
+                    'type': 'message',
+                    'role': 'assistant',
+                    'model': model,
+                    'content': [{'type': 'text', 'text': text}],
+                    'stop_reason': 'end_turn',
+                    'stop_sequence': None,
+                    'usage': {
+                        'input_tokens': len(content) // 4,
+                        'output_tokens': len(text) // 4,
+                    },
+                })
+
+        return Handler
+
+
+def add_config_args(parser: argparse.ArgumentParser):
+    """Shared CLI flags (also used by loadtest_extraction.py)"""
+    parser.add_argument('--latency', choices=['fixed', 'uniform', 'lognormal'], default='fixed')
+    parser.add_argument('--latency-ms', type=float, default=200.0)
+    parser.add_argument('--sigma', type=float, default=0.5, help='Lognormal shape')
+    parser.add_argument('--rate-429', type=float, default=0.0, help='Fraction of requests failed with 429')
+    parser.add_argument('--rate-529', type=float, default=0.0, help='Fraction of requests failed with 529')
+    parser.add_argument('--retry-after', type=float, default=1.0, help='retry-after header (seconds)')
+    parser.add_argument('--rpm', type=int, default=0, help='Requests/minute limit (0 = unlimited)')
+    parser.add_argument('--accept-ratio', type=float, default=0.6)
+    parser.add_argument('--review-ratio', type=float, default=0.1)
+    parser.add_argument('--seed', type=int, default=42)
+
+
+def config_from_args(args) -> FakeConfig:
+    return FakeConfig(
+        latency=args.latency,
+        latency_ms=args.latency_ms,
+        sigma=args.sigma,
+        rate_429=args.rate_429,
+        rate_529=args.rate_529,
+        retry_after=args.retry_after,
+        rpm=args.rpm,
+        accept_ratio=args.accept_ratio,
+        review_ratio=args.review_ratio,
+        seed=args.seed,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Fake Anthropic Messages API for load testing')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    add_config_args(parser)
+    args = parser.parse_args()
+
+    server = FakeLLMServer(args.host, args.port, config_from_args(args))
+    print(f"Fake Messages API listening on {server.url}")
+    print(f"  export ANTHROPIC_BASE_URL={server.url}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+        print(f"\nStats: {json.dumps(server.stats.__dict__)}")
+
+
+if __name__ == '__main__':
+    main()
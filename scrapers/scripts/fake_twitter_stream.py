@@ -0,0 +1,408 @@
+#!/usr/bin/env python3
+"""
+Deterministic Stand-in for the X/Twitter v2 Filtered Stream
+Local fake server for exercising `twitter/scraper.py --stream` (rules sync,
+reconnects, engagement refresh) without API access or quota
+
+- GET/POST /2/tweets/search/stream/rules keeps rules in memory
+- GET /2/tweets/search/stream streams generated tweets (chunked NDJSON with
+  includes + matching_rules) at --rate per second, "\\r\\n" keep-alives, and
+  closes the stream after --disconnect-after seconds
+- 429 / 503 injection on connect, plus a --max-connections limit (429)
+- GET /2/tweets?ids= returns the same tweets with likes that grow with age:
+  --viral-ratio of them reach --viral-likes within --ramp seconds
+- GET /media/<key>.jpg|mp4 serves placeholder media, GET /stats counters
+
+Point the scraper at it with TWITTER_API_BASE=http://127.0.0.1:8766 (any
+X_BEARER_TOKEN works); pair with fake_llm_server.py for extraction.
+
+Usage:
+    python fake_twitter_stream.py                                   # port 8766, 1 tweet/s
+    python fake_twitter_stream.py --rate 20 --disconnect-after 30   # bursts + server closes
+    python fake_twitter_stream.py --rate-429 0.3 --rate-503 0.2     # flaky connects
+    python fake_twitter_stream.py --keepalive 2 --ramp 30 --viral-ratio 0.5
+"""
+import json
+import time
+import random
+import hashlib
+import argparse
+import threading
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlparse, parse_qs
+
+TWITTER_EPOCH_MS = 1288834974657
+
+HEALTHCARE_TEXTS = [
+    'Just got my hospital bill for a 2 night stay: ${a:,}. Insurance denied the claim as not medically necessary.',
+    'ER bill came in at ${a:,} for stitches. The itemized bill has a $90 charge for a bag of saline.',
+    'My insurance company denied prior authorization again. Surgery quoted at ${a:,} out of pocket.',
+    'Flew to Mexico for dental work, paid ${b:,} instead of ${a:,} here. Medical tourism saved us.',
+    'Medical debt from one ambulance ride: ${a:,}. Sent to collections while I was still in the hospital.',
+    'Insulin price in America is ${b:,} a month. Same vial is a fraction of that abroad.',
+]
+OFF_TOPIC_TEXTS = [
+    'What a game last night, that last minute goal was unreal',
+    'New coffee place downtown is worth the line honestly',
+    'Anyone else think this season finale was rushed?',
+]
+
+# 1x1 JPEG
+PLACEHOLDER_JPEG = bytes.fromhex(
+    'ffd8ffe000104a46494600010100000100010000ffdb004300080606070605080707070909080a0c140d0c0b0b0c1912130f14'
+    '1d1a1f1e1d1a1c1c20242e2720222c231c1c2837292c30313434341f27393d38323c2e333432ffc0000b080001000101011100'
+    'ffc4001f0000010501010101010100000000000000000102030405060708090a0bffc400b5100002010303020403050504040000'
+    '017d01020300041105122131410613516107227114328191a1082342b1c11552d1f02433627282090a161718191a25262728292a'
+    '3435363738393a434445464748494a535455565758595a636465666768696a737475767778797a838485868788898a9293949596'
+    '9798999aa2a3a4a5a6a7a8a9aab2b3b4b5b6b7b8b9bac2c3c4c5c6c7c8c9cad2d3d4d5d6d7d8d9dae1e2e3e4e5e6e7e8e9eaf1f2'
+    'f3f4f5f6f7f8f9faffda0008010100003f00fbd3ffd9'
+)
+
+
+@dataclass
+class FakeConfig:
+    """Server behaviour knobs"""
+    rate: float = 1.0               # tweets per second per connection
+    keepalive: float = 20.0         # seconds between "\r\n" keep-alives
+    disconnect_after: float = 0.0   # close each stream after N seconds (0 = never)
+    max_connections: int = 1        # concurrent streams before 429 (X allows 1 on most tiers)
+    rate_429: float = 0.0           # fraction of connects rejected with 429
+    rate_503: float = 0.0           # fraction of connects rejected with 503
+    relevant_ratio: float = 0.8     # share of tweets with healthcare text
+    media_ratio: float = 0.3        # share with a photo (half of those get a video instead)
+    viral_ratio: float = 0.2        # share of tweets that reach viral_likes
+    viral_likes: int = 500
+    ramp: float = 120.0             # seconds for a viral tweet to reach viral_likes
+    seed: int = 42
+
+
+@dataclass
+class FakeStats:
+    connects: int = 0
+    rejected_429: int = 0
+    rejected_503: int = 0
+    streamed: int = 0
+    lookups: int = 0
+    rule_changes: int = 0
+    active_streams: int = 0
+    by_rule: Dict[str, int] = field(default_factory=dict)
+
+
+def _unit(*parts: Any) -> float:
+    """Deterministic value in [0, 1) from the given parts"""
+    digest = hashlib.sha256('|'.join(str(p) for p in parts).encode()).digest()
+    return int.from_bytes(digest[:8], 'big') / 2 ** 64
+
+
+class FakeTwitterServer:
+    """Threaded HTTP server implementing the filtered stream endpoints we use"""
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 8766, config: Optional[FakeConfig] = None):
+        self.config = config or FakeConfig()
+        self.stats = FakeStats()
+        self.rules: List[Dict[str, str]] = []
+        self.tweets: Dict[str, Dict[str, Any]] = {}   # id -> {data, includes, created}
+        self._lock = threading.Lock()
+        self._counter = 0
+        self._rule_ids = 0
+        self.httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self.httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> 'FakeTwitterServer':
+        """Serve in a background thread (for test scripts)"""
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def _admit(self) -> int:
+        """Status for a new stream connection"""
+        c = self.config
+        with self._lock:
+            self.stats.connects += 1
+            n = self.stats.connects
+            if self.stats.active_streams >= c.max_connections:
+                self.stats.rejected_429 += 1
+                return 429
+        u = _unit('connect', c.seed, n)
+        if u < c.rate_429:
+            with self._lock:
+                self.stats.rejected_429 += 1
+            return 429
+        if u < c.rate_429 + c.rate_503:
+            with self._lock:
+                self.stats.rejected_503 += 1
+            return 503
+        return 200
+
+    def new_tweet(self) -> Optional[Dict[str, Any]]:
+        """Generate the next tweet for a random rule (None if there are no rules)"""
+        c = self.config
+        with self._lock:
+            if not self.rules:
+                return None
+            self._counter += 1
+            n = self._counter
+            rule = self.rules[n % len(self.rules)]
+        now_ms = int(time.time() * 1000)
+        tweet_id = str(((now_ms - TWITTER_EPOCH_MS) << 22) | (n % 4096))
+        rng = random.Random(f"{c.seed}:{n}")
+
+        if rng.random() < c.relevant_ratio:
+            a = rng.choice([4800, 12500, 38000, 96000, 150000])
+            text = rng.choice(HEALTHCARE_TEXTS).format(a=a, b=a // 6)
+        else:
+            text = rng.choice(OFF_TOPIC_TEXTS)
+
+        user_id = str(1000 + n % 50)
+        data = {
+            'id': tweet_id,
+            'edit_history_tweet_ids': [tweet_id],
+            'text': text,
+            'author_id': user_id,
+            'created_at': datetime.fromtimestamp(now_ms / 1000, tz=timezone.utc).strftime('%Y-%m-%dT%H:%M:%S.000Z'),
+            'public_metrics': {'like_count': 0, 'retweet_count': 0, 'reply_count': 0, 'quote_count': 0},
+        }
+        includes: Dict[str, List[Dict[str, Any]]] = {
+            'users': [{'id': user_id, 'username': f"patient{user_id}", 'name': f"Patient {user_id}"}],
+        }
+        if rng.random() < c.media_ratio:
+            key = f"3_{tweet_id}"
+            data['attachments'] = {'media_keys': [key]}
+            if rng.random() < 0.5:
+                includes['media'] = [{
+                    'media_key': key, 'type': 'video',
+                    'preview_image_url': f"{self.url}/media/{key}.jpg",
+                    'variants': [
+                        {'bit_rate': 832000, 'content_type': 'video/mp4', 'url': f"{self.url}/media/{key}.mp4"},
+                        {'content_type': 'application/x-mpegURL', 'url': f"{self.url}/media/{key}.m3u8"},
+                    ],
+                }]
+            else:
+                includes['media'] = [{'media_key': key, 'type': 'photo', 'url': f"{self.url}/media/{key}.jpg"}]
+
+        with self._lock:
+            self.tweets[tweet_id] = {'data': data, 'includes': includes, 'created': time.monotonic()}
+            self.stats.streamed += 1
+            self.stats.by_rule[rule['tag']] = self.stats.by_rule.get(rule['tag'], 0) + 1
+        return {
+            'data': data,
+            'includes': includes,
+            'matching_rules': [{'id': rule['id'], 'tag': rule['tag']}],
+        }
+
+    def likes(self, tweet_id: str, created: float) -> int:
+        """Current likes: viral tweets ramp up to viral_likes, the rest stay in single digits"""
+        c = self.config
+        if _unit('viral', c.seed, tweet_id) >= c.viral_ratio:
+            return int(_unit('likes', c.seed, tweet_id) * 10)
+        age = time.monotonic() - created
+        return int(c.viral_likes * min(1.0, age / c.ramp if c.ramp else 1.0))
+
+    def lookup(self, ids: List[str]) -> Dict[str, Any]:
+        """GET /2/tweets response with refreshed public_metrics"""
+        data, users, media, errors = [], {}, {}, []
+        with self._lock:
+            self.stats.lookups += 1
+            found = {i: self.tweets.get(i) for i in ids}
+        for tweet_id, tweet in found.items():
+            if tweet is None:
+                errors.append({'value': tweet_id, 'title': 'Not Found Error', 'resource_type': 'tweet'})
+                continue
+            likes = self.likes(tweet_id, tweet['created'])
+            data.append({**tweet['data'], 'public_metrics': {
+                'like_count': likes, 'retweet_count': likes // 10, 'reply_count': likes // 20, 'quote_count': 0,
+            }})
+            for user in tweet['includes'].get('users', []):
+                users[user['id']] = user
+            for m in tweet['includes'].get('media', []):
+                media[m['media_key']] = m
+        payload: Dict[str, Any] = {}
+        if data:
+            payload['data'] = data
+            payload['includes'] = {'users': list(users.values())}
+            if media:
+                payload['includes']['media'] = list(media.values())
+        if errors:
+            payload['errors'] = errors
+        return payload
+
+    def change_rules(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        now = datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%S.000Z')
+        with self._lock:
+            self.stats.rule_changes += 1
+            if 'delete' in body:
+                ids = set(body['delete'].get('ids') or [])
+                before = len(self.rules)
+                self.rules = [r for r in self.rules if r['id'] not in ids]
+                deleted = before - len(self.rules)
+                return {'meta': {'sent': now, 'summary': {'deleted': deleted, 'not_deleted': len(ids) - deleted}}}
+            added = []
+            for rule in body.get('add') or []:
+                self._rule_ids += 1
+                added.append({'id': str(1500000000000000000 + self._rule_ids), 'value': rule['value'],
+                              **({'tag': rule['tag']} if rule.get('tag') else {})})
+            self.rules.extend(added)
+        return {'data': added, 'meta': {'sent': now, 'summary': {
+            'created': len(added), 'not_created': 0, 'valid': len(added), 'invalid': 0,
+        }}}
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def log_message(self, format, *args):
+                pass  # Quiet - stats are available at /stats
+
+            def _send_json(self, status: int, payload: Dict[str, Any]):
+                body = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header('content-type', 'application/json')
+                self.send_header('content-length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _send_error(self, status: int, title: str):
+                self._send_json(status, {'title': title, 'detail': 'Injected by fake server', 'status': status,
+                                         'type': 'about:blank'})
+
+            def _chunk(self, data: bytes):
+                self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+                self.wfile.flush()
+
+            def _stream(self):
+                status = server._admit()
+                if status != 200:
+                    self._send_error(status, 'ConnectionException' if status == 429 else 'Service Unavailable')
+                    return
+
+                c = server.config
+                self.send_response(200)
+                self.send_header('content-type', 'application/json')
+                self.send_header('transfer-encoding', 'chunked')
+                self.end_headers()
+                with server._lock:
+                    server.stats.active_streams += 1
+                started = last_write = time.monotonic()
+                next_tweet = started + 1 / c.rate if c.rate else float('inf')
+                try:
+                    while not c.disconnect_after or time.monotonic() - started < c.disconnect_after:
+                        now = time.monotonic()
+                        if now >= next_tweet:
+                            next_tweet += 1 / c.rate
+                            payload = server.new_tweet()
+                            if payload:
+                                self._chunk(json.dumps(payload).encode() + b'\r\n')
+                                last_write = now
+                        if now - last_write >= c.keepalive:
+                            self._chunk(b'\r\n')
+                            last_write = now
+                        time.sleep(min(0.05, max(0.0, min(next_tweet, last_write + c.keepalive) - now)))
+                    self.wfile.write(b'0\r\n\r\n')
+                    self.wfile.flush()
+                except (BrokenPipeError, ConnectionResetError):
+                    pass  # Client disconnected
+                finally:
+                    with server._lock:
+                        server.stats.active_streams -= 1
+                self.close_connection = True
+
+            def do_GET(self):
+                url = urlparse(self.path)
+                path = url.path.rstrip('/')
+                if path == '/stats':
+                    with server._lock:
+                        self._send_json(200, {**server.stats.__dict__, 'rules': len(server.rules)})
+                elif path == '/2/tweets/search/stream':
+                    self._stream()
+                elif path == '/2/tweets/search/stream/rules':
+                    with server._lock:
+                        rules = list(server.rules)
+                    payload: Dict[str, Any] = {'meta': {'sent': datetime.now(timezone.utc).isoformat(),
+                                                        'result_count': len(rules)}}
+                    if rules:
+                        payload['data'] = rules
+                    self._send_json(200, payload)
+                elif path == '/2/tweets':
+                    ids = ','.join(parse_qs(url.query).get('ids', [''])).split(',')
+                    self._send_json(200, server.lookup([i for i in ids if i]))
+                elif path.startswith('/media/'):
+                    body = PLACEHOLDER_JPEG if path.endswith('.jpg') else b'\x00\x00\x00\x18ftypmp42' + bytes(4096)
+                    self.send_response(200)
+                    self.send_header('content-type', 'image/jpeg' if path.endswith('.jpg') else 'video/mp4')
+                    self.send_header('content-length', str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+                else:
+                    self._send_error(404, 'Not Found')
+
+            def do_POST(self):
+                length = int(self.headers.get('content-length', 0))
+                body = json.loads(self.rfile.read(length) or b'{}')
+                if urlparse(self.path).path.rstrip('/') == '/2/tweets/search/stream/rules':
+                    self._send_json(200, server.change_rules(body))
+                else:
+                    self._send_error(404, 'Not Found')
+
+        return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Fake X/Twitter filtered stream for local testing')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8766)
+    parser.add_argument('--rate', type=float, default=1.0, help='Tweets per second per stream')
+    parser.add_argument('--keepalive', type=float, default=20.0, help='Seconds between keep-alives')
+    parser.add_argument('--disconnect-after', type=float, default=0.0, help='Close streams after N seconds')
+    parser.add_argument('--max-connections', type=int, default=1, help='Concurrent streams before 429')
+    parser.add_argument('--rate-429', type=float, default=0.0, help='Fraction of connects failed with 429')
+    parser.add_argument('--rate-503', type=float, default=0.0, help='Fraction of connects failed with 503')
+    parser.add_argument('--relevant-ratio', type=float, default=0.8)
+    parser.add_argument('--media-ratio', type=float, default=0.3)
+    parser.add_argument('--viral-ratio', type=float, default=0.2)
+    parser.add_argument('--viral-likes', type=int, default=500)
+    parser.add_argument('--ramp', type=float, default=120.0, help='Seconds for viral tweets to reach --viral-likes')
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    server = FakeTwitterServer(args.host, args.port, FakeConfig(
+        rate=args.rate,
+        keepalive=args.keepalive,
+        disconnect_after=args.disconnect_after,
+        max_connections=args.max_connections,
+        rate_429=args.rate_429,
+        rate_503=args.rate_503,
+        relevant_ratio=args.relevant_ratio,
+        media_ratio=args.media_ratio,
+        viral_ratio=args.viral_ratio,
+        viral_likes=args.viral_likes,
+        ramp=args.ramp,
+        seed=args.seed,
+    ))
+    print(f"Fake filtered stream listening on {server.url}")
+    print(f"  export TWITTER_API_BASE={server.url}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+        print(f"\nStats: {json.dumps(server.stats.__dict__)}")
+
+
+if __name__ == '__main__':
+    main()
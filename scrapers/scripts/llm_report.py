@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+LLM Cost & Throughput Report
+Summarizes Claude calls recorded by the model router (utils/llm_metrics.py)
+
+Usage:
+    python llm_report.py                 # All recorded calls
+    python llm_report.py --hours 24      # Last 24 hours only
+    python llm_report.py --json          # Machine-readable output
+"""
+import sys
+import json
+import time
+import argparse
+from pathlib import Path
+
+# Add parent to path for utils
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from utils.llm_metrics import MetricsSink, METRICS_PATH
+
+
+def print_report(report: dict):
+    """Print report tables to console"""
+    print("\n" + "=" * 78)
+    print("OASARA LLM COST REPORT")
+    print("=" * 78)
+
+    print(f"\n{'Source':<12} {'Calls':>7} {'Tok in':>10} {'Tok out':>9} {'Cost $':>9} "
+          f"{'ms/call':>8} {'calls/m':>8} {'Stored':>7} {'$/story':>8}")
+    print("-" * 78)
+    totals = {'calls': 0, 'cost_usd': 0.0, 'stories_stored': 0}
+    for source, r in sorted(report['by_source'].items()):
+        per_story = f"{r['cost_per_story_usd']:.4f}" if r.get('cost_per_story_usd') is not None else '-'
+        print(f"{source:<12} {r.get('calls', 0):>7} {r.get('input_tokens', 0):>10} "
+              f"{r.get('output_tokens', 0):>9} {r.get('cost_usd', 0):>9.4f} "
+              f"{r.get('avg_latency_ms', 0):>8.0f} {r.get('calls_per_min', 0):>8.2f} "
+              f"{r.get('stories_stored', 0):>7} {per_story:>8}")
+        for key in totals:
+            totals[key] += r.get(key, 0) or 0
+    print("-" * 78)
+    per_story = totals['cost_usd'] / totals['stories_stored'] if totals['stories_stored'] else 0
+    print(f"{'TOTAL':<12} {totals['calls']:>7} {'':>10} {'':>9} {totals['cost_usd']:>9.4f} "
+          f"{'':>8} {'':>8} {totals['stories_stored']:>7} {per_story:>8.4f}")
+
+    print("\nBy task / model:")
+    for key, r in sorted(report['by_task_model'].items()):
+        print(f"  {key:<50} {r['calls']:>6} calls  ${r['cost_usd']:.4f}  {r['avg_latency_ms']:.0f}ms avg")
+
+    print("\nOutcomes:")
+    for key, count in sorted(report['outcomes'].items()):
+        print(f"  {key:<40} {count:>6}")
+    print("=" * 78)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Claude call throughput and cost per stored story')
+    parser.add_argument('--hours', type=float, default=None,
+                        help='Only include the last N hours')
+    parser.add_argument('--db', type=str, default=METRICS_PATH,
+                        help='Metrics database path')
+    parser.add_argument('--json', action='store_true',
+                        help='Print report as JSON')
+    args = parser.parse_args()
+
+    if not Path(args.db).exists():
+        print(f"No metrics database at {args.db} - run a scrape first.")
+        sys.exit(0)
+
+    since = time.time() - args.hours * 3600 if args.hours else None
+    report = MetricsSink(args.db).report(since=since)
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report)
+
+
+if __name__ == '__main__':
+    main()
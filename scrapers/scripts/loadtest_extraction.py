@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Extraction Load Test
+Drives extract_story_data concurrently against the fake Messages API
+(scripts/fake_llm_server.py) to benchmark concurrency, rate limiting,
+retries and end-to-end throughput offline
+
+Usage:
+    python loadtest_extraction.py                               # In-process fake server
+    python loadtest_extraction.py --items 500 --workers 16
+    python loadtest_extraction.py --rate-429 0.1 --retry-after 0.5 --max-retries 4
+    python loadtest_extraction.py --url http://127.0.0.1:8765   # External fake server
+"""
+import sys
+import time
+import json
+import random
+import argparse
+import tempfile
+import statistics
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+# Add parent to path for utils
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from fake_llm_server import FakeLLMServer, add_config_args, config_from_args
+
+PROCEDURES = ['knee replacement', 'dental implants', 'hip replacement', 'appendectomy', 'MRI', 'root canal']
+COUNTRIES = ['Mexico', 'Thailand', 'Costa Rica', 'Colombia', 'Turkey']
+
+
+def synthetic_items(n: int, seed: int = 7):
+    """Story-shaped items with dollar amounts, procedures and insurance terms"""
+    rng = random.Random(seed)
+    items = []
+    for i in range(n):
+        us = rng.randint(2, 150) * 1000
+        abroad = us // rng.randint(3, 10)
+        proc = rng.choice(PROCEDURES)
+        country = rng.choice(COUNTRIES)
+        body = (
+            f"My {proc} was billed at ${us:,} in the US and insurance denied the claim. "
+            f"I flew to {country} and paid ${abroad:,} all-in. Story #{i}.\n\n"
+            + "Some background about the hospital visit and the follow-up calls. " * rng.randint(2, 30)
+        )
+        items.append({'content': body, 'source': rng.choice(['reddit', 'news', 'twitter']),
+                      'source_url': f"https://example.com/story/{i}"})
+    return items
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    k = min(len(values) - 1, int(round(pct / 100 * (len(values) - 1))))
+    return values[k]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Offline load test of the AI extraction stage')
+    parser.add_argument('--items', type=int, default=200)
+    parser.add_argument('--workers', type=int, default=8)
+    parser.add_argument('--max-retries', type=int, default=2, help='Anthropic SDK max_retries')
+    parser.add_argument('--url', type=str, default=None, help='Use an already running fake server')
+    parser.add_argument('--cache', action='store_true', help='Enable the extraction cache (a scratch copy)')
+    parser.add_argument('--port', type=int, default=0, help='Port for in-process server (0 = random)')
+    add_config_args(parser)
+    args = parser.parse_args()
+
+    server = None
+    url = args.url
+    if not url:
+        server = FakeLLMServer('127.0.0.1', args.port, config_from_args(args)).start()
+        url = server.url
+    print(f"Fake Messages API: {url}")
+
+    from anthropic import Anthropic
+    from utils import ai_extractor, extraction_cache, llm_metrics
+
+    # Point the extractor at the fake server (module-level client + router)
+    fake_client = Anthropic(api_key='fake-key', base_url=url, max_retries=args.max_retries)
+    ai_extractor.client = fake_client
+    ai_extractor.router.client = fake_client
+
+    # Fake calls must not reach the production metrics DB (llm_report.py costs)
+    # or extraction cache - both get throwaway SQLite files. The .env is loaded
+    # with override=True on import, so the singletons are replaced rather than
+    # relying on LLM_METRICS_PATH / EXTRACTION_CACHE_PATH.
+    scratch = tempfile.TemporaryDirectory(prefix='loadtest-')
+    llm_metrics._metrics_sink = llm_metrics.MetricsSink(str(Path(scratch.name) / 'llm_metrics.db'))
+    if args.cache:
+        extraction_cache._extraction_cache = extraction_cache.ExtractionCache(
+            str(Path(scratch.name) / 'extraction_cache.db')
+        )
+    else:
+        extraction_cache.CACHE_ENABLED = False
+
+    items = synthetic_items(args.items)
+    latencies = []
+    outcomes = {}
+
+    def run(item):
+        start = time.perf_counter()
+        # Synthetic items stay out of the production near-duplicate index
+        result = ai_extractor.extract_story_data(
+            content=item['content'], source=item['source'], source_url=item['source_url'],
+            skip_duplicate_check=True
+        )
+        elapsed = time.perf_counter() - start
+        if result.get('rejected'):
+            outcome = 'rejected'
+        elif 'error' in result:
+            outcome = 'error'
+        else:
+            outcome = 'extracted'
+        return elapsed, outcome
+
+    print(f"Running {len(items)} items with {args.workers} workers...")
+    wall_start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.workers) as pool:
+        for future in as_completed([pool.submit(run, item) for item in items]):
+            elapsed, outcome = future.result()
+            latencies.append(elapsed)
+            outcomes[outcome] = outcomes.get(outcome, 0) + 1
+    wall = time.perf_counter() - wall_start
+
+    print("\n" + "=" * 60)
+    print("EXTRACTION LOAD TEST")
+    print("=" * 60)
+    print(f"Items: {len(items)}  Workers: {args.workers}  Wall time: {wall:.2f}s")
+    print(f"Throughput: {len(items) / wall:.2f} items/s ({len(items) / wall * 60:.0f}/min)")
+    print(f"Latency per item: p50 {percentile(latencies, 50) * 1000:.0f}ms | "
+          f"p95 {percentile(latencies, 95) * 1000:.0f}ms | "
+          f"p99 {percentile(latencies, 99) * 1000:.0f}ms | "
+          f"mean {statistics.mean(latencies) * 1000:.0f}ms")
+    print(f"Outcomes: {json.dumps(outcomes)}")
+    if server:
+        print(f"Server: {json.dumps(server.stats.__dict__)}")
+        server.stop()
+    scratch.cleanup()
+
+
+if __name__ == '__main__':
+    main()
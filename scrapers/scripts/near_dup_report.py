@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Near-Duplicate Report
+Items suppressed by the MinHash/LSH filter (utils/near_dup.py) before LLM
+extraction, per source and by where the original came from
+
+Usage:
+    python near_dup_report.py                 # All time
+    python near_dup_report.py --hours 24      # Last 24 hours only
+    python near_dup_report.py --json          # Machine-readable output
+"""
+import sys
+import json
+import time
+import argparse
+from pathlib import Path
+
+# Add parent to path for utils
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from utils.near_dup import NearDupIndex, NEAR_DUP_PATH
+
+
+def print_report(rows: list):
+    """Print suppression table to console"""
+    print("\n" + "=" * 66)
+    print("OASARA NEAR-DUPLICATE REPORT")
+    print("=" * 66)
+    if not rows:
+        print("No duplicates suppressed yet.")
+        return
+
+    print(f"\n{'Source':<12} {'Original from':<14} {'Suppressed':>11} {'Avg sim':>8} {'Indexed':>9}")
+    print("-" * 66)
+    per_source = {}
+    for r in rows:
+        print(f"{r['source']:<12} {r['original_source']:<14} {r['suppressed']:>11} "
+              f"{r['avg_similarity']:>8.2f} {r['indexed']:>9}")
+        per_source[r['source']] = per_source.get(r['source'], 0) + r['suppressed']
+    print("-" * 66)
+    for source, count in sorted(per_source.items(), key=lambda kv: -kv[1]):
+        print(f"{source:<12} {'(all)':<14} {count:>11}")
+    print(f"{'TOTAL':<12} {'':<14} {sum(per_source.values()):>11}")
+    print("=" * 66)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Near-duplicates suppressed before extraction')
+    parser.add_argument('--hours', type=float, default=None, help='Only include the last N hours')
+    parser.add_argument('--db', type=str, default=NEAR_DUP_PATH, help='Path to near-dup index')
+    parser.add_argument('--json', action='store_true', help='Print JSON instead of tables')
+    args = parser.parse_args()
+
+    if not Path(args.db).exists():
+        print(f"No near-dup index at {args.db}")
+        sys.exit(1)
+
+    since = time.time() - args.hours * 3600 if args.hours else None
+    rows = NearDupIndex(args.db).report(since=since)
+
+    if args.json:
+        print(json.dumps(rows, indent=2))
+    else:
+        print_report(rows)
+
+
+if __name__ == '__main__':
+    main()
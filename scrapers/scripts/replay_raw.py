@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Replay Raw Archives
+Streams items from a scraper's NDJSON.gz raw archive back into its
+extract_and_save, e.g. after a crash mid-extraction or a prompt change
+
+Usage:
+    python replay_raw.py reddit --list                      # Runs in the index
+    python replay_raw.py reddit --run 20250101_120000       # Count items in one run
+    python replay_raw.py news --since 2025-01-01 --extract  # Re-extract since a date
+    python replay_raw.py twitter --extract --batch 100
+"""
+import sys
+import argparse
+import importlib
+from itertools import islice
+from pathlib import Path
+from dotenv import load_dotenv
+
+# Add parent to path for utils
+SCRAPERS_DIR = Path(__file__).parent.parent
+sys.path.insert(0, str(SCRAPERS_DIR))
+
+from utils.raw_archive import replay, list_runs, archive_files, default_archive_dir
+
+load_dotenv()
+
+# source -> (module, scraper class)
+SCRAPERS = {
+    'reddit': ('reddit.scraper', 'RedditScraper'),
+    'twitter': ('twitter.scraper', 'TwitterScraper'),
+    'gofundme': ('gofundme.scraper', 'GoFundMeScraper'),
+    'youtube': ('youtube.scraper', 'YouTubeScraper'),
+    'news': ('news.scraper', 'NewsScraper'),
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Replay raw archives into extraction')
+    parser.add_argument('source', choices=list(SCRAPERS))
+    parser.add_argument('--dir', type=str, default=None, help='Archive directory (default: scraper output dir)')
+    parser.add_argument('--run', type=str, default=None, help='Only items from this run id')
+    parser.add_argument('--since', type=str, default=None, help='Only items written since this ISO date/time')
+    parser.add_argument('--list', action='store_true', help='List runs recorded in the index')
+    parser.add_argument('--extract', action='store_true', help='Run extract_and_save on the items')
+    parser.add_argument('--batch', type=int, default=200, help='Items per extract_and_save call')
+    args = parser.parse_args()
+
+    directory = Path(args.dir) if args.dir else default_archive_dir(args.source)
+
+    if args.list:
+        files = archive_files(directory, args.source)
+        print(f"{len(files)} archive files in {directory}")
+        for run in list_runs(directory, args.source):
+            print(f"  {run['run_id']}: {run['items']} items in {run['files']} file(s) "
+                  f"({run['first'][:19]} -> {run['last'][:19]})")
+        return
+
+    items = replay(directory, args.source, run_id=args.run, since=args.since)
+
+    if not args.extract:
+        count = sum(1 for _ in items)
+        print(f"{count} items would be replayed from {directory}")
+        return
+
+    module_name, class_name = SCRAPERS[args.source]
+    scraper = getattr(importlib.import_module(module_name), class_name)()
+
+    total = saved = 0
+    while True:
+        batch = list(islice(items, args.batch))
+        if not batch:
+            break
+        total += len(batch)
+        saved += scraper.extract_and_save(batch)
+
+    print(f"\nReplayed {total} items, saved {saved} stories")
+
+
+if __name__ == '__main__':
+    main()
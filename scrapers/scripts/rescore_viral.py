@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Bulk Viral Re-ranking
+Recomputes viral_score for every story with vectorized NumPy scoring
+and writes changed scores back in bulk
+
+Usage:
+    python rescore_viral.py                        # Re-score all stories
+    python rescore_viral.py --weights w.json       # Use a new formula
+    python rescore_viral.py --scraped-only         # Only scraped stories
+    python rescore_viral.py --dry-run              # Show histogram, don't write
+    python rescore_viral.py --bench 50000          # Time scoring on synthetic rows
+"""
+import os
+import sys
+import time
+import random
+import argparse
+from pathlib import Path
+from dotenv import load_dotenv
+
+# Add parent to path for utils
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from utils.viral_scoring import load_weights, score_stories, rescore_table
+
+load_dotenv()
+
+
+def synthetic_stories(n: int):
+    """Random rows shaped like the stories table"""
+    tags = ['anger', 'relief', 'shock', 'gratitude', 'frustration', 'hope']
+    issues = ['denied_coverage', 'surprise_bill', 'price_gouging', 'medical_debt', 'bankruptcy']
+    rng = random.Random(42)
+    return [
+        {
+            'id': str(i),
+            'cost_us': rng.choice([None, rng.randint(500, 300000)]),
+            'cost_abroad': rng.choice([None, rng.randint(100, 40000)]),
+            'emotional_tags': rng.sample(tags, rng.randint(0, 3)),
+            'issues': rng.sample(issues, rng.randint(0, 3)),
+            'key_quote': 'x' * rng.randint(0, 200),
+            'images': ['img'] * rng.randint(0, 3),
+        }
+        for i in range(n)
+    ]
+
+
+def run_benchmark(n: int, weights):
+    """Compare vectorized scoring against the per-story function"""
+    from utils.ai_extractor import calculate_viral_potential
+
+    # No savings_amount: both sides derive it from cost_us - cost_abroad
+    stories = synthetic_stories(n)
+
+    start = time.perf_counter()
+    vectorized = score_stories(stories, weights)
+    vec_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    scalar = [calculate_viral_potential(s, weights) for s in stories]
+    scalar_time = time.perf_counter() - start
+
+    mismatches = sum(1 for a, b in zip(vectorized.tolist(), scalar) if a != b)
+    print(f"{n:,} stories")
+    print(f"  vectorized: {vec_time * 1000:.1f}ms ({n / vec_time:,.0f} stories/s)")
+    print(f"  per-story:  {scalar_time * 1000:.1f}ms ({n / scalar_time:,.0f} stories/s)")
+    print(f"  mismatches: {mismatches}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Bulk viral_score re-ranking')
+    parser.add_argument('--weights', type=str, default=None,
+                        help='JSON weights file (merged over defaults)')
+    parser.add_argument('--scraped-only', action='store_true',
+                        help='Only re-score scraped stories')
+    parser.add_argument('--dry-run', action='store_true',
+                        help='Compute scores without writing them back')
+    parser.add_argument('--bench', type=int, default=None,
+                        help='Benchmark on N synthetic stories (no database)')
+    args = parser.parse_args()
+
+    weights = load_weights(args.weights)
+
+    if args.bench:
+        run_benchmark(args.bench, weights)
+        return
+
+    from supabase import create_client
+
+    supabase_url = os.getenv('SUPABASE_URL')
+    supabase_key = os.getenv('SUPABASE_SERVICE_KEY')
+    if not supabase_url or not supabase_key:
+        print("ERROR: SUPABASE_URL and SUPABASE_SERVICE_KEY required in .env")
+        sys.exit(1)
+
+    supabase = create_client(supabase_url, supabase_key)
+
+    start = time.perf_counter()
+    result = rescore_table(supabase, weights, scraped_only=args.scraped_only, dry_run=args.dry_run)
+    elapsed = time.perf_counter() - start
+
+    print(f"\nScored {result['stories']:,} stories in {elapsed:.1f}s")
+    print(f"  Changed: {result['changed']:,}")
+    print(f"  {'Would update' if args.dry_run else 'Updated'}: "
+          f"{result['changed'] if args.dry_run else result['updated']:,}")
+    print("  Histogram:")
+    for score, count in sorted(result['histogram'].items()):
+        print(f"    {score:>2}: {count:,}")
+
+
+if __name__ == '__main__':
+    main()
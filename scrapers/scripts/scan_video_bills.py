@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Video Bill Scan
+Backfill keyframe OCR (processing/keyframes.py) over the NAS video archive:
+scene-change keyframes only, pHash-deduped, at most KEYFRAME_MAX_OCR frames
+OCRed per video. Finished videos are logged to a JSONL state file, so an
+interrupted scan resumes where it stopped.
+
+Usage:
+    python scan_video_bills.py                                  # NAS youtube/ + twitter videos
+    python scan_video_bills.py /mnt/nas/oasara/scraped/youtube/videos --limit 50
+    python scan_video_bills.py clip.mp4 --max-ocr 3 --threshold 0.4
+    python scan_video_bills.py --update                         # Write amounts to matching stories
+"""
+import os
+import sys
+import json
+import argparse
+from pathlib import Path
+from dotenv import load_dotenv
+
+# Add parent to path for processing
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from utils.url_canon import like_escape
+from processing.keyframes import (
+    KeyframeScanner, KEYFRAME_SCENE_THRESHOLD, KEYFRAME_MAX_OCR, KEYFRAME_HASH_DISTANCE
+)
+
+load_dotenv()
+
+NAS_MOUNT_PATH = os.getenv('NAS_MOUNT_PATH', '/mnt/nas/oasara')
+VIDEO_EXTENSIONS = {'.mp4', '.webm', '.mkv', '.mov', '.m4v'}
+
+
+def find_videos(paths):
+    for path in map(Path, paths):
+        if path.is_file():
+            yield path
+        elif path.is_dir():
+            yield from sorted(p for p in path.rglob('*') if p.suffix.lower() in VIDEO_EXTENSIONS)
+
+
+def load_scanned(state_path: Path) -> set:
+    if not state_path.exists():
+        return set()
+    with open(state_path) as f:
+        return {json.loads(line)['path'] for line in f if line.strip()}
+
+
+def update_stories(supabase, video: Path, result) -> int:
+    """
+    Merge amounts into the stories for this file: by nas_video_path (video_url
+    points at the web rendition once one is built), or by a video_url that
+    still ends in the file name (unrendered Twitter uploads)
+    """
+    columns = 'id, cost_us, ocr_amounts, ocr_text'
+    rows = {row['id']: row for row in supabase.table('stories').select(columns)
+            .eq('nas_video_path', str(video)).execute().data or []}
+    for row in supabase.table('stories').select(columns) \
+            .like('video_url', f"%/{like_escape(video.name)}").execute().data or []:
+        rows.setdefault(row['id'], row)
+    rows = list(rows.values())
+    for row in rows:
+        amounts = sorted(set(row.get('ocr_amounts') or []) | set(result['amounts']), reverse=True)
+        text = '\n\n---\n\n'.join(t for t in (row.get('ocr_text'), result['ocr_text']) if t)
+        supabase.table('stories').update({
+            'ocr_amounts': amounts,
+            'ocr_text': text,
+            'cost_us': row.get('cost_us') or result['shock_value'],
+        }).eq('id', row['id']).execute()
+    return len(rows)
+
+
+def main():
+    default_dirs = [
+        str(Path(NAS_MOUNT_PATH) / 'scraped' / 'youtube' / 'videos'),
+        str(Path(NAS_MOUNT_PATH) / 'twitter' / 'videos'),
+    ]
+    parser = argparse.ArgumentParser(description='OCR bills shown in archived videos')
+    parser.add_argument('paths', nargs='*', default=default_dirs, help='Video files or directories')
+    parser.add_argument('--threshold', type=float, default=KEYFRAME_SCENE_THRESHOLD,
+                        help='Scene-change score for a keyframe to count as new')
+    parser.add_argument('--max-ocr', type=int, default=KEYFRAME_MAX_OCR, help='OCR budget per video')
+    parser.add_argument('--hash-distance', type=int, default=KEYFRAME_HASH_DISTANCE,
+                        help='pHash bits within which frames count as duplicates')
+    parser.add_argument('--limit', type=int, default=None, help='Stop after N videos')
+    parser.add_argument('--frames-dir', default=str(Path(NAS_MOUNT_PATH) / 'bill_frames'),
+                        help='Where redacted bill frames are written')
+    parser.add_argument('--state', default=None, help='JSONL of scanned videos (default <frames-dir>/scanned.jsonl)')
+    parser.add_argument('--rescan', action='store_true', help='Ignore the state file')
+    parser.add_argument('--update', action='store_true', help='Write amounts to matching stories')
+    args = parser.parse_args()
+
+    frames_dir = Path(args.frames_dir)
+    frames_dir.mkdir(parents=True, exist_ok=True)
+    state_path = Path(args.state) if args.state else frames_dir / 'scanned.jsonl'
+    scanned = set() if args.rescan else load_scanned(state_path)
+
+    supabase = None
+    if args.update:
+        from utils.storage import get_storage
+        supabase = get_storage().supabase
+
+    scanner = KeyframeScanner(
+        threshold=args.threshold, max_ocr=args.max_ocr, hash_distance=args.hash_distance
+    )
+    done = 0
+    with open(state_path, 'a') as state:
+        for video in find_videos(args.paths):
+            if args.limit is not None and done >= args.limit:
+                break
+            if str(video) in scanned:
+                continue
+            result = scanner.scan(str(video), save_dir=str(frames_dir))
+            done += 1
+            if result is None:
+                print(f"❌ {video}")
+                continue
+
+            line = f"{video.name}: {result['keyframes']} keyframes, {len(result['frames'])} OCRed"
+            if result['amounts']:
+                line = f"💵 {line}, ${result['shock_value']:,.2f} (amounts {result['amounts'][:5]})"
+                if supabase is not None:
+                    line += f", {update_stories(supabase, video, result)} stories updated"
+            else:
+                line = f"✅ {line}, no amounts"
+            print(f"{line} [{result['seconds']:.1f}s]")
+
+            state.write(json.dumps({
+                'path': str(video),
+                'amounts': result['amounts'],
+                'frames': [{k: f[k] for k in ('time', 'amounts', 'redacted_path')} for f in result['frames']],
+            }) + '\n')
+            state.flush()
+
+    print(f"\n{scanner.summary()}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Batch Transcription
+Run audio/video files through the persistent Whisper service
+(processing/transcription.py) and report throughput - also the quickest way
+to compare backends, models and devices on a given machine
+
+Usage:
+    python transcribe.py /mnt/nas/oasara/scraped/youtube/audio/*.m4a
+    python transcribe.py clip.mp4 --backend openai-whisper --model base
+    python transcribe.py *.m4a --device cpu --compute-type int8 --no-vad
+    python transcribe.py *.m4a --out transcripts/     # Write <name>.txt per file
+"""
+import sys
+import argparse
+from pathlib import Path
+
+# Add parent to path for processing
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from processing.transcription import (
+    TranscriptionService, BACKENDS, WHISPER_BACKEND, WHISPER_MODEL, WHISPER_DEVICE,
+    WHISPER_COMPUTE_TYPE, WHISPER_BATCH_SIZE, WHISPER_VAD
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Transcribe files with the Whisper service')
+    parser.add_argument('files', nargs='+', help='Audio or video files')
+    parser.add_argument('--backend', choices=BACKENDS, default=WHISPER_BACKEND)
+    parser.add_argument('--model', default=WHISPER_MODEL)
+    parser.add_argument('--device', choices=['auto', 'cuda', 'cpu'], default=WHISPER_DEVICE)
+    parser.add_argument('--compute-type', default=WHISPER_COMPUTE_TYPE, help='faster-whisper: int8, float16, ...')
+    parser.add_argument('--batch-size', type=int, default=WHISPER_BATCH_SIZE)
+    parser.add_argument('--no-vad', action='store_true', help='Transcribe silence too')
+    parser.add_argument('--out', help='Directory for <name>.txt transcripts')
+    args = parser.parse_args()
+
+    service = TranscriptionService(
+        model=args.model,
+        backend=args.backend,
+        device=args.device,
+        compute_type=args.compute_type,
+        vad=WHISPER_VAD and not args.no_vad,
+        batch_size=args.batch_size
+    )
+    out_dir = Path(args.out) if args.out else None
+    if out_dir:
+        out_dir.mkdir(parents=True, exist_ok=True)
+
+    for path, result in service.transcribe_many(args.files):
+        if result is None:
+            print(f"❌ {path}")
+            continue
+        speed = result['duration'] / result['seconds'] if result['seconds'] else 0
+        print(f"✅ {path}: {result['duration']:.0f}s audio ({result['speech_duration']:.0f}s speech) "
+              f"in {result['seconds']:.1f}s = {speed:.1f}x realtime, {len(result['text'].split())} words")
+        if out_dir:
+            (out_dir / f"{Path(path).stem}.txt").write_text(result['text'], encoding='utf-8')
+
+    service.close()
+    print(f"\n{service.summary()}")
+
+
+if __name__ == '__main__':
+    main()
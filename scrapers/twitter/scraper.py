@@ -6,9 +6,11 @@ import os
 import re
 import json
 import time
+import queue
+import argparse
 import requests
-from datetime import datetime, timedelta
-from typing import List, Dict, Any, Optional
+from datetime import datetime, timedelta, timezone
+from typing import List, Dict, Any, Optional, Tuple
 from pathlib import Path
 import tweepy
 from dotenv import load_dotenv
@@ -20,6 +22,12 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from utils.storage import get_storage
 from utils.ai_extractor import extract_story_data
+from utils.prefilter import get_prefilter
+from utils.raw_archive import RawArchive
+from utils.url_canon import canonicalize, dedup_key
+from twitter.stream import (
+    RuleStream, build_rules, sync_rules, use_api_base, CLOSED_WAIT_START, CLOSED_WAIT_MAX
+)
 
 load_dotenv()
 
@@ -85,6 +93,44 @@ MIN_LIKES_VIDEO = 20      # Videos are valuable even with lower engagement
 MIN_LIKES_IMAGE = 30      # Images with some engagement
 MIN_LIKES_TEXT = 50       # Text needs moderate engagement
 
+# Incremental search: each query resumes from the newest tweet id it saw
+# last run (since_id), paging through results up to these caps
+TWITTER_MAX_TWEETS_PER_QUERY = int(os.getenv('TWITTER_MAX_TWEETS_PER_QUERY', '300'))
+TWITTER_MAX_TWEETS_PER_RUN = int(os.getenv('TWITTER_MAX_TWEETS_PER_RUN', '2000'))
+
+# Relevant tweets still under the like thresholds are re-checked on later
+# runs (100 per lookup) until they are this old - since_id means search
+# will never return them again
+TWITTER_WATCH_HOURS = int(os.getenv('TWITTER_WATCH_HOURS', '72'))
+TWITTER_WATCH_MAX = int(os.getenv('TWITTER_WATCH_MAX', '1000'))
+
+# Stream mode: how often watched tweets are re-fetched for engagement
+TWITTER_STREAM_REFRESH_MINUTES = float(os.getenv('TWITTER_STREAM_REFRESH_MINUTES', '15'))
+
+STATE_FILE = '_search_state.json'
+
+TWEET_FIELDS = ['created_at', 'public_metrics', 'author_id', 'text', 'attachments']
+TWEET_EXPANSIONS = ['author_id', 'attachments.media_keys']
+# 'variants' gives the video download URLs
+MEDIA_FIELDS = ['url', 'preview_image_url', 'type', 'variants', 'duration_ms']
+
+# Tweet ids are snowflakes: milliseconds since this epoch, shifted left 22 bits
+TWITTER_EPOCH_MS = 1288834974657
+SEARCH_WINDOW = timedelta(days=7)
+
+
+def tweet_time(tweet_id: str) -> datetime:
+    """Creation time encoded in a tweet id"""
+    ms = (int(tweet_id) >> 22) + TWITTER_EPOCH_MS
+    return datetime.fromtimestamp(ms / 1000, tz=timezone.utc)
+
+
+def _live_id(tweet_id: Optional[str]) -> Optional[str]:
+    """tweet_id if still inside the recent-search window (the API rejects older since_id/until_id)"""
+    if tweet_id and tweet_time(tweet_id) > datetime.now(timezone.utc) - SEARCH_WINDOW + timedelta(minutes=5):
+        return tweet_id
+    return None
+
 
 class TwitterScraper:
     def __init__(self):
@@ -92,6 +138,8 @@ class TwitterScraper:
         self.scraped_count = 0
         self.output_dir = Path(__file__).parent / 'output'
         self.output_dir.mkdir(exist_ok=True)
+        self.state_path = self.output_dir / STATE_FILE
+        self.stats = {'requests': 0, 'tweets_read': 0}
         
         # Initialize Tweepy client
         self.bearer_token = os.getenv('X_BEARER_TOKEN')
@@ -112,82 +160,124 @@ class TwitterScraper:
             access_token_secret=self.access_secret,
             wait_on_rate_limit=True
         )
+        use_api_base(self.client.session)
+    
+    def _load_state(self) -> Dict[str, Any]:
+        if self.state_path.exists():
+            with open(self.state_path, 'r') as f:
+                return json.load(f)
+        return {'queries': {}, 'watch': {}}
+    
+    def _save_state(self, state: Dict[str, Any]):
+        tmp = self.state_path.with_suffix('.tmp')
+        with open(tmp, 'w') as f:
+            json.dump(state, f, indent=2)
+        os.replace(tmp, self.state_path)
     
-    def _search_tweets(self, query: str, limit: int = 50) -> List[Dict[str, Any]]:
+    def _parse_response(self, response, query: str) -> List[Dict[str, Any]]:
+        """Tweet dicts (with media/video URLs) from a v2 search or lookup response"""
+        tweets = []
+        if not response.data:
+            return tweets
+        
+        # Build lookup for users and media
+        users = {u.id: u for u in (response.includes.get('users', []) or [])}
+        media_lookup = {m.media_key: m for m in (response.includes.get('media', []) or [])}
+        
+        for tweet in response.data:
+            user = users.get(tweet.author_id)
+            
+            # Get media URLs - now handles videos
+            media_urls = []
+            video_url = None
+            has_video = False
+            
+            if hasattr(tweet, 'attachments') and tweet.attachments:
+                media_keys = tweet.attachments.get('media_keys', [])
+                for key in media_keys:
+                    if key in media_lookup:
+                        m = media_lookup[key]
+                        
+                        # Check if it's a video
+                        if hasattr(m, 'type') and m.type == 'video':
+                            has_video = True
+                            # Get highest quality video variant
+                            if hasattr(m, 'variants') and m.variants:
+                                # Sort by bitrate, get highest
+                                video_variants = [v for v in m.variants if v.get('content_type') == 'video/mp4']
+                                if video_variants:
+                                    best = max(video_variants, key=lambda x: x.get('bit_rate', 0))
+                                    video_url = best.get('url')
+                            # Also get preview image as thumbnail
+                            if hasattr(m, 'preview_image_url') and m.preview_image_url:
+                                media_urls.append(m.preview_image_url)
+                        else:
+                            # Regular image
+                            if hasattr(m, 'url') and m.url:
+                                media_urls.append(m.url)
+                            elif hasattr(m, 'preview_image_url') and m.preview_image_url:
+                                media_urls.append(m.preview_image_url)
+            
+            tweets.append({
+                'id': str(tweet.id),
+                'text': tweet.text,
+                'author_id': str(tweet.author_id),
+                'author_username': user.username if user else 'unknown',
+                'author_name': user.name if user else 'Unknown',
+                'created_at': tweet.created_at.isoformat() if tweet.created_at else None,
+                'likes': tweet.public_metrics.get('like_count', 0) if tweet.public_metrics else 0,
+                'retweets': tweet.public_metrics.get('retweet_count', 0) if tweet.public_metrics else 0,
+                'replies': tweet.public_metrics.get('reply_count', 0) if tweet.public_metrics else 0,
+                'media_urls': media_urls,
+                'video_url': video_url,
+                'has_video': has_video,
+                'url': canonicalize(f"https://twitter.com/{user.username if user else 'i'}/status/{tweet.id}"),
+                'search_query': query,
+            })
+        
+        return tweets
+    
+    def _search_tweets(
+        self,
+        query: str,
+        limit: int = 50,
+        since_id: Optional[str] = None,
+        until_id: Optional[str] = None
+    ) -> Tuple[List[Dict[str, Any]], Optional[str], bool]:
         """
-        Search for tweets using Twitter API v2
-        Now includes video URL extraction
+        Search recent tweets (last 7 days), newest first, following next_token
+        until limit tweets. Returns (tweets, newest_id of the window,
+        truncated) - truncated means older matches were left unread.
         """
         tweets = []
+        newest_id = None
+        next_token = None
+        # Even pages no bigger than the API's 100, so the last one doesn't overshoot limit
+        pages = -(-limit // 100)
+        page_size = max(10, -(-limit // pages))
         
         try:
-            # Search recent tweets (last 7 days)
-            # Added 'variants' to get video download URLs
-            response = self.client.search_recent_tweets(
+            paginator = tweepy.Paginator(
+                self.client.search_recent_tweets,
                 query=query,
-                max_results=min(limit, 100),
-                tweet_fields=['created_at', 'public_metrics', 'author_id', 'text', 'attachments'],
-                expansions=['author_id', 'attachments.media_keys'],
-                media_fields=['url', 'preview_image_url', 'type', 'variants', 'duration_ms']
+                max_results=page_size,
+                since_id=since_id,
+                until_id=until_id,
+                tweet_fields=TWEET_FIELDS,
+                expansions=TWEET_EXPANSIONS,
+                media_fields=MEDIA_FIELDS,
+                limit=pages
             )
-            
-            if not response.data:
-                return []
-            
-            # Build lookup for users and media
-            users = {u.id: u for u in (response.includes.get('users', []) or [])}
-            media_lookup = {m.media_key: m for m in (response.includes.get('media', []) or [])}
-            
-            for tweet in response.data:
-                user = users.get(tweet.author_id)
-                
-                # Get media URLs - now handles videos
-                media_urls = []
-                video_url = None
-                has_video = False
-                
-                if hasattr(tweet, 'attachments') and tweet.attachments:
-                    media_keys = tweet.attachments.get('media_keys', [])
-                    for key in media_keys:
-                        if key in media_lookup:
-                            m = media_lookup[key]
-                            
-                            # Check if it's a video
-                            if hasattr(m, 'type') and m.type == 'video':
-                                has_video = True
-                                # Get highest quality video variant
-                                if hasattr(m, 'variants') and m.variants:
-                                    # Sort by bitrate, get highest
-                                    video_variants = [v for v in m.variants if v.get('content_type') == 'video/mp4']
-                                    if video_variants:
-                                        best = max(video_variants, key=lambda x: x.get('bit_rate', 0))
-                                        video_url = best.get('url')
-                                # Also get preview image as thumbnail
-                                if hasattr(m, 'preview_image_url') and m.preview_image_url:
-                                    media_urls.append(m.preview_image_url)
-                            else:
-                                # Regular image
-                                if hasattr(m, 'url') and m.url:
-                                    media_urls.append(m.url)
-                                elif hasattr(m, 'preview_image_url') and m.preview_image_url:
-                                    media_urls.append(m.preview_image_url)
-                
-                tweets.append({
-                    'id': str(tweet.id),
-                    'text': tweet.text,
-                    'author_id': str(tweet.author_id),
-                    'author_username': user.username if user else 'unknown',
-                    'author_name': user.name if user else 'Unknown',
-                    'created_at': tweet.created_at.isoformat() if tweet.created_at else None,
-                    'likes': tweet.public_metrics.get('like_count', 0) if tweet.public_metrics else 0,
-                    'retweets': tweet.public_metrics.get('retweet_count', 0) if tweet.public_metrics else 0,
-                    'replies': tweet.public_metrics.get('reply_count', 0) if tweet.public_metrics else 0,
-                    'media_urls': media_urls,
-                    'video_url': video_url,
-                    'has_video': has_video,
-                    'url': f"https://twitter.com/{user.username if user else 'i'}/status/{tweet.id}",
-                    'search_query': query,
-                })
+            for response in paginator:
+                self.stats['requests'] += 1
+                meta = response.meta or {}
+                newest_id = newest_id or meta.get('newest_id')
+                next_token = meta.get('next_token')
+                tweets.extend(self._parse_response(response, query))
+                if len(tweets) >= limit:
+                    break
+            if len(tweets) > limit:
+                tweets, next_token = tweets[:limit], next_token or 'trimmed'
                 
         except tweepy.TooManyRequests:
             print(f"Rate limited, waiting...")
@@ -195,6 +285,67 @@ class TwitterScraper:
         except Exception as e:
             print(f"Error searching tweets for '{query[:30]}...': {e}")
         
+        self.stats['tweets_read'] += len(tweets)
+        return tweets, newest_id, bool(next_token)
+    
+    def _poll_query(self, query: str, state: Dict[str, Any], limit: int) -> List[Dict[str, Any]]:
+        """
+        Tweets newer than the query's newest_id, then (budget permitting) the
+        older gap a capped run left behind. Updates state[query] in place.
+        """
+        cursor = state.get(query, {})
+        since_id = _live_id(cursor.get('newest_id'))
+        tweets, newest_id, truncated = self._search_tweets(query, limit, since_id=since_id)
+        
+        gap = cursor.get('gap')
+        if gap and not _live_id(gap['until_id']):
+            gap = None  # Fell out of the 7-day search window
+        if truncated and tweets:
+            # Unread tweets between the old high-water mark and the oldest one read
+            gap = {'since_id': (gap or {}).get('since_id', since_id), 'until_id': tweets[-1]['id']}
+        elif gap and len(tweets) < limit:
+            older, _, gap_truncated = self._search_tweets(
+                query, limit - len(tweets), since_id=_live_id(gap['since_id']), until_id=gap['until_id']
+            )
+            tweets.extend(older)
+            gap = {'since_id': gap['since_id'], 'until_id': older[-1]['id']} if gap_truncated and older else None
+        
+        if newest_id:
+            cursor['newest_id'] = newest_id
+        if gap:
+            cursor['gap'] = gap
+        else:
+            cursor.pop('gap', None)
+        state[query] = cursor
+        return tweets
+    
+    def _refresh_watchlist(self, watch: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        Current metrics for tweets that were too quiet when first seen (100
+        per lookup); drops entries older than TWITTER_WATCH_HOURS
+        """
+        cutoff = datetime.now(timezone.utc) - timedelta(hours=TWITTER_WATCH_HOURS)
+        for tweet_id in [t for t in watch if tweet_time(t) < cutoff]:
+            del watch[tweet_id]
+        
+        ids = list(watch)
+        tweets = []
+        for i in range(0, len(ids), 100):
+            try:
+                response = self.client.get_tweets(
+                    ids=ids[i:i + 100],
+                    tweet_fields=TWEET_FIELDS,
+                    expansions=TWEET_EXPANSIONS,
+                    media_fields=MEDIA_FIELDS
+                )
+                self.stats['requests'] += 1
+            except Exception as e:
+                print(f"Error refreshing watched tweets: {e}")
+                continue
+            for tweet in self._parse_response(response, ''):
+                tweet['search_query'] = watch[tweet['id']]
+                tweets.append(tweet)
+        self.stats['tweets_read'] += len(tweets)
         return tweets
     
     def _download_media(self, media_urls: List[str], tweet_id: str) -> List[str]:
@@ -262,67 +413,116 @@ class TwitterScraper:
         
         return None
     
-    def run_full_scrape(self, tweets_per_query: int = 50) -> List[Dict[str, Any]]:
-        """Run full Twitter scrape with engagement-based filtering"""
+    def _process_candidates(
+        self,
+        tweets: List[Dict[str, Any]],
+        watch: Dict[str, str],
+        seen: set,
+        archive: RawArchive
+    ) -> List[Dict[str, Any]]:
+        """
+        Prefilter, dedup and engagement thresholds; media is downloaded for
+        the tweets that pass. Relevant tweets still under their threshold go
+        on the watchlist (tweet id -> search query) for a later refresh.
+        """
+        passed = []
+        for tweet in tweets:
+            # Cheapest check first: healthcare keywords in the text
+            if not get_prefilter().is_relevant(tweet['text']):
+                watch.pop(tweet['id'], None)
+                continue
+            
+            # Skip duplicates (this batch, then storage)
+            key = dedup_key(tweet['url'])
+            if key in seen:
+                continue
+            seen.add(key)
+            if self.storage.story_exists(tweet['url']):
+                watch.pop(tweet['id'], None)
+                continue
+            
+            # Engagement-based filtering (different thresholds by content type)
+            has_video = tweet.get('has_video', False)
+            has_images = len(tweet.get('media_urls', [])) > 0
+            likes = tweet['likes']
+            
+            if has_video:
+                min_likes = MIN_LIKES_VIDEO
+            elif has_images:
+                min_likes = MIN_LIKES_IMAGE
+            else:
+                min_likes = MIN_LIKES_TEXT
+            if likes < min_likes:
+                watch[tweet['id']] = tweet['search_query']
+                continue
+            watch.pop(tweet['id'], None)
+            
+            print(f"  📝 Tweet {tweet['id']}: {likes} likes {'📹' if has_video else '🖼️' if has_images else '📄'}")
+            
+            # Download video if present
+            if has_video and tweet.get('video_url'):
+                tweet['uploaded_video'] = self._download_video(
+                    tweet['video_url'],
+                    tweet['id']
+                )
+            else:
+                tweet['uploaded_video'] = None
+            
+            # Download images if present
+            if tweet['media_urls']:
+                tweet['uploaded_media'] = self._download_media(
+                    tweet['media_urls'], 
+                    tweet['id']
+                )
+            else:
+                tweet['uploaded_media'] = []
+            
+            passed.append(tweet)
+            archive.write(tweet)
+        
+        return passed
+    
+    def _trim_watchlist(self, watch: Dict[str, str]):
+        """Keep the youngest TWITTER_WATCH_MAX tweets (newer ids are larger)"""
+        for tweet_id in sorted(watch, key=int)[:-TWITTER_WATCH_MAX or None]:
+            del watch[tweet_id]
+    
+    def run_full_scrape(self, tweets_per_query: int = TWITTER_MAX_TWEETS_PER_QUERY) -> List[Dict[str, Any]]:
+        """Run incremental Twitter scrape with engagement-based filtering"""
         all_tweets = []
-        video_count = 0
+        archive = RawArchive(self.output_dir, 'twitter')
+        seen = set()  # dedup keys of tweets already handled (queries overlap)
+        state = self._load_state()
+        watch = state.setdefault('watch', {})
+        budget = TWITTER_MAX_TWEETS_PER_RUN
         
         print("=" * 60)
         print("OASARA TWITTER SCRAPER - DATA LIBERATION PHASE 3")
         print("Filtering for viral content (videos, high engagement)")
         print("=" * 60)
         
+        batches = []
+        if watch:
+            print(f"\nRe-checking {len(watch)} watched tweets for engagement...")
+            batches.append(self._refresh_watchlist(watch))
+        
         for query in SEARCH_QUERIES:
+            if budget <= 0:
+                print(f"\nRun budget of {TWITTER_MAX_TWEETS_PER_RUN} tweets spent, remaining queries wait for next run")
+                break
             print(f"\nSearching: '{query[:50]}...'")
-            tweets = self._search_tweets(query, tweets_per_query)
-            print(f"  Found {len(tweets)} tweets")
-            
-            for tweet in tweets:
-                # Skip duplicates
-                if self.storage.story_exists(tweet['url']):
-                    continue
-                
-                # Engagement-based filtering (different thresholds by content type)
-                has_video = tweet.get('has_video', False)
-                has_images = len(tweet.get('media_urls', [])) > 0
-                likes = tweet['likes']
-                
-                if has_video:
-                    if likes < MIN_LIKES_VIDEO:
-                        continue
-                elif has_images:
-                    if likes < MIN_LIKES_IMAGE:
-                        continue
-                else:
-                    if likes < MIN_LIKES_TEXT:
-                        continue
-                
-                print(f"  📝 Tweet {tweet['id']}: {likes} likes {'📹' if has_video else '🖼️' if has_images else '📄'}")
-                
-                # Download video if present
-                if has_video and tweet.get('video_url'):
-                    tweet['uploaded_video'] = self._download_video(
-                        tweet['video_url'],
-                        tweet['id']
-                    )
-                    if tweet['uploaded_video']:
-                        video_count += 1
-                else:
-                    tweet['uploaded_video'] = None
-                
-                # Download images if present
-                if tweet['media_urls']:
-                    tweet['uploaded_media'] = self._download_media(
-                        tweet['media_urls'], 
-                        tweet['id']
-                    )
-                else:
-                    tweet['uploaded_media'] = []
-                
-                all_tweets.append(tweet)
-            
+            tweets = self._poll_query(query, state.setdefault('queries', {}), min(tweets_per_query, budget))
+            budget -= len(tweets)
+            print(f"  Found {len(tweets)} new tweets")
+            batches.append(tweets)
             time.sleep(2)  # Rate limiting
         
+        for tweets in batches:
+            all_tweets.extend(self._process_candidates(tweets, watch, seen, archive))
+        
+        self._trim_watchlist(watch)
+        self._save_state(state)
+        
         # Deduplicate
         seen_ids = set()
         unique_tweets = []
@@ -333,18 +533,110 @@ class TwitterScraper:
         
         print(f"\n{'=' * 60}")
         print(f"SCRAPE COMPLETE: {len(unique_tweets)} unique tweets")
-        print(f"  📹 Videos: {video_count}")
+        print(f"  📹 Videos: {sum(1 for t in unique_tweets if t.get('uploaded_video'))}")
         print(f"  🖼️ Images: {sum(1 for t in unique_tweets if t.get('uploaded_media'))}")
+        print(f"  🔎 {self.stats['tweets_read']} tweets read in {self.stats['requests']} requests, "
+              f"{len(watch)} watched for engagement")
         print(f"{'=' * 60}")
         
-        # Save raw data
-        output_file = self.output_dir / f"twitter_raw_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-        with open(output_file, 'w') as f:
-            json.dump(unique_tweets, f, indent=2, default=str)
-        print(f"Raw data saved to: {output_file}")
+        archive.close()
+        print(f"Raw data: {archive.summary()}")
         
         return unique_tweets
     
+    def run_stream(self, seconds: Optional[float] = None) -> int:
+        """
+        Long-running ingestion from the v2 filtered stream (rules built from
+        SEARCH_QUERIES). Tweets go through the same filters and
+        extract_and_save as a search run; since they arrive before anyone has
+        liked them, most wait on the watchlist until a refresh every
+        TWITTER_STREAM_REFRESH_MINUTES shows they reached MIN_LIKES_*.
+        Runs until interrupted (or for seconds); returns stories saved.
+        """
+        state = self._load_state()
+        watch = state.setdefault('watch', {})
+        arrivals = queue.Queue()
+        archive = RawArchive(self.output_dir, 'twitter')
+        seen = set()
+        saved = 0
+        
+        def on_tweet(response, tags):
+            for tweet in self._parse_response(response, f"stream:{','.join(tags)}"):
+                arrivals.put(tweet)
+        
+        stream = RuleStream(self.bearer_token, on_tweet, daemon=True)
+        
+        print("=" * 60)
+        print("OASARA TWITTER STREAM - filtered stream ingestion")
+        print("=" * 60)
+        rules = build_rules(SEARCH_QUERIES)
+        changes = sync_rules(stream, rules)
+        print(f"Rules: {len(rules)} for {len(SEARCH_QUERIES)} queries "
+              f"({changes['added']} added, {changes['deleted']} deleted, {changes['kept']} kept)")
+        
+        refresh_every = TWITTER_STREAM_REFRESH_MINUTES * 60
+        deadline = time.monotonic() + seconds if seconds else None
+        next_refresh = time.monotonic() + refresh_every
+        restart_wait = CLOSED_WAIT_START
+        thread = None
+        
+        try:
+            while deadline is None or time.monotonic() < deadline:
+                # tweepy reconnects on its own; this only restarts a stream whose thread died
+                if thread is None or not thread.is_alive():
+                    if stream.fatal:
+                        break
+                    if thread is not None:
+                        print(f"Stream thread ended, restarting in {restart_wait}s")
+                        time.sleep(restart_wait)
+                        restart_wait = min(restart_wait * 2, CLOSED_WAIT_MAX)
+                    thread = stream.filter(
+                        threaded=True,
+                        tweet_fields=TWEET_FIELDS,
+                        expansions=TWEET_EXPANSIONS,
+                        media_fields=MEDIA_FIELDS
+                    )
+                
+                batch = []
+                try:
+                    batch.append(arrivals.get(timeout=1))
+                    while True:
+                        batch.append(arrivals.get_nowait())
+                except queue.Empty:
+                    pass
+                
+                if len(seen) > 100000:
+                    seen.clear()
+                passed = self._process_candidates(batch, watch, seen, archive)
+                if batch:
+                    restart_wait = CLOSED_WAIT_START
+                
+                if time.monotonic() >= next_refresh:
+                    next_refresh = time.monotonic() + refresh_every
+                    if watch:
+                        print(f"\nRe-checking {len(watch)} watched tweets for engagement...")
+                        passed += self._process_candidates(self._refresh_watchlist(watch), watch, set(), archive)
+                    self._trim_watchlist(watch)
+                    self._save_state(state)
+                    print(stream.summary())
+                
+                if passed:
+                    saved += self.extract_and_save(passed)
+        except KeyboardInterrupt:
+            print("\nStopping stream...")
+        finally:
+            stream.disconnect()
+            self._trim_watchlist(watch)
+            self._save_state(state)
+            archive.close()
+        
+        print(f"\n{'=' * 60}")
+        print(f"STREAM STOPPED: {saved} stories saved, {len(watch)} watched for engagement")
+        print(stream.summary())
+        print(f"Raw data: {archive.summary()}")
+        print(f"{'=' * 60}")
+        return saved
+    
     def extract_and_save(self, tweets: List[Dict[str, Any]]) -> int:
         """Extract structured data and save to database with relevance filtering"""
         saved_count = 0
@@ -429,9 +721,19 @@ class TwitterScraper:
 
 def main():
     """Main entry point"""
+    parser = argparse.ArgumentParser(description='Twitter/X healthcare stories scraper')
+    parser.add_argument('--stream', action='store_true', help='Long-running filtered-stream ingestion')
+    parser.add_argument('--seconds', type=float, default=None, help='Stop streaming after N seconds')
+    args = parser.parse_args()
+    
     scraper = TwitterScraper()
     
-    tweets = scraper.run_full_scrape(tweets_per_query=50)
+    if args.stream:
+        saved = scraper.run_stream(seconds=args.seconds)
+        print(f"\n🎉 Twitter stream complete! {saved} stories added.")
+        return
+    
+    tweets = scraper.run_full_scrape()
     
     if tweets:
         saved = scraper.extract_and_save(tweets)
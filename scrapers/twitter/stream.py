@@ -0,0 +1,206 @@
+"""
+Twitter/X filtered stream
+Long-running alternative to polling recent search: SEARCH_QUERIES become
+filtered-stream rules, and matching tweets are pushed to us within seconds
+of being posted instead of waiting for the next cron run.
+
+    stream = RuleStream(bearer_token, on_tweet)
+    sync_rules(stream, build_rules(SEARCH_QUERIES))
+    stream.filter(tweet_fields=TWEET_FIELDS, ...)
+
+Stream tweets arrive with ~0 likes, so the MIN_LIKES_* thresholds can't be
+applied on arrival; TwitterScraper.run_stream puts relevant tweets on the
+engagement watchlist and re-checks them periodically.
+
+tweepy reconnects by itself with the backoff X asks for: +250ms per network
+error (max 16s), exponential from 5s (60s after a 429) up to 320s after HTTP
+errors. RuleStream adds backoff for streams the server closes right after
+connecting, which tweepy would otherwise reopen immediately.
+
+Point both the stream and the REST client at scripts/fake_twitter_stream.py
+with TWITTER_API_BASE=http://127.0.0.1:8766.
+"""
+import os
+import time
+import threading
+from typing import Callable, Dict, List
+import tweepy
+from dotenv import load_dotenv
+
+load_dotenv()
+
+TWITTER_API = 'https://api.twitter.com'
+TWITTER_API_BASE = os.getenv('TWITTER_API_BASE', TWITTER_API).rstrip('/')
+
+# Rule limits of the lowest tier with filtered-stream access (Pro allows 1024 chars / 1000 rules)
+TWITTER_STREAM_RULE_MAX_LEN = int(os.getenv('TWITTER_STREAM_RULE_MAX_LEN', '512'))
+TWITTER_STREAM_MAX_RULES = int(os.getenv('TWITTER_STREAM_MAX_RULES', '25'))
+
+# Only rules with this tag prefix are added/removed - others on the app are left alone
+RULE_TAG_PREFIX = 'oasara-'
+
+# Operators every SEARCH_QUERIES entry ends with, factored out of packed rules
+RULE_OPERATORS = '-is:retweet lang:en'
+
+# A stream closed sooner than this after connecting counts as a failed connect
+MIN_HEALTHY_SECONDS = 10
+CLOSED_WAIT_START = 5
+CLOSED_WAIT_MAX = 320
+
+
+def use_api_base(session, base: str = TWITTER_API_BASE):
+    """Send a tweepy client's requests (which hardcode api.twitter.com) to base instead"""
+    if base == TWITTER_API:
+        return
+    request = session.request
+
+    def rebased(method, url, *args, **kwargs):
+        if url.startswith(TWITTER_API):
+            url = base + url[len(TWITTER_API):]
+        return request(method, url, *args, **kwargs)
+
+    session.request = rebased
+
+
+def _clause(query: str) -> str:
+    core = query.strip()
+    if core.endswith(RULE_OPERATORS):
+        core = core[:-len(RULE_OPERATORS)].strip()
+    return f"({core})" if ' ' in core else core
+
+
+def build_rules(
+    queries: List[str],
+    max_len: int = TWITTER_STREAM_RULE_MAX_LEN,
+    max_rules: int = TWITTER_STREAM_MAX_RULES
+) -> List[tweepy.StreamRule]:
+    """
+    Pack queries into as few rules as fit max_len:
+    '(("hospital bill") OR ("ER bill" ...)) -is:retweet lang:en'
+    """
+    groups: List[List[str]] = []
+    for clause in map(_clause, queries):
+        if groups and len(_rule_value(groups[-1] + [clause])) <= max_len:
+            groups[-1].append(clause)
+        else:
+            groups.append([clause])
+
+    if len(groups) > max_rules:
+        print(f"⚠️ {len(groups)} stream rules needed, only {max_rules} allowed - "
+              f"dropping the last {len(groups) - max_rules}")
+        groups = groups[:max_rules]
+
+    return [
+        tweepy.StreamRule(value=_rule_value(group), tag=f"{RULE_TAG_PREFIX}{i:02d}")
+        for i, group in enumerate(groups)
+    ]
+
+
+def _rule_value(clauses: List[str]) -> str:
+    body = clauses[0] if len(clauses) == 1 else f"({' OR '.join(clauses)})"
+    return f"{body} {RULE_OPERATORS}"
+
+
+def sync_rules(client: tweepy.StreamingClient, rules: List[tweepy.StreamRule]) -> Dict[str, int]:
+    """Make our tagged rules on the stream match rules; untagged/foreign rules are kept"""
+    existing = [
+        r for r in (client.get_rules().data or [])
+        if (r.tag or '').startswith(RULE_TAG_PREFIX)
+    ]
+    wanted = {(r.value, r.tag) for r in rules}
+    stale = [r.id for r in existing if (r.value, r.tag) not in wanted]
+    have = {(r.value, r.tag) for r in existing}
+    missing = [r for r in rules if (r.value, r.tag) not in have]
+
+    if stale:
+        client.delete_rules(stale)
+    if missing:
+        response = client.add_rules(missing)
+        for error in response.errors or []:
+            print(f"⚠️ Rule rejected: {error.get('title')} {error.get('value', '')[:60]}")
+
+    return {'kept': len(existing) - len(stale), 'added': len(missing), 'deleted': len(stale)}
+
+
+class RuleStream(tweepy.StreamingClient):
+    """
+    Filtered stream that hands each matching tweet to callback as a
+    one-tweet tweepy.Response (same shape as a search page) plus the tags
+    of the rules it matched
+    """
+
+    def __init__(self, bearer_token: str, callback: Callable[[tweepy.Response, List[str]], None], **kwargs):
+        super().__init__(bearer_token, **kwargs)
+        use_api_base(self.session)
+        self.callback = callback
+        self.fatal = False
+        self._connected_at = 0.0
+        self._closed_wait = CLOSED_WAIT_START
+        self._lock = threading.Lock()
+        self.stats = {
+            'connects': 0,
+            'tweets': 0,
+            'keep_alives': 0,
+            'closed': 0,
+            'http_errors': 0,
+            'connection_errors': 0,
+        }
+
+    def _add(self, **amounts):
+        with self._lock:
+            for key, value in amounts.items():
+                self.stats[key] += value
+
+    def on_connect(self):
+        self._add(connects=1)
+        self._connected_at = time.monotonic()
+        print("📡 Stream connected")
+
+    def on_response(self, response):
+        if response.data is None:
+            return
+        self._add(tweets=1)
+        tags = [r.tag for r in response.matching_rules if r.tag]
+        self.callback(tweepy.Response([response.data], response.includes, response.errors, {}), tags)
+
+    def on_keep_alive(self):
+        self._add(keep_alives=1)
+
+    def on_errors(self, errors):
+        # Operational disconnects are announced here before the server closes the stream
+        for error in errors:
+            print(f"⚠️ Stream error: {error.get('title')}: {error.get('detail', '')[:120]}")
+
+    def on_closed(self, response):
+        self._add(closed=1)
+        if time.monotonic() - self._connected_at < MIN_HEALTHY_SECONDS:
+            print(f"⚠️ Stream closed right after connecting, reconnecting in {self._closed_wait}s")
+            time.sleep(self._closed_wait)
+            self._closed_wait = min(self._closed_wait * 2, CLOSED_WAIT_MAX)
+        else:
+            self._closed_wait = CLOSED_WAIT_START
+            print("⚠️ Stream closed by server, reconnecting")
+
+    def on_request_error(self, status_code):
+        self._add(http_errors=1)
+        print(f"⚠️ Stream HTTP {status_code}")
+        if status_code in (401, 403):
+            # Bad token or no filtered-stream access: retrying won't help
+            self.fatal = True
+            self.disconnect()
+
+    def on_connection_error(self):
+        self._add(connection_errors=1)
+        print("⚠️ Stream connection error, reconnecting")
+
+    def on_exception(self, exception):
+        print(f"❌ Stream stopped: {exception}")
+
+    def summary(self) -> str:
+        with self._lock:
+            s = dict(self.stats)
+        return (
+            f"Stream: {s['tweets']} tweets, {s['connects']} connects, "
+            f"{s['closed']} server closes, {s['http_errors']} HTTP errors, "
+            f"{s['connection_errors']} connection errors, {s['keep_alives']} keep-alives"
+        )
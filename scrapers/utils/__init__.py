@@ -1,12 +1,18 @@
 from .storage import StorageClient, get_storage
 from .ai_extractor import extract_story_data, batch_extract, calculate_viral_potential
+from .extraction_cache import ExtractionCache, get_extraction_cache
+from .near_dup import NearDupIndex, get_near_dup_index
 
 __all__ = [
     'StorageClient',
     'get_storage',
     'extract_story_data',
     'batch_extract',
-    'calculate_viral_potential'
+    'calculate_viral_potential',
+    'ExtractionCache',
+    'get_extraction_cache',
+    'NearDupIndex',
+    'get_near_dup_index',
 ]
 
 
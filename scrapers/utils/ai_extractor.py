@@ -26,9 +26,23 @@ from typing import Dict, Any, Optional, List
 from anthropic import Anthropic
 from dotenv import load_dotenv
 
+from .extraction_cache import get_extraction_cache, content_hash, prompt_version
+from .model_router import ModelRouter
+from .condense import condense, RELEVANCE_TOKEN_BUDGET, EXTRACTION_TOKEN_BUDGET
+from .viral_scoring import load_weights, story_savings
+from .near_dup import get_near_dup_index
+
 load_dotenv(override=True)
 
-client = Anthropic(api_key=os.getenv('ANTHROPIC_API_KEY'))
+# ANTHROPIC_BASE_URL can point at scripts/fake_llm_server.py for offline load tests
+client = Anthropic(
+    api_key=os.getenv('ANTHROPIC_API_KEY'),
+    base_url=os.getenv('ANTHROPIC_BASE_URL') or None,
+    max_retries=int(os.getenv('ANTHROPIC_MAX_RETRIES', '2')),
+)
+
+# Relevance triage -> small model, extraction + borderline escalation -> large model
+router = ModelRouter(client)
 
 # OASARA Advisory Board Story Acceptance Criteria
 # Based on mission: "Exit the healthcare system. Keep your health data sovereign. Save 70-90% on care."
@@ -124,7 +138,32 @@ Extract the following fields (use null for missing data):
 
 Respond with ONLY valid JSON, no markdown formatting."""
 
-def check_relevance(content: str) -> str:
+# Cache versions - any change to prompt text or model invalidates cached results
+RELEVANCE_VERSION = prompt_version(
+    RELEVANCE_PROMPT, router.triage_model,
+    router.extraction_model if router.escalate_review else ''
+)
+EXTRACTION_VERSION = prompt_version(EXTRACTION_PROMPT, router.extraction_model)
+
+
+def _parse_decision(result: str) -> str:
+    """Normalize a model response to ACCEPT / REJECT / REVIEW_NEEDED"""
+    result = result.strip().upper()
+    if 'REJECT' in result:
+        return 'REJECT'
+    elif 'ACCEPT' in result:
+        return 'ACCEPT'
+    elif 'REVIEW' in result:
+        return 'REVIEW_NEEDED'
+    # Legacy compatibility
+    elif 'NOT_RELEVANT' in result or 'NOT RELEVANT' in result:
+        return 'REJECT'
+    elif 'RELEVANT' in result:
+        return 'ACCEPT'
+    else:
+        return 'REVIEW_NEEDED'
+
+def check_relevance(content: str, use_cache: bool = True, source: str = 'unknown') -> str:
     """
     Check if content meets OASARA Advisory Board criteria for story acceptance.
 
@@ -134,47 +173,50 @@ def check_relevance(content: str) -> str:
     - ACCEPT: Horror stories, success stories, comparisons, or systemic exposés
     - REJECT: Off-topic, too political, no specific details, or non-actionable
     - REVIEW_NEEDED: Borderline cases that need human review
+
+    Triage runs on the small model; REVIEW_NEEDED is re-asked on the large
+    model (CLAUDE_ESCALATE_REVIEW). Decisions are cached by content hash +
+    prompt version (see extraction_cache)
     """
+    # Keep the salient paragraphs (amounts, procedures, insurance) within budget
+    prompt_content = condense(content, RELEVANCE_TOKEN_BUDGET)
+    prompt = RELEVANCE_PROMPT.format(content=prompt_content)
+
+    cache = get_extraction_cache() if use_cache else None
+    cache_key = content_hash(prompt_content)
+    if cache:
+        cached = cache.get('relevance', cache_key, RELEVANCE_VERSION)
+        if cached:
+            return cached
+
     try:
-        response = client.messages.create(
-            model="claude-sonnet-4-20250514",
-            max_tokens=100,
-            messages=[
-                {
-                    "role": "user",
-                    "content": RELEVANCE_PROMPT.format(content=content[:4000])
-                }
-            ]
-        )
+        call = router.complete('relevance', prompt, max_tokens=100, source=source)
+        decision = _parse_decision(call.text)
+        router.record(call, decision)
 
-        result = response.content[0].text.strip().upper()
-
-        # Normalize response to our three categories
-        if 'REJECT' in result:
-            return 'REJECT'
-        elif 'ACCEPT' in result:
-            return 'ACCEPT'
-        elif 'REVIEW' in result:
-            return 'REVIEW_NEEDED'
-        # Legacy compatibility
-        elif 'NOT_RELEVANT' in result or 'NOT RELEVANT' in result:
-            return 'REJECT'
-        elif 'RELEVANT' in result:
-            return 'ACCEPT'
-        else:
-            return 'REVIEW_NEEDED'
+        if decision == 'REVIEW_NEEDED' and router.escalate_review:
+            call = router.complete('relevance_escalation', prompt, max_tokens=100, source=source)
+            decision = _parse_decision(call.text)
+            router.record(call, decision)
 
     except Exception as e:
         print(f"Relevance check error: {e}")
         return 'REVIEW_NEEDED'
 
+    # Only cache real answers - API errors return above without caching
+    if cache:
+        cache.put('relevance', cache_key, RELEVANCE_VERSION, decision)
+
+    return decision
+
 
 def extract_story_data(
     content: str,
     source: str,
     source_url: Optional[str] = None,
     attached_images: Optional[List[str]] = None,
-    skip_relevance_check: bool = False
+    skip_relevance_check: bool = False,
+    skip_duplicate_check: bool = False
 ) -> Dict[str, Any]:
     """
     Extract structured story data from raw content
@@ -185,14 +227,31 @@ def extract_story_data(
         source_url: Original URL
         attached_images: List of image URLs if any
         skip_relevance_check: Skip the relevance filter (for pre-validated content)
+        skip_duplicate_check: Skip the near-duplicate filter (see near_dup)
         
     Returns:
         Structured story data ready for database insertion
     """
+    # Syndicated copies / crossposts of content already seen never reach the LLM
+    near_dup = None if skip_duplicate_check else get_near_dup_index()
+    if near_dup:
+        original = near_dup.check(content, source, source_url)
+        if original:
+            return {
+                'error': f"Near-duplicate of {original['url'] or original['source']}",
+                'duplicate': True,
+                'duplicate_of': original['url'],
+                'similarity': original['similarity'],
+                'source': source,
+                'source_url': source_url
+            }
+
     # First, check if content meets OASARA Advisory Board criteria
     if not skip_relevance_check:
-        decision = check_relevance(content)
+        decision = check_relevance(content, source=source)
         if decision == 'REJECT':
+            if near_dup:
+                near_dup.add(content, source, source_url)
             return {
                 'error': 'Content does not meet OASARA story criteria',
                 'decision': decision,
@@ -203,27 +262,38 @@ def extract_story_data(
         elif decision == 'REVIEW_NEEDED':
             print(f"  ⚠️ Borderline content - proceeding with extraction for human review...")
     
+    prompt_content = condense(content, EXTRACTION_TOKEN_BUDGET)
+    cache = get_extraction_cache()
+    cache_key = content_hash(prompt_content, source)
+
     try:
-        response = client.messages.create(
-            model="claude-sonnet-4-20250514",
-            max_tokens=2000,
-            messages=[
-                {
-                    "role": "user",
-                    "content": EXTRACTION_PROMPT.format(source=source, content=content[:10000])
-                }
-            ]
-        )
-        
-        # Parse JSON response
-        response_text = response.content[0].text
-        
-        # Clean up potential markdown formatting
-        if response_text.startswith('```'):
-            response_text = re.sub(r'^```json?\n?', '', response_text)
-            response_text = re.sub(r'\n?```$', '', response_text)
-        
-        extracted = json.loads(response_text)
+        extracted = cache.get('extraction', cache_key, EXTRACTION_VERSION) if cache else None
+
+        if extracted is None:
+            call = router.complete(
+                'extraction',
+                EXTRACTION_PROMPT.format(source=source, content=prompt_content),
+                max_tokens=2000,
+                source=source
+            )
+
+            # Parse JSON response
+            response_text = call.text
+
+            # Clean up potential markdown formatting
+            if response_text.startswith('```'):
+                response_text = re.sub(r'^```json?\n?', '', response_text)
+                response_text = re.sub(r'\n?```$', '', response_text)
+
+            try:
+                extracted = json.loads(response_text)
+            except json.JSONDecodeError:
+                router.record(call, 'parse_error')
+                raise
+            router.record(call, 'ok')
+
+            if cache:
+                cache.put('extraction', cache_key, EXTRACTION_VERSION, extracted)
         
         # Add metadata
         extracted['source'] = source
@@ -232,6 +302,10 @@ def extract_story_data(
         extracted['status'] = 'pending'  # Needs review before publishing
         extracted['scraped_at'] = True  # Flag to identify scraped vs user-submitted
         
+        # Index only now: a failed call or parse leaves later copies free to try again
+        if near_dup:
+            near_dup.add(content, source, source_url)
+        
         return extracted
         
     except json.JSONDecodeError as e:
@@ -277,42 +351,41 @@ def batch_extract(items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     return results
 
 
-def calculate_viral_potential(story: Dict[str, Any]) -> int:
+def calculate_viral_potential(story: Dict[str, Any], weights: Optional[Dict[str, Any]] = None) -> int:
     """
     Calculate viral potential score based on story characteristics
     Used for prioritizing which stories to feature
+
+    Single-story version of utils/viral_scoring.py (same configurable weights);
+    use scripts/rescore_viral.py to re-rank the whole table in bulk
     """
-    score = 5  # Base score
+    w = weights or load_weights()
+    score = w['base']
     
     # Cost factors
-    if story.get('cost_us') and story['cost_us'] > 50000:
-        score += 2
-    if story.get('savings_amount') and story['savings_amount'] > 20000:
-        score += 2
+    if story.get('cost_us') and story['cost_us'] > w['cost_us']['threshold']:
+        score += w['cost_us']['points']
+    if story_savings(story) > w['savings']['threshold']:
+        score += w['savings']['points']
     
     # Emotional impact
-    emotional_tags = story.get('emotional_tags', [])
-    if 'shock' in emotional_tags:
-        score += 1
-    if 'anger' in emotional_tags:
-        score += 1
+    emotional_tags = story.get('emotional_tags') or []
+    for tag, points in w['emotional_tags'].items():
+        if tag in emotional_tags:
+            score += points
     
     # Issues
-    issues = story.get('issues', [])
-    if 'bankruptcy' in issues:
-        score += 2
-    if 'denied_coverage' in issues:
-        score += 1
-    if 'surprise_bill' in issues:
-        score += 1
+    issues = story.get('issues') or []
+    for issue, points in w['issues'].items():
+        if issue in issues:
+            score += points
     
     # Has compelling quote
-    if story.get('key_quote') and len(story['key_quote']) > 50:
-        score += 1
+    if story.get('key_quote') and len(story['key_quote']) > w['key_quote']['min_length']:
+        score += w['key_quote']['points']
     
     # Has visual proof
-    if story.get('images') and len(story['images']) > 0:
-        score += 1
+    if len(story.get('images') or []) >= w['images']['min_count']:
+        score += w['images']['points']
     
-    return min(score, 10)
-
+    return int(max(w['min'], min(score, w['max'])))
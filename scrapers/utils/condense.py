@@ -0,0 +1,189 @@
+"""
+Token-budgeted content condensation before AI extraction
+Replaces blind content[:N] truncation
+
+1. Strip boilerplate (newsletter/cookie/share/nav lines without amounts or
+   medical/insurance terms); content already within budget is left as is
+2. Drop repeated lines (rolling auto-captions, repeated bylines)
+3. Score paragraphs by salience - dollar amounts, procedures, insurance terms
+4. Pack the best paragraphs into the token budget, kept in original order
+"""
+import os
+import re
+from typing import List, Tuple
+from dotenv import load_dotenv
+
+load_dotenv(override=True)
+
+CONDENSE_ENABLED = os.getenv('CONDENSE_ENABLED', 'true').lower() not in ('0', 'false', 'no')
+RELEVANCE_TOKEN_BUDGET = int(os.getenv('CONDENSE_RELEVANCE_TOKENS', '1000'))
+EXTRACTION_TOKEN_BUDGET = int(os.getenv('CONDENSE_EXTRACTION_TOKENS', '2500'))
+
+# Rough chars-per-token for English prose (Claude tokenizer averages ~3.5-4)
+CHARS_PER_TOKEN = 4
+
+# Transcripts often arrive as one giant block - re-chunk anything longer than this
+MAX_PARAGRAPH_CHARS = 800
+
+BOILERPLATE_RE = re.compile(
+    r'(subscribe|sign up|newsletter|cookie|advertisement|all rights reserved|copyright ©|'
+    r'share (this|on)|follow us|click here|read more|related:|recommended for you|'
+    r'privacy policy|terms of (use|service)|like and subscribe|hit the bell|'
+    r'this story (was|is) (produced|published)|republish this|support (our|independent) journalism)',
+    re.IGNORECASE
+)
+
+MONEY_RE = re.compile(
+    r'\$\s?\d[\d,]*(?:\.\d+)?\s?(?:k|m|million|thousand|billion)?\b'
+    r'|\b\d[\d,]*(?:\.\d+)?\s?(?:dollars|usd)\b'
+    r'|\b\d+(?:\.\d+)?\s?(?:k|grand)\b',
+    re.IGNORECASE
+)
+
+PROCEDURE_TERMS = re.compile(
+    r'\b(surgery|surgeon|implants?|root canal|crowns?|knee|hip|replacement|transplant|'
+    r'chemo\w*|cancer|mri|ct scan|x-ray|ambulance|emergency room|\ber\b|icu|'
+    r'delivery|c-section|birth|dental|dentist|lasik|bariatric|gastric|insulin|'
+    r'prescription|medication|procedure|treatment|diagnos\w+|hospital)\b',
+    re.IGNORECASE
+)
+
+INSURANCE_TERMS = re.compile(
+    r'\b(insurance|insurer|denied|denial|claim|prior auth\w*|coverage|covered|'
+    r'deductible|copay|co-pay|premium|out[- ]of[- ]network|in[- ]network|'
+    r'surprise bill\w*|itemized|chargemaster|collections?|bankrupt\w*|debt|'
+    r'medical tourism|abroad|mexico|thailand|costa rica|cash price|self[- ]pay)\b',
+    re.IGNORECASE
+)
+
+SENTENCE_SPLIT_RE = re.compile(r'(?<=[.!?])\s+')
+# Rolling auto-captions repeat the previous 4-30 words ("a b c d a b c d e f")
+REPEATED_RUN_RE = re.compile(r'\b((?:\S+\s+){4,30}?)\1+')
+NORMALIZE_RE = re.compile(r'[^a-z0-9$]+')
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate (no tokenizer round-trip)"""
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def _sentences(block: str) -> List[str]:
+    """Sentence split; unpunctuated runs (auto-subs) are cut into word windows"""
+    pieces = []
+    for sentence in SENTENCE_SPLIT_RE.split(block):
+        while len(sentence) > MAX_PARAGRAPH_CHARS:
+            cut = sentence.rfind(' ', 0, MAX_PARAGRAPH_CHARS)
+            cut = cut if cut > 0 else MAX_PARAGRAPH_CHARS
+            pieces.append(sentence[:cut])
+            sentence = sentence[cut:].strip()
+        if sentence:
+            pieces.append(sentence)
+    return pieces
+
+
+def _split_paragraphs(content: str) -> List[str]:
+    """Split into paragraphs, re-chunking oversized blocks on sentence boundaries"""
+    blocks = [b.strip() for b in re.split(r'\n\s*\n', content) if b.strip()]
+    if len(blocks) == 1 and '\n' in blocks[0]:
+        # Line-oriented content (subtitles, tweets with line breaks)
+        blocks = [line.strip() for line in blocks[0].split('\n') if line.strip()]
+
+    paragraphs = []
+    for block in blocks:
+        block = REPEATED_RUN_RE.sub(r'\1', block + ' ').strip()
+        if len(block) <= MAX_PARAGRAPH_CHARS:
+            paragraphs.append(block)
+            continue
+        chunk = ''
+        for sentence in _sentences(block):
+            if chunk and len(chunk) + len(sentence) > MAX_PARAGRAPH_CHARS:
+                paragraphs.append(chunk)
+                chunk = ''
+            chunk = f"{chunk} {sentence}".strip()
+        if chunk:
+            paragraphs.append(chunk)
+    return paragraphs
+
+
+def _salient(para: str) -> bool:
+    return bool(MONEY_RE.search(para) or PROCEDURE_TERMS.search(para) or INSURANCE_TERMS.search(para))
+
+
+def clean_paragraphs(content: str) -> List[str]:
+    """Split content and drop boilerplate + repeated lines"""
+    seen = set()
+    kept = []
+    for para in _split_paragraphs(content):
+        # Short nav/promo lines - never ones that carry amounts or medical/insurance terms
+        if len(para) < 200 and BOILERPLATE_RE.search(para) and not _salient(para):
+            continue
+        key = NORMALIZE_RE.sub(' ', para.lower()).strip()
+        if not key or key in seen:
+            continue
+        seen.add(key)
+        kept.append(para)
+    return kept
+
+
+def score_paragraph(para: str, index: int) -> float:
+    """Salience score - money amounts dominate, then procedures/insurance terms"""
+    money = len(MONEY_RE.findall(para))
+    procedures = len(PROCEDURE_TERMS.findall(para))
+    insurance = len(INSURANCE_TERMS.findall(para))
+
+    score = money * 3.0 + procedures * 1.0 + insurance * 1.0
+    # Normalize by length so long paragraphs don't win on size alone
+    score = score / max(len(para) / 400, 1.0)
+
+    # Lede/title usually frames the story
+    if index == 0:
+        score += 2.0
+    elif index < 3:
+        score += 0.5
+    return score
+
+
+def condense(content: str, token_budget: int) -> str:
+    """
+    Condense content to fit token_budget, keeping the most salient paragraphs
+
+    Args:
+        content: Raw scraped text (article, post, transcript)
+        token_budget: Max estimated tokens for the returned text
+
+    Returns:
+        Cleaned text - unchanged order, boilerplate and repeats removed
+    """
+    if not content:
+        return ''
+    if not CONDENSE_ENABLED:
+        return content[:token_budget * CHARS_PER_TOKEN]
+    if estimate_tokens(content) <= token_budget:
+        # Already fits - nothing to gain from dropping lines
+        return content.strip()
+
+    paragraphs = clean_paragraphs(content)
+    cleaned = '\n\n'.join(paragraphs)
+    if estimate_tokens(cleaned) <= token_budget:
+        return cleaned
+
+    ranked: List[Tuple[float, int]] = sorted(
+        ((score_paragraph(p, i), i) for i, p in enumerate(paragraphs)),
+        reverse=True
+    )
+
+    budget_chars = token_budget * CHARS_PER_TOKEN
+    chosen = []
+    used = 0
+    for _, i in ranked:
+        cost = len(paragraphs[i]) + 2
+        if used + cost > budget_chars:
+            continue
+        chosen.append(i)
+        used += cost
+
+    if not chosen:
+        # Single paragraph bigger than the budget - fall back to truncation
+        return cleaned[:budget_chars]
+
+    return '\n\n'.join(paragraphs[i] for i in sorted(chosen))
@@ -0,0 +1,292 @@
+"""
+Per-domain politeness crawl scheduler
+Fetches many URLs concurrently while staying polite to each site:
+
+- One queue per domain, with a per-domain cap on in-flight requests and a
+  minimum delay between request starts
+- robots.txt is fetched once per domain; disallowed URLs are skipped and a
+  Crawl-delay / Request-rate raises that domain's delay (and drops it to
+  one request in flight)
+- 429/503 responses back the domain off (Retry-After when given) and the
+  URL is requeued behind the backoff, up to THROTTLE_RETRIES times
+- A global worker cap across domains, with one pooled requests.Session
+  per domain so connections are reused
+- With an HttpCache (utils/http_cache.py), pages still fresh in the cache
+  skip the per-domain delay entirely and stale ones are revalidated
+
+Different domains never wait on each other, so a pass over N sites runs
+at roughly the sum of what each site allows instead of one fixed sleep
+per page.
+
+    scheduler = CrawlScheduler(headers=HEADERS)
+    for url, soup in scheduler.crawl((url, parse) for url in urls):
+        ...
+"""
+import time
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional, Tuple
+from urllib.parse import urlparse
+from urllib.robotparser import RobotFileParser
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from utils.http_cache import HttpCache
+
+# Longest delay a robots.txt or Retry-After can impose on one domain
+MAX_DOMAIN_DELAY = 60.0
+
+ROBOTS_TIMEOUT = 10
+
+# Times a 429/503'd URL is requeued before it yields None
+THROTTLE_RETRIES = 3
+
+# _fetch result for a 429/503 response (crawl requeues the job)
+_THROTTLED = object()
+
+
+class _Domain:
+    """Queue and politeness state for one host"""
+
+    def __init__(self, scheme: str, netloc: str, delay: float, concurrency: int):
+        self.scheme = scheme
+        self.netloc = netloc
+        self.delay = delay
+        self.concurrency = concurrency
+        self.queue = deque()
+        self.active = 0
+        self.next_at = 0.0
+        self.robots: Optional[RobotFileParser] = None
+        self.robots_state = 'new'  # new -> pending -> ready
+        self.session: Optional[requests.Session] = None
+        self.fetched = 0
+
+    def backoff(self, seconds: float):
+        self.delay = min(MAX_DOMAIN_DELAY, max(self.delay * 2, seconds))
+        self.next_at = max(self.next_at, time.monotonic() + self.delay)
+
+
+class CrawlScheduler:
+    """
+    Thread-pool crawler with per-domain queues
+
+    crawl() takes (url, handler) jobs and yields (url, result) as they
+    complete. The handler runs in the worker with the 200 response and
+    its return value is the result; failed, non-200 and robots-disallowed
+    URLs yield None. A handler of None yields the response itself.
+    """
+
+    def __init__(
+        self,
+        headers: Optional[Dict[str, str]] = None,
+        max_workers: int = 16,
+        per_domain_concurrency: int = 2,
+        default_delay: float = 1.0,
+        respect_robots: bool = True,
+        timeout: int = 30,
+        cache: Optional[HttpCache] = None
+    ):
+        self.headers = headers or {}
+        self.user_agent = self.headers.get('User-Agent', '*')
+        self.max_workers = max_workers
+        self.per_domain_concurrency = per_domain_concurrency
+        self.default_delay = default_delay
+        self.respect_robots = respect_robots
+        self.timeout = timeout
+        self.cache = cache
+
+        self.domains: Dict[str, _Domain] = {}
+        self._lock = threading.Lock()
+        self.stats = {
+            'requests': 0,
+            'ok': 0,
+            'http_errors': 0,
+            'errors': 0,
+            'disallowed': 0,
+            'throttled': 0,
+            'retried': 0,
+            'cached': 0,
+        }
+
+    # ---- Per-domain state -------------------------------------------------
+
+    def _domain(self, url: str) -> _Domain:
+        parsed = urlparse(url)
+        key = parsed.netloc.lower()
+        if key not in self.domains:
+            self.domains[key] = _Domain(
+                parsed.scheme or 'https', key, self.default_delay, self.per_domain_concurrency
+            )
+        return self.domains[key]
+
+    def _session(self, domain: _Domain) -> requests.Session:
+        if domain.session is None:
+            session = requests.Session()
+            session.headers.update(self.headers)
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max(domain.concurrency, 1))
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+            domain.session = session
+        return domain.session
+
+    def _count(self, key: str):
+        with self._lock:
+            self.stats[key] += 1
+
+    def _get(self, domain: _Domain, url: str, timeout: int) -> requests.Response:
+        session = self._session(domain)
+        if self.cache is None:
+            return session.get(url, timeout=timeout)
+        return self.cache.get(session, url, timeout=timeout)
+
+    def _load_robots(self, domain: _Domain):
+        """Fetch robots.txt; unreachable or missing means everything is allowed"""
+        robots = RobotFileParser()
+        try:
+            resp = self._get(domain, f"{domain.scheme}://{domain.netloc}/robots.txt", ROBOTS_TIMEOUT)
+            if resp.status_code in (401, 403):
+                robots.disallow_all = True
+            elif resp.status_code >= 400:
+                robots.allow_all = True
+            else:
+                robots.parse(resp.text.splitlines())
+        except requests.RequestException:
+            robots.allow_all = True
+        domain.robots = robots
+
+        crawl_delay = robots.crawl_delay(self.user_agent)
+        rate = robots.request_rate(self.user_agent)
+        if crawl_delay is None and rate and rate.requests:
+            crawl_delay = rate.seconds / rate.requests
+        if crawl_delay:
+            domain.delay = min(MAX_DOMAIN_DELAY, max(domain.delay, float(crawl_delay)))
+            domain.concurrency = 1
+
+    def _allowed(self, domain: _Domain, url: str) -> bool:
+        if not self.respect_robots or domain.robots is None:
+            return True
+        return domain.robots.can_fetch(self.user_agent, url)
+
+    # ---- Fetching ---------------------------------------------------------
+
+    def _fetch(self, domain: _Domain, url: str, handler: Optional[Callable]) -> Any:
+        self._count('requests')
+        try:
+            resp = self._get(domain, url, self.timeout)
+        except requests.RequestException as e:
+            self._count('errors')
+            print(f"  Error fetching {url}: {e}")
+            return None
+
+        if resp.status_code in (429, 503):
+            self._count('throttled')
+            retry_after = resp.headers.get('Retry-After', '')
+            domain.backoff(float(retry_after) if retry_after.isdigit() else domain.delay * 2)
+            print(f"  HTTP {resp.status_code} for {url} (backing off {domain.netloc} to {domain.delay:.0f}s)")
+            return _THROTTLED
+        if resp.status_code != 200:
+            self._count('http_errors')
+            print(f"  HTTP {resp.status_code} for {url}")
+            return None
+
+        self._count('ok')
+        if getattr(resp, 'from_cache', False):
+            self._count('cached')
+        domain.fetched += 1
+        if handler is None:
+            return resp
+        try:
+            return handler(resp)
+        except Exception as e:
+            self._count('errors')
+            print(f"  Error parsing {url}: {e}")
+            return None
+
+    def crawl(self, jobs: Iterable[Tuple[str, Optional[Callable]]]) -> Iterator[Tuple[str, Any]]:
+        """Fetch every job's URL politely, yielding (url, result) in completion order"""
+        for url, handler in jobs:
+            self._domain(url).queue.append((url, handler, 0))
+
+        # future -> (domain, job or None for robots.txt, counts against the domain's limits)
+        pending: Dict[Any, Tuple[_Domain, Optional[Tuple[str, Optional[Callable], int]], bool]] = {}
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            while True:
+                now = time.monotonic()
+                wake_at = None
+                skipped = []
+
+                for domain in list(self.domains.values()):
+                    if not domain.queue:
+                        continue
+                    if self.respect_robots and domain.robots_state != 'ready':
+                        if domain.robots_state == 'new' and len(pending) < self.max_workers:
+                            domain.robots_state = 'pending'
+                            pending[pool.submit(self._load_robots, domain)] = (domain, None, False)
+                        continue
+
+                    while domain.queue and len(pending) < self.max_workers:
+                        url, handler, attempt = domain.queue[0]
+                        # Fresh cache hits never reach the site, so they skip its limits
+                        polite = self.cache is None or not self.cache.is_fresh(url)
+                        if polite:
+                            if domain.active >= domain.concurrency:
+                                break
+                            if now < domain.next_at:
+                                wake_at = min(wake_at or domain.next_at, domain.next_at)
+                                break
+                        domain.queue.popleft()
+                        if not self._allowed(domain, url):
+                            self._count('disallowed')
+                            skipped.append(url)
+                            continue
+                        if polite:
+                            domain.active += 1
+                            domain.next_at = now + domain.delay
+                        pending[pool.submit(self._fetch, domain, url, handler)] = (
+                            domain, (url, handler, attempt), polite
+                        )
+
+                for url in skipped:
+                    yield url, None
+
+                if not pending:
+                    if wake_at is None:
+                        break
+                    time.sleep(max(wake_at - time.monotonic(), 0))
+                    continue
+
+                timeout = max(wake_at - time.monotonic(), 0) if wake_at else None
+                done, _ = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+                for future in done:
+                    domain, job, polite = pending.pop(future)
+                    if job is None:
+                        domain.robots_state = 'ready'
+                        continue
+                    if polite:
+                        domain.active -= 1
+                    url, handler, attempt = job
+                    result = future.result()
+                    if result is _THROTTLED:
+                        if attempt < THROTTLE_RETRIES:
+                            # Next in line for this domain, once its backoff has passed
+                            self._count('retried')
+                            domain.queue.appendleft((url, handler, attempt + 1))
+                            continue
+                        result = None
+                    yield url, result
+
+    def fetch(self, url: str, handler: Optional[Callable] = None) -> Any:
+        """One polite fetch (same robots/delay/backoff rules as crawl)"""
+        for _, result in self.crawl([(url, handler)]):
+            return result
+
+    def summary(self) -> str:
+        s = self.stats
+        busiest = sorted(self.domains.values(), key=lambda d: d.fetched, reverse=True)[:5]
+        per_domain = ', '.join(f"{d.netloc}={d.fetched}" for d in busiest if d.fetched)
+        return (f"{s['requests']} requests across {len(self.domains)} domains: {s['ok']} ok ({s['cached']} from cache), "
+                f"{s['http_errors']} HTTP errors, {s['errors']} failed, {s['throttled']} throttled ({s['retried']} retried), "
+                f"{s['disallowed']} disallowed by robots.txt"
+                + (f" ({per_domain})" if per_domain else ''))
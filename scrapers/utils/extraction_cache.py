@@ -0,0 +1,194 @@
+"""
+Persistent cache for AI relevance decisions and extraction results
+SQLite-backed, keyed by normalized-content hash + prompt version
+
+The same Reddit crosspost, syndicated article or reposted tweet shows up
+under many URLs. Caching on the content itself (not the URL) means we only
+pay Claude once per unique piece of content. The prompt version is derived
+from the prompt text + model, so editing RELEVANCE_PROMPT or
+EXTRACTION_PROMPT automatically invalidates old entries.
+"""
+import os
+import re
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+from pathlib import Path
+from typing import Any, Dict, Optional
+from dotenv import load_dotenv
+
+load_dotenv(override=True)
+
+# Cache configuration
+CACHE_ENABLED = os.getenv('EXTRACTION_CACHE_ENABLED', 'true').lower() not in ('0', 'false', 'no')
+CACHE_PATH = os.getenv(
+    'EXTRACTION_CACHE_PATH',
+    str(Path(__file__).parent.parent / 'cache' / 'extraction_cache.db')
+)
+CACHE_MAX_ENTRIES = int(os.getenv('EXTRACTION_CACHE_MAX_ENTRIES', '50000'))
+
+_URL_RE = re.compile(r'https?://\S+')
+_WS_RE = re.compile(r'\s+')
+
+
+def normalize_content(content: str) -> str:
+    """
+    Normalize content so trivially different copies hash the same
+    (case, whitespace, embedded links)
+    """
+    text = _URL_RE.sub(' ', content or '')
+    text = _WS_RE.sub(' ', text.lower())
+    return text.strip()
+
+
+def content_hash(content: str, *extra: str) -> str:
+    """SHA-256 of normalized content plus any extra key parts (e.g. source)"""
+    h = hashlib.sha256()
+    for part in extra:
+        h.update(part.encode('utf-8'))
+        h.update(b'\x00')
+    h.update(normalize_content(content).encode('utf-8'))
+    return h.hexdigest()
+
+
+def prompt_version(*parts: str) -> str:
+    """Short stable version id for a prompt template (+ model, criteria, ...)"""
+    h = hashlib.sha256()
+    for part in parts:
+        h.update(part.encode('utf-8'))
+        h.update(b'\x00')
+    return h.hexdigest()[:12]
+
+
+class ExtractionCache:
+    """Size-bounded SQLite cache with LRU eviction and hit-rate stats"""
+
+    def __init__(self, path: str = CACHE_PATH, max_entries: int = CACHE_MAX_ENTRIES):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('''
+            CREATE TABLE IF NOT EXISTS entries (
+                kind TEXT NOT NULL,
+                key TEXT NOT NULL,
+                version TEXT NOT NULL,
+                value TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                last_used REAL NOT NULL,
+                hits INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (kind, key, version)
+            )
+        ''')
+        self._conn.execute('CREATE INDEX IF NOT EXISTS idx_entries_last_used ON entries(last_used)')
+        self._conn.commit()
+
+        # Per-process hit/miss counters, by kind
+        self._stats: Dict[str, Dict[str, int]] = {}
+
+    def _count(self, kind: str, field: str):
+        self._stats.setdefault(kind, {'hits': 0, 'misses': 0, 'stores': 0})[field] += 1
+
+    def get(self, kind: str, key: str, version: str) -> Optional[Any]:
+        """Return cached value or None"""
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT value FROM entries WHERE kind = ? AND key = ? AND version = ?',
+                (kind, key, version)
+            ).fetchone()
+            if row is None:
+                self._count(kind, 'misses')
+                return None
+            self._conn.execute(
+                'UPDATE entries SET last_used = ?, hits = hits + 1 WHERE kind = ? AND key = ? AND version = ?',
+                (time.time(), kind, key, version)
+            )
+            self._conn.commit()
+            self._count(kind, 'hits')
+        return json.loads(row[0])
+
+    def put(self, kind: str, key: str, version: str, value: Any):
+        """Store a JSON-serializable value, evicting least-recently-used entries if over size"""
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO entries (kind, key, version, value, created_at, last_used, hits) '
+                'VALUES (?, ?, ?, ?, ?, ?, 0)',
+                (kind, key, version, json.dumps(value, default=str), now, now)
+            )
+            self._count(kind, 'stores')
+            self._evict()
+            self._conn.commit()
+
+    def _evict(self):
+        """Drop least-recently-used entries beyond max_entries (caller holds lock)"""
+        total = self._conn.execute('SELECT COUNT(*) FROM entries').fetchone()[0]
+        overflow = total - self.max_entries
+        if overflow > 0:
+            self._conn.execute(
+                'DELETE FROM entries WHERE rowid IN '
+                '(SELECT rowid FROM entries ORDER BY last_used ASC LIMIT ?)',
+                (overflow,)
+            )
+
+    def session_count(self, kind: str, field: str = 'hits') -> int:
+        """Hits/misses/stores for one kind in this process"""
+        return self._stats.get(kind, {}).get(field, 0)
+
+    def clear(self):
+        """Remove all cached entries"""
+        with self._lock:
+            self._conn.execute('DELETE FROM entries')
+            self._conn.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit-rate report for this process plus on-disk size"""
+        with self._lock:
+            rows = self._conn.execute(
+                'SELECT kind, COUNT(*), SUM(hits) FROM entries GROUP BY kind'
+            ).fetchall()
+
+        by_kind = {}
+        for kind, counts in self._stats.items():
+            lookups = counts['hits'] + counts['misses']
+            by_kind[kind] = {
+                **counts,
+                'hit_rate': round(counts['hits'] / lookups, 3) if lookups else 0.0,
+            }
+
+        return {
+            'path': str(self.path),
+            'entries': {kind: count for kind, count, _ in rows},
+            'lifetime_hits': {kind: hits or 0 for kind, _, hits in rows},
+            'max_entries': self.max_entries,
+            'session': by_kind,
+        }
+
+    def print_stats(self):
+        """Print hit-rate summary to console"""
+        stats = self.stats()
+        print("\n📦 Extraction cache:")
+        if not stats['session']:
+            print("  No lookups this run")
+        for kind, counts in stats['session'].items():
+            print(f"  {kind}: {counts['hits']} hits / {counts['misses']} misses "
+                  f"({counts['hit_rate'] * 100:.1f}% hit rate)")
+        total = sum(stats['entries'].values())
+        print(f"  {total} entries on disk (max {stats['max_entries']})")
+
+
+# Singleton instance
+_extraction_cache = None
+
+def get_extraction_cache() -> Optional[ExtractionCache]:
+    """Shared cache instance, or None when disabled via EXTRACTION_CACHE_ENABLED=false"""
+    global _extraction_cache
+    if not CACHE_ENABLED:
+        return None
+    if _extraction_cache is None:
+        _extraction_cache = ExtractionCache()
+    return _extraction_cache
@@ -0,0 +1,371 @@
+"""
+Pluggable HTML parsing backend
+One small API over selectolax (lexbor), lxml and BeautifulSoup so scrapers
+aren't tied to html.parser:
+
+    doc = parse_html(html)               # HTML_PARSER backend (default selectolax)
+    for a in doc.css('h2 a'):
+        a.get('href'), a.text()
+
+    article = extract_article(doc, url)  # title/body/images/date/author, one walk
+
+extract_article replaces ~20 separate select()/select_one() passes with a
+single document-order walk that tracks the article/main/.content ancestors
+and collects every candidate field at once; the same priority rules as
+the old selector lists are applied afterwards.
+
+Backends, fastest first: selectolax, lxml (+ cssselect), bs4 (html.parser).
+An unavailable backend falls back to the next one.
+"""
+import os
+from functools import lru_cache
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import urljoin
+from dotenv import load_dotenv
+
+load_dotenv(override=True)
+
+HTML_PARSER = os.getenv('HTML_PARSER', 'selectolax').lower()
+
+BACKENDS = ['selectolax', 'lxml', 'bs4']
+
+
+def _clean(text: Optional[str]) -> str:
+    return ' '.join(text.split()) if text else ''
+
+
+class _SelectolaxBackend:
+    name = 'selectolax'
+
+    def __init__(self):
+        from selectolax.lexbor import LexborHTMLParser
+        self._parser = LexborHTMLParser
+
+    def parse(self, html: str):
+        return self._parser(html).root
+
+    def css(self, node, selector: str) -> list:
+        return node.css(selector)
+
+    def text(self, node) -> str:
+        return _clean(node.text(deep=True))
+
+    def attr(self, node, name: str) -> Optional[str]:
+        return node.attributes.get(name)
+
+    def walk(self, root) -> Iterator[Tuple[Any, Any, Any, str, Dict[str, Any]]]:
+        for node in root.traverse():
+            parent = node.parent
+            yield node, node.mem_id, parent.mem_id if parent is not None else None, node.tag, node.attributes
+
+
+class _LxmlBackend:
+    name = 'lxml'
+
+    def __init__(self):
+        import lxml.html
+        from lxml.cssselect import CSSSelector
+        self._html = lxml.html
+        self._parser = lxml.html.HTMLParser(encoding='utf-8')
+        self._compile = lru_cache(maxsize=256)(lambda sel: CSSSelector(sel, translator='html'))
+
+    def parse(self, html: str):
+        # Bytes: lxml rejects str input that carries an XML encoding declaration
+        return self._html.document_fromstring(html.encode('utf-8') or b'<html></html>', parser=self._parser)
+
+    def css(self, node, selector: str) -> list:
+        return self._compile(selector)(node)
+
+    def text(self, node) -> str:
+        return _clean(node.text_content())
+
+    def attr(self, node, name: str) -> Optional[str]:
+        return node.get(name)
+
+    def walk(self, root):
+        # Callers keep ancestors referenced, so the parent's proxy (and id()) is stable
+        for el in root.iter():
+            if isinstance(el.tag, str):
+                yield el, id(el), id(el.getparent()), el.tag, el.attrib
+
+
+class _Bs4Backend:
+    name = 'bs4'
+
+    def __init__(self):
+        from bs4 import BeautifulSoup, Tag
+        self._soup = BeautifulSoup
+        self._tag = Tag
+
+    def parse(self, html: str):
+        return self._soup(html, 'html.parser')
+
+    def css(self, node, selector: str) -> list:
+        return node.select(selector)
+
+    def text(self, node) -> str:
+        return _clean(node.get_text())
+
+    def attr(self, node, name: str) -> Optional[str]:
+        value = node.get(name)
+        return ' '.join(value) if isinstance(value, list) else value
+
+    def walk(self, root):
+        for el in root.descendants:
+            if isinstance(el, self._tag):
+                yield el, id(el), id(el.parent), el.name, el.attrs
+
+
+_BACKEND_CLASSES = {
+    'selectolax': _SelectolaxBackend,
+    'lxml': _LxmlBackend,
+    'bs4': _Bs4Backend,
+}
+_backends: Dict[str, Any] = {}
+
+
+def get_backend(name: Optional[str] = None):
+    """Backend instance by name (default HTML_PARSER), falling back down BACKENDS if not installed"""
+    name = (name or HTML_PARSER).lower()
+    if name not in _BACKEND_CLASSES:
+        raise ValueError(f"Unknown HTML parser '{name}' (choose from {', '.join(BACKENDS)})")
+    if name not in _backends:
+        for candidate in BACKENDS[BACKENDS.index(name):]:
+            try:
+                _backends[name] = _BACKEND_CLASSES[candidate]()
+                break
+            except ImportError:
+                continue
+        else:
+            raise ImportError(f"No HTML parser available for '{name}'")
+    return _backends[name]
+
+
+class HtmlNode:
+    """Backend-neutral element handle"""
+    __slots__ = ('backend', 'node')
+
+    def __init__(self, backend, node):
+        self.backend = backend
+        self.node = node
+
+    def css(self, selector: str) -> List['HtmlNode']:
+        return [HtmlNode(self.backend, n) for n in self.backend.css(self.node, selector)]
+
+    def css_first(self, selector: str) -> Optional['HtmlNode']:
+        found = self.backend.css(self.node, selector)
+        return HtmlNode(self.backend, found[0]) if found else None
+
+    def get(self, name: str, default: Optional[str] = None) -> Optional[str]:
+        value = self.backend.attr(self.node, name)
+        return value if value is not None else default
+
+    def text(self) -> str:
+        return self.backend.text(self.node)
+
+
+def parse_html(html: str, backend: Optional[str] = None) -> HtmlNode:
+    """Parse a page with the configured (or named) backend"""
+    impl = get_backend(backend)
+    return HtmlNode(impl, impl.parse(html))
+
+
+# ---- Single-pass article extraction ----------------------------------------
+
+# Ancestor context flags
+_ARTICLE = 1      # inside <article>
+_CONTENT = 2      # inside .content
+_IMG_SCOPE = 4    # inside article / .article-body / .story-body
+_FALLBACK = 8     # inside the first main / article / .content / .post
+
+# Body selectors in priority order (same order as the old select() loop)
+BODY_SELECTORS = [
+    'article .story-text',
+    'article .entry-content',
+    '.article-body',
+    '.story-body',
+    '.post-content',
+    '.article__body',
+    'article p',
+    '.content p',
+]
+_BODY_CLASSES = {
+    'article-body': 2, 'story-body': 3, 'post-content': 4, 'article__body': 5,
+}
+_FALLBACK_CLASSES = {'content', 'post'}
+
+# title: h1, og:title, .headline, .entry-title
+# date:  article:published_time, time[datetime], .publish-date, .date
+# author: meta author, .author, .byline, [rel=author]
+_FIELD_SLOTS = {'title': 4, 'date': 4, 'author': 4}
+
+MIN_PARAGRAPH_CHARS = 30
+MIN_BODY_CHARS = 200
+MIN_CONTENT_CHARS = 100
+MAX_IMAGES = 5
+MAX_BODY_IMAGES = 3
+
+
+def _classes(attrs: Dict[str, Any]) -> set:
+    value = attrs.get('class')
+    if not value:
+        return set()
+    return set(value if isinstance(value, list) else value.split())
+
+
+def extract_article(doc: HtmlNode, url: str) -> Optional[Dict[str, Any]]:
+    """
+    Title, body, images, publish date, author and the page's declared
+    canonical URL (rel=canonical / og:url) in one walk over the tree. Returns None if there is no title or the body
+    is under MIN_CONTENT_CHARS.
+    """
+    backend = doc.backend
+    first = {field: [None] * slots for field, slots in _FIELD_SLOTS.items()}
+    body: List[list] = [[] for _ in BODY_SELECTORS]
+    fallback: list = []
+    og_image = None
+    canonical = None
+    body_images: List[str] = []
+    fallback_seen = False
+
+    # (key, flags, node) - holding the node keeps lxml proxies (and their id()) alive
+    stack: List[Tuple[Any, int, Any]] = []
+    for node, key, parent_key, tag, attrs in backend.walk(doc.node):
+        while stack and stack[-1][0] != parent_key:
+            stack.pop()
+        flags = stack[-1][1] if stack else 0
+        classes = _classes(attrs)
+        own = 0
+
+        if tag == 'meta':
+            prop = attrs.get('property')
+            if prop == 'og:title' and first['title'][1] is None:
+                first['title'][1] = attrs.get('content') or ''
+            elif prop == 'og:image' and og_image is None:
+                og_image = attrs.get('content') or ''
+            elif prop == 'og:url' and canonical is None:
+                canonical = attrs.get('content') or None
+            elif prop == 'article:published_time' and first['date'][0] is None:
+                first['date'][0] = attrs.get('content') or ''
+            elif attrs.get('name') == 'author' and first['author'][0] is None:
+                first['author'][0] = attrs.get('content') or ''
+        elif tag == 'h1':
+            if first['title'][0] is None:
+                first['title'][0] = node
+        elif tag == 'time':
+            if attrs.get('datetime') is not None and first['date'][1] is None:
+                first['date'][1] = attrs.get('datetime') or node
+        elif tag == 'p':
+            if flags & _ARTICLE:
+                body[6].append(node)
+            if flags & _CONTENT:
+                body[7].append(node)
+            if flags & _FALLBACK:
+                fallback.append(node)
+        elif tag == 'img':
+            if flags & _IMG_SCOPE and len(body_images) < MAX_BODY_IMAGES:
+                src = attrs.get('src') or attrs.get('data-src')
+                if src:
+                    body_images.append(src)
+        elif tag == 'article':
+            own |= _ARTICLE | _IMG_SCOPE
+
+        if classes:
+            if 'headline' in classes and first['title'][2] is None:
+                first['title'][2] = node
+            if 'entry-title' in classes and first['title'][3] is None:
+                first['title'][3] = node
+            if 'publish-date' in classes and first['date'][2] is None:
+                first['date'][2] = node
+            if 'date' in classes and first['date'][3] is None:
+                first['date'][3] = node
+            if 'author' in classes and first['author'][1] is None:
+                first['author'][1] = node
+            if 'byline' in classes and first['author'][2] is None:
+                first['author'][2] = node
+            if flags & _ARTICLE:
+                if 'story-text' in classes:
+                    body[0].append(node)
+                if 'entry-content' in classes:
+                    body[1].append(node)
+            for cls in classes & _BODY_CLASSES.keys():
+                body[_BODY_CLASSES[cls]].append(node)
+            if 'content' in classes:
+                own |= _CONTENT
+            if 'article-body' in classes or 'story-body' in classes:
+                own |= _IMG_SCOPE
+        rel = attrs.get('rel')
+        if rel:
+            rels = rel if isinstance(rel, list) else rel.split()
+            if first['author'][3] is None and 'author' in rels:
+                first['author'][3] = node
+            # <link rel=canonical> wins over og:url
+            if tag == 'link' and 'canonical' in rels and attrs.get('href'):
+                canonical = attrs.get('href')
+
+        if not fallback_seen and (tag in ('main', 'article') or classes & _FALLBACK_CLASSES):
+            fallback_seen = True
+            own |= _FALLBACK
+
+        stack.append((key, flags | own, node))
+
+    def value(candidate) -> str:
+        if candidate is None:
+            return ''
+        if isinstance(candidate, str):
+            return candidate.strip()
+        return (backend.attr(candidate, 'content') or '').strip() or backend.text(candidate)
+
+    def first_value(field: str) -> str:
+        for candidate in first[field]:
+            text = value(candidate)
+            if text:
+                return text
+        return ''
+
+    title = first_value('title')
+    if not title:
+        return None
+
+    def join(nodes: list) -> str:
+        texts = (backend.text(n) for n in nodes)
+        return '\n\n'.join(t for t in texts if len(t) > MIN_PARAGRAPH_CHARS)
+
+    content = ''
+    for nodes in body:
+        if nodes:
+            content = join(nodes)
+            if len(content) > MIN_BODY_CHARS:
+                break
+    if len(content) < MIN_CONTENT_CHARS and fallback_seen:
+        content = join(fallback)
+    if len(content) < MIN_CONTENT_CHARS:
+        return None
+
+    images = [og_image] if og_image else []
+    for src in body_images:
+        if not src.startswith('http'):
+            src = urljoin(url, src)
+        if src not in images:
+            images.append(src)
+
+    return {
+        'title': title,
+        'content': content,
+        'images': images[:MAX_IMAGES],
+        'author': first_value('author'),
+        'publish_date': first_value('date') or None,
+        'canonical': urljoin(url, canonical) if canonical else None,
+    }
+
+
+def page_text_and_links(doc: HtmlNode) -> Tuple[str, List[str]]:
+    """All visible-ish text plus every <a href>, in one walk"""
+    backend = doc.backend
+    links = []
+    for _, _, _, tag, attrs in backend.walk(doc.node):
+        if tag == 'a':
+            href = attrs.get('href')
+            if href:
+                links.append(href if isinstance(href, str) else ' '.join(href))
+    return backend.text(doc.node), links
@@ -0,0 +1,286 @@
+"""
+On-disk HTTP cache with conditional revalidation
+Shared by the crawl scheduler (news searches + articles, robots.txt) and
+the facility email scraper, so repeat runs don't re-download unchanged pages
+
+- Bodies are zlib-compressed files under HTTP_CACHE_DIR, indexed in SQLite;
+  total size is capped at HTTP_CACHE_MAX_MB with LRU eviction
+- Within its TTL an entry is served without touching the network
+- After that it's revalidated with If-None-Match / If-Modified-Since; a 304
+  refreshes the entry and serves the cached body
+- TTLs come from the first matching URL pattern (HTTP_CACHE_TTLS entries
+  first, then DEFAULT_TTLS); responses marked Cache-Control: no-store are
+  never stored
+
+Cached responses are ordinary requests.Response objects with
+resp.from_cache = True.
+"""
+import os
+import re
+import json
+import time
+import zlib
+import sqlite3
+import hashlib
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+import requests
+from requests.structures import CaseInsensitiveDict
+from dotenv import load_dotenv
+
+load_dotenv(override=True)
+
+HTTP_CACHE_ENABLED = os.getenv('HTTP_CACHE_ENABLED', 'true').lower() not in ('0', 'false', 'no')
+HTTP_CACHE_DIR = Path(os.getenv(
+    'HTTP_CACHE_DIR',
+    str(Path(__file__).parent.parent / 'cache' / 'http')
+))
+HTTP_CACHE_MAX_BYTES = int(float(os.getenv('HTTP_CACHE_MAX_MB', '512')) * 1024 * 1024)
+
+# (pattern, seconds fresh) - first match wins; 0 = always revalidate
+DEFAULT_TTLS: List[Tuple[str, int]] = [
+    (r'/robots\.txt$', 24 * 3600),
+    (r'duckduckgo\.com/html', 6 * 3600),
+    (r'[?&](s|q|query)=', 6 * 3600),          # Site search result pages
+    (r'/(search|tag|category)/', 6 * 3600),
+    (r'(sitemap[^/]*\.xml|/feeds?(/|$)|\.rss$|/rss|/atom)', 30 * 60),
+]
+DEFAULT_TTL = int(os.getenv('HTTP_CACHE_DEFAULT_TTL', str(7 * 24 * 3600)))
+
+# Response headers worth keeping with the body
+KEEP_HEADERS = ('Content-Type', 'ETag', 'Last-Modified', 'Content-Language')
+
+
+def parse_ttls(spec: str) -> List[Tuple[str, int]]:
+    """'regex=seconds;regex=seconds' -> [(regex, seconds)]"""
+    rules = []
+    for part in filter(None, (p.strip() for p in spec.split(';'))):
+        pattern, _, seconds = part.rpartition('=')
+        if pattern:
+            rules.append((pattern, int(seconds)))
+    return rules
+
+
+HTTP_CACHE_TTLS = parse_ttls(os.getenv('HTTP_CACHE_TTLS', '')) + DEFAULT_TTLS
+
+
+class HttpCache:
+    """Compressed, size-bounded, LRU HTTP response cache with ETag/Last-Modified revalidation"""
+
+    def __init__(
+        self,
+        directory: Path = HTTP_CACHE_DIR,
+        max_bytes: int = HTTP_CACHE_MAX_BYTES,
+        ttls: List[Tuple[str, int]] = HTTP_CACHE_TTLS,
+        default_ttl: int = DEFAULT_TTL
+    ):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.ttls = [(re.compile(pattern), seconds) for pattern, seconds in ttls]
+        self.default_ttl = default_ttl
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.directory / 'index.db'), check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('''
+            CREATE TABLE IF NOT EXISTS responses (
+                url TEXT PRIMARY KEY,
+                final_url TEXT NOT NULL,
+                headers TEXT NOT NULL,
+                encoding TEXT,
+                size INTEGER NOT NULL,
+                raw_size INTEGER NOT NULL,
+                stored_at REAL NOT NULL,
+                last_used REAL NOT NULL,
+                hits INTEGER NOT NULL DEFAULT 0
+            )
+        ''')
+        self._conn.execute('CREATE INDEX IF NOT EXISTS idx_responses_last_used ON responses(last_used)')
+        self._conn.commit()
+
+        self.stats = {'fresh': 0, 'revalidated': 0, 'fetched': 0, 'uncacheable': 0, 'bytes_saved': 0}
+
+    def _count(self, key: str, n: int = 1):
+        with self._lock:
+            self.stats[key] += n
+
+    # ---- Entries ------------------------------------------------------------
+
+    def _path(self, url: str) -> Path:
+        digest = hashlib.sha256(url.encode('utf-8')).hexdigest()
+        return self.directory / digest[:2] / f"{digest}.z"
+
+    def ttl(self, url: str) -> int:
+        for pattern, seconds in self.ttls:
+            if pattern.search(url):
+                return seconds
+        return self.default_ttl
+
+    def _entry(self, url: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT final_url, headers, encoding, raw_size, stored_at FROM responses WHERE url = ?', (url,)
+            ).fetchone()
+        if row is None:
+            return None
+        return {'final_url': row[0], 'headers': json.loads(row[1]), 'encoding': row[2],
+                'raw_size': row[3], 'stored_at': row[4]}
+
+    def is_fresh(self, url: str) -> bool:
+        """Cached and within its TTL (served without a request)"""
+        entry = self._entry(url)
+        return entry is not None and time.time() - entry['stored_at'] < self.ttl(url)
+
+    def _load(self, url: str, entry: Dict[str, Any]) -> Optional[requests.Response]:
+        try:
+            body = zlib.decompress(self._path(url).read_bytes())
+        except (OSError, zlib.error):
+            self._delete(url)
+            return None
+        resp = requests.Response()
+        resp._content = body
+        resp.status_code = 200
+        resp.headers = CaseInsensitiveDict(entry['headers'])
+        resp.encoding = entry['encoding']
+        resp.url = entry['final_url']
+        resp.from_cache = True
+        with self._lock:
+            self._conn.execute(
+                'UPDATE responses SET last_used = ?, hits = hits + 1 WHERE url = ?', (time.time(), url)
+            )
+            self._conn.commit()
+            self.stats['bytes_saved'] += len(body)
+        return resp
+
+    def _store(self, url: str, resp: requests.Response):
+        if 'no-store' in resp.headers.get('Cache-Control', '').lower():
+            self._count('uncacheable')
+            return
+        body = resp.content
+        data = zlib.compress(body, 6)
+        path = self._path(url)
+        path.parent.mkdir(exist_ok=True)
+        tmp = path.with_suffix(f".{threading.get_ident()}.tmp")
+        tmp.write_bytes(data)
+        os.replace(tmp, path)
+
+        headers = {k: resp.headers[k] for k in KEEP_HEADERS if k in resp.headers}
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO responses '
+                '(url, final_url, headers, encoding, size, raw_size, stored_at, last_used, hits) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?, ?, 0)',
+                (url, resp.url or url, json.dumps(headers), resp.encoding, len(data), len(body), now, now)
+            )
+            self._evict()
+            self._conn.commit()
+
+    def _touch(self, url: str, resp: requests.Response):
+        """304: entry is still good - restart its TTL, pick up new validators"""
+        with self._lock:
+            row = self._conn.execute('SELECT headers FROM responses WHERE url = ?', (url,)).fetchone()
+            headers = json.loads(row[0]) if row else {}
+            for k in ('ETag', 'Last-Modified'):
+                if k in resp.headers:
+                    headers[k] = resp.headers[k]
+            self._conn.execute(
+                'UPDATE responses SET stored_at = ?, headers = ? WHERE url = ?',
+                (time.time(), json.dumps(headers), url)
+            )
+            self._conn.commit()
+
+    def _delete(self, url: str):
+        with self._lock:
+            self._conn.execute('DELETE FROM responses WHERE url = ?', (url,))
+            self._conn.commit()
+        self._path(url).unlink(missing_ok=True)
+
+    def _evict(self):
+        """Drop least-recently-used bodies until under max_bytes (caller holds lock)"""
+        total = self._conn.execute('SELECT COALESCE(SUM(size), 0) FROM responses').fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        victims = []
+        for url, size in self._conn.execute('SELECT url, size FROM responses ORDER BY last_used ASC'):
+            if total <= self.max_bytes * 0.9:  # Evict a little extra so we don't evict on every store
+                break
+            victims.append(url)
+            total -= size
+        self._conn.executemany('DELETE FROM responses WHERE url = ?', [(u,) for u in victims])
+        for url in victims:
+            self._path(url).unlink(missing_ok=True)
+
+    # ---- Fetching -----------------------------------------------------------
+
+    def get(self, session: requests.Session, url: str, **kwargs) -> requests.Response:
+        """
+        session.get(url, **kwargs) through the cache: fresh entries skip the
+        network, stale ones are revalidated, 200s are stored
+        """
+        entry = self._entry(url)
+        if entry and time.time() - entry['stored_at'] < self.ttl(url):
+            resp = self._load(url, entry)
+            if resp is not None:
+                self._count('fresh')
+                return resp
+            entry = None
+
+        headers = dict(kwargs.pop('headers', None) or {})
+        if entry:
+            if 'ETag' in entry['headers']:
+                headers['If-None-Match'] = entry['headers']['ETag']
+            if 'Last-Modified' in entry['headers']:
+                headers['If-Modified-Since'] = entry['headers']['Last-Modified']
+
+        resp = session.get(url, headers=headers or None, **kwargs)
+
+        if resp.status_code == 304 and entry:
+            self._touch(url, resp)
+            cached = self._load(url, entry)
+            if cached is not None:
+                self._count('revalidated')
+                return cached
+            # Body went missing - fetch it again unconditionally
+            resp = session.get(url, **kwargs)
+
+        resp.from_cache = False
+        self._count('fetched')
+        if resp.status_code == 200:
+            self._store(url, resp)
+        return resp
+
+    def clear(self):
+        """Remove all cached responses"""
+        with self._lock:
+            urls = [row[0] for row in self._conn.execute('SELECT url FROM responses')]
+            self._conn.execute('DELETE FROM responses')
+            self._conn.commit()
+        for url in urls:
+            self._path(url).unlink(missing_ok=True)
+
+    def summary(self) -> str:
+        s = self.stats
+        with self._lock:
+            entries, size, raw = self._conn.execute(
+                'SELECT COUNT(*), COALESCE(SUM(size), 0), COALESCE(SUM(raw_size), 0) FROM responses'
+            ).fetchone()
+        return (f"{s['fresh']} fresh hits, {s['revalidated']} revalidated (304), {s['fetched']} downloaded; "
+                f"{s['bytes_saved'] / 1024 / 1024:.1f} MB not re-downloaded; "
+                f"{entries} entries, {size / 1024 / 1024:.1f} MB on disk "
+                f"({raw / 1024 / 1024:.1f} MB uncompressed, max {self.max_bytes / 1024 / 1024:.0f} MB)")
+
+
+# Singleton instance
+_http_cache = None
+
+def get_http_cache() -> Optional[HttpCache]:
+    """Shared cache instance, or None when disabled via HTTP_CACHE_ENABLED=false"""
+    global _http_cache
+    if not HTTP_CACHE_ENABLED:
+        return None
+    if _http_cache is None:
+        _http_cache = HttpCache()
+    return _http_cache
@@ -0,0 +1,178 @@
+"""
+Local metrics sink for Claude API calls
+Records model, tokens, latency and outcome per call + stored stories per source
+
+Feeds scripts/llm_report.py (throughput and cost per stored story by source)
+"""
+import os
+import time
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from dotenv import load_dotenv
+
+load_dotenv(override=True)
+
+METRICS_ENABLED = os.getenv('LLM_METRICS_ENABLED', 'true').lower() not in ('0', 'false', 'no')
+METRICS_PATH = os.getenv(
+    'LLM_METRICS_PATH',
+    str(Path(__file__).parent.parent / 'cache' / 'llm_metrics.db')
+)
+
+# USD per million tokens (input, output)
+MODEL_PRICING = {
+    'claude-3-5-haiku-20241022': (0.80, 4.00),
+    'claude-haiku-4-5': (1.00, 5.00),
+    'claude-sonnet-4-20250514': (3.00, 15.00),
+    'claude-sonnet-4-5': (3.00, 15.00),
+    'claude-opus-4-20250514': (15.00, 75.00),
+}
+DEFAULT_PRICING = (3.00, 15.00)
+
+
+def estimate_cost(model: str, input_tokens: int, output_tokens: int) -> float:
+    """Estimated USD cost of one call"""
+    price_in, price_out = MODEL_PRICING.get(model, DEFAULT_PRICING)
+    return (input_tokens * price_in + output_tokens * price_out) / 1_000_000
+
+
+class MetricsSink:
+    """Append-only SQLite log of LLM calls and stored stories"""
+
+    def __init__(self, path: str = METRICS_PATH):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('''
+            CREATE TABLE IF NOT EXISTS llm_calls (
+                ts REAL NOT NULL,
+                task TEXT NOT NULL,
+                model TEXT NOT NULL,
+                source TEXT NOT NULL,
+                input_tokens INTEGER NOT NULL,
+                output_tokens INTEGER NOT NULL,
+                latency_ms REAL NOT NULL,
+                outcome TEXT,
+                cost_usd REAL NOT NULL
+            )
+        ''')
+        self._conn.execute('''
+            CREATE TABLE IF NOT EXISTS stored_stories (
+                ts REAL NOT NULL,
+                source TEXT NOT NULL
+            )
+        ''')
+        self._conn.execute('CREATE INDEX IF NOT EXISTS idx_llm_calls_ts ON llm_calls(ts)')
+        self._conn.commit()
+
+    def record_call(
+        self,
+        task: str,
+        model: str,
+        source: str,
+        input_tokens: int,
+        output_tokens: int,
+        latency_ms: float,
+        outcome: Optional[str] = None
+    ):
+        """Record a single API call"""
+        cost = estimate_cost(model, input_tokens, output_tokens)
+        with self._lock:
+            self._conn.execute(
+                'INSERT INTO llm_calls VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                (time.time(), task, model, source or 'unknown', input_tokens,
+                 output_tokens, latency_ms, outcome, cost)
+            )
+            self._conn.commit()
+
+    def record_story_stored(self, source: str):
+        """Record that a story from this source made it into the database"""
+        with self._lock:
+            self._conn.execute(
+                'INSERT INTO stored_stories VALUES (?, ?)',
+                (time.time(), source or 'unknown')
+            )
+            self._conn.commit()
+
+    def query(self, sql: str, params: tuple = ()) -> List[tuple]:
+        """Run a read-only query (used by the report script)"""
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    def report(self, since: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Throughput and cost per stored story, broken down by source
+
+        Args:
+            since: Unix timestamp - only include calls/stories after this time
+        """
+        since = since or 0
+        by_source = {}
+
+        rows = self.query('''
+            SELECT source, COUNT(*), SUM(input_tokens), SUM(output_tokens),
+                   SUM(cost_usd), AVG(latency_ms), MIN(ts), MAX(ts)
+            FROM llm_calls WHERE ts >= ? GROUP BY source
+        ''', (since,))
+        for source, calls, tok_in, tok_out, cost, avg_latency, first_ts, last_ts in rows:
+            span_min = max((last_ts - first_ts) / 60, 1 / 60)
+            by_source[source] = {
+                'calls': calls,
+                'input_tokens': tok_in or 0,
+                'output_tokens': tok_out or 0,
+                'cost_usd': round(cost or 0, 4),
+                'avg_latency_ms': round(avg_latency or 0, 1),
+                'calls_per_min': round(calls / span_min, 2),
+                'stories_stored': 0,
+            }
+
+        for source, stored in self.query(
+            'SELECT source, COUNT(*) FROM stored_stories WHERE ts >= ? GROUP BY source', (since,)
+        ):
+            entry = by_source.setdefault(source, {'calls': 0, 'cost_usd': 0.0})
+            entry['stories_stored'] = stored
+
+        for entry in by_source.values():
+            stored = entry.get('stories_stored', 0)
+            entry['cost_per_story_usd'] = round(entry['cost_usd'] / stored, 4) if stored else None
+
+        by_model = {}
+        for task, model, calls, cost, avg_latency in self.query('''
+            SELECT task, model, COUNT(*), SUM(cost_usd), AVG(latency_ms)
+            FROM llm_calls WHERE ts >= ? GROUP BY task, model
+        ''', (since,)):
+            by_model[f"{task}:{model}"] = {
+                'calls': calls,
+                'cost_usd': round(cost or 0, 4),
+                'avg_latency_ms': round(avg_latency or 0, 1),
+            }
+
+        outcomes = {
+            f"{task}:{outcome}": count
+            for task, outcome, count in self.query(
+                'SELECT task, outcome, COUNT(*) FROM llm_calls WHERE ts >= ? GROUP BY task, outcome',
+                (since,)
+            )
+        }
+
+        return {
+            'by_source': by_source,
+            'by_task_model': by_model,
+            'outcomes': outcomes,
+        }
+
+
+# Singleton instance
+_metrics_sink = None
+
+def get_metrics() -> Optional[MetricsSink]:
+    """Shared metrics sink, or None when disabled via LLM_METRICS_ENABLED=false"""
+    global _metrics_sink
+    if not METRICS_ENABLED:
+        return None
+    if _metrics_sink is None:
+        _metrics_sink = MetricsSink()
+    return _metrics_sink
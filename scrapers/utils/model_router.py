@@ -0,0 +1,107 @@
+"""
+Tiered model router for Claude calls
+Cheap/fast model for ACCEPT/REJECT triage, larger model for extraction
+and for escalating borderline REVIEW_NEEDED decisions
+
+Every call is timed and logged to the local metrics sink (utils/llm_metrics.py)
+"""
+import os
+import time
+from dataclasses import dataclass
+from dotenv import load_dotenv
+
+from .llm_metrics import get_metrics
+
+load_dotenv(override=True)
+
+# Model tiers (override in .env)
+TRIAGE_MODEL = os.getenv('CLAUDE_TRIAGE_MODEL', 'claude-3-5-haiku-20241022')
+EXTRACTION_MODEL = os.getenv('CLAUDE_EXTRACTION_MODEL', 'claude-sonnet-4-20250514')
+ESCALATE_REVIEW = os.getenv('CLAUDE_ESCALATE_REVIEW', 'true').lower() not in ('0', 'false', 'no')
+
+
+@dataclass
+class LLMCall:
+    """Result + telemetry for one Claude call"""
+    task: str
+    model: str
+    source: str
+    text: str
+    input_tokens: int
+    output_tokens: int
+    latency_ms: float
+
+
+class ModelRouter:
+    """Routes each task to a model tier and records per-call telemetry"""
+
+    def __init__(
+        self,
+        client,
+        triage_model: str = TRIAGE_MODEL,
+        extraction_model: str = EXTRACTION_MODEL,
+        escalate_review: bool = ESCALATE_REVIEW
+    ):
+        self.client = client
+        self.triage_model = triage_model
+        self.extraction_model = extraction_model
+        self.escalate_review = escalate_review
+        self.models = {
+            'relevance': triage_model,
+            'relevance_escalation': extraction_model,
+            'extraction': extraction_model,
+        }
+
+    def model_for(self, task: str) -> str:
+        """Model used for a task ('relevance', 'relevance_escalation', 'extraction')"""
+        return self.models.get(task, self.extraction_model)
+
+    def complete(
+        self,
+        task: str,
+        prompt: str,
+        max_tokens: int,
+        source: str = 'unknown'
+    ) -> LLMCall:
+        """
+        Send a single-turn prompt to the model for this task
+
+        API errors are recorded with outcome 'error' and re-raised.
+        Call record() with the parsed outcome once the caller knows it.
+        """
+        model = self.model_for(task)
+        start = time.perf_counter()
+        try:
+            response = self.client.messages.create(
+                model=model,
+                max_tokens=max_tokens,
+                messages=[{"role": "user", "content": prompt}]
+            )
+        except Exception:
+            latency_ms = (time.perf_counter() - start) * 1000
+            metrics = get_metrics()
+            if metrics:
+                metrics.record_call(task, model, source, 0, 0, latency_ms, 'error')
+            raise
+
+        latency_ms = (time.perf_counter() - start) * 1000
+        usage = getattr(response, 'usage', None)
+
+        return LLMCall(
+            task=task,
+            model=model,
+            source=source,
+            text=response.content[0].text,
+            input_tokens=getattr(usage, 'input_tokens', 0) or 0,
+            output_tokens=getattr(usage, 'output_tokens', 0) or 0,
+            latency_ms=latency_ms,
+        )
+
+    def record(self, call: LLMCall, outcome: str):
+        """Log a completed call with its outcome (decision, 'ok', 'parse_error', ...)"""
+        metrics = get_metrics()
+        if metrics:
+            metrics.record_call(
+                call.task, call.model, call.source,
+                call.input_tokens, call.output_tokens, call.latency_ms, outcome
+            )
@@ -0,0 +1,263 @@
+"""
+Near-duplicate detection for scraped content (MinHash + LSH)
+Catches the same story arriving as different items - syndicated articles
+(KFF pieces republished by NPR/CNN), Reddit crossposts, tweets quoting an
+article - before any of them reach the LLM
+
+- Signature: 128-permutation MinHash over word 5-gram shingles of the
+  normalized text (same normalization as the extraction cache)
+- Index: 16 LSH bands x 8 rows persisted in SQLite, so duplicates are
+  caught across runs and scrapers; band collisions are confirmed by
+  estimated Jaccard similarity >= NEAR_DUP_THRESHOLD
+- Items are indexed once the LLM has extracted or rejected them (accepted
+  or not), so a variant of already-rejected content is also skipped; items
+  whose extraction or insert failed are left out (or forgotten again) so a
+  later copy can still get through
+- Suppressed duplicates are logged with their source for
+  scripts/near_dup_report.py
+
+Content shorter than NEAR_DUP_MIN_WORDS (most tweets) isn't checked -
+too few shingles for a reliable estimate.
+"""
+import os
+import re
+import time
+import sqlite3
+import hashlib
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+import numpy as np
+from dotenv import load_dotenv
+
+from .extraction_cache import normalize_content
+
+load_dotenv(override=True)
+
+NEAR_DUP_ENABLED = os.getenv('NEAR_DUP_ENABLED', 'true').lower() not in ('0', 'false', 'no')
+NEAR_DUP_PATH = os.getenv(
+    'NEAR_DUP_PATH',
+    str(Path(__file__).parent.parent / 'cache' / 'near_dup.db')
+)
+NEAR_DUP_THRESHOLD = float(os.getenv('NEAR_DUP_THRESHOLD', '0.7'))
+NEAR_DUP_MIN_WORDS = int(os.getenv('NEAR_DUP_MIN_WORDS', '40'))
+
+SHINGLE_WORDS = 5
+NUM_PERM = 128
+BANDS = 16
+ROWS = NUM_PERM // BANDS  # Band-collision threshold ~ (1/16)^(1/8) = 0.71
+
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64((1 << 32) - 1)
+_WORD_RE = re.compile(r'[a-z0-9$]+')
+
+# Fixed seed: signatures must be comparable across runs
+_rng = np.random.RandomState(1)
+_PERM_A = _rng.randint(1, (1 << 61) - 1, size=NUM_PERM, dtype=np.uint64)
+_PERM_B = _rng.randint(0, (1 << 61) - 1, size=NUM_PERM, dtype=np.uint64)
+
+
+def shingles(content: str, k: int = SHINGLE_WORDS) -> List[str]:
+    words = _WORD_RE.findall(normalize_content(content))
+    if len(words) < k:
+        return [' '.join(words)] if words else []
+    return [' '.join(words[i:i + k]) for i in range(len(words) - k + 1)]
+
+
+def minhash(content: str) -> Optional[np.ndarray]:
+    """NUM_PERM-value MinHash signature (uint32), or None for empty content"""
+    grams = set(shingles(content))
+    if not grams:
+        return None
+    hv = np.fromiter(
+        (int.from_bytes(hashlib.blake2b(g.encode('utf-8'), digest_size=4).digest(), 'little') for g in grams),
+        dtype=np.uint64, count=len(grams)
+    )
+    # (a * x + b) mod p per permutation, min over shingles (uint64 wraparound is intended)
+    with np.errstate(over='ignore'):
+        phv = np.bitwise_and((np.outer(hv, _PERM_A) + _PERM_B) % _MERSENNE_PRIME, _MAX_HASH)
+    return phv.min(axis=0).astype(np.uint32)
+
+
+def similarity(a: np.ndarray, b: np.ndarray) -> float:
+    """Estimated Jaccard similarity of two signatures"""
+    return float(np.mean(a == b))
+
+
+def _band_keys(signature: np.ndarray) -> List[int]:
+    keys = []
+    for band in range(BANDS):
+        chunk = signature[band * ROWS:(band + 1) * ROWS].tobytes()
+        keys.append(int.from_bytes(hashlib.blake2b(chunk, digest_size=8).digest(), 'little', signed=True))
+    return keys
+
+
+class NearDupIndex:
+    """Persistent MinHash LSH index with per-source suppression stats"""
+
+    def __init__(self, path: str = NEAR_DUP_PATH, threshold: float = NEAR_DUP_THRESHOLD,
+                 min_words: int = NEAR_DUP_MIN_WORDS):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.threshold = threshold
+        self.min_words = min_words
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.executescript('''
+            CREATE TABLE IF NOT EXISTS docs (
+                id INTEGER PRIMARY KEY,
+                source TEXT NOT NULL,
+                url TEXT,
+                signature BLOB NOT NULL,
+                created_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_docs_url ON docs(url);
+            CREATE TABLE IF NOT EXISTS bands (
+                band INTEGER NOT NULL,
+                key INTEGER NOT NULL,
+                doc_id INTEGER NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_bands_key ON bands(band, key);
+            CREATE TABLE IF NOT EXISTS duplicates (
+                source TEXT NOT NULL,
+                url TEXT,
+                original_id INTEGER NOT NULL,
+                similarity REAL NOT NULL,
+                created_at REAL NOT NULL
+            );
+        ''')
+        self._conn.commit()
+
+        # Per-process counters, by source
+        self._stats: Dict[str, Dict[str, int]] = {}
+
+    def _count(self, source: str, field: str):
+        self._stats.setdefault(source, {'checked': 0, 'suppressed': 0, 'skipped_short': 0})[field] += 1
+
+    def _signature(self, content: str) -> Optional[np.ndarray]:
+        """MinHash of content, or None if it's too short to compare reliably"""
+        if len(_WORD_RE.findall(normalize_content(content))) < self.min_words:
+            return None
+        return minhash(content)
+
+    def check(self, content: str, source: str, url: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """
+        Return the earlier item this content near-duplicates ({source, url,
+        similarity}) and log the suppression, else None. Doesn't index the
+        content - call add() once it has been extracted or rejected.
+        The same URL seen again (replays, retries) is never its own duplicate.
+        """
+        signature = self._signature(content)
+        if signature is None:
+            self._count(source, 'skipped_short')
+            return None
+        keys = _band_keys(signature)
+
+        with self._lock:
+            self._count(source, 'checked')
+            if url and self._conn.execute('SELECT 1 FROM docs WHERE url = ?', (url,)).fetchone():
+                return None
+
+            candidates = {
+                row[0] for band, key in enumerate(keys)
+                for row in self._conn.execute('SELECT doc_id FROM bands WHERE band = ? AND key = ?', (band, key))
+            }
+            best = None
+            for doc_id in candidates:
+                doc_source, doc_url, blob = self._conn.execute(
+                    'SELECT source, url, signature FROM docs WHERE id = ?', (doc_id,)
+                ).fetchone()
+                score = similarity(signature, np.frombuffer(blob, dtype=np.uint32))
+                if score >= self.threshold and (best is None or score > best['similarity']):
+                    best = {'id': doc_id, 'source': doc_source, 'url': doc_url, 'similarity': round(score, 3)}
+
+            if best:
+                self._conn.execute(
+                    'INSERT INTO duplicates (source, url, original_id, similarity, created_at) VALUES (?, ?, ?, ?, ?)',
+                    (source, url, best['id'], best['similarity'], time.time())
+                )
+                self._conn.commit()
+                self._count(source, 'suppressed')
+        return best
+
+    def add(self, content: str, source: str, url: Optional[str] = None):
+        """Index content so later near-duplicates of it are suppressed"""
+        signature = self._signature(content)
+        if signature is None:
+            return
+        keys = _band_keys(signature)
+
+        with self._lock:
+            if url and self._conn.execute('SELECT 1 FROM docs WHERE url = ?', (url,)).fetchone():
+                return
+            cur = self._conn.execute(
+                'INSERT INTO docs (source, url, signature, created_at) VALUES (?, ?, ?, ?)',
+                (source, url, signature.tobytes(), time.time())
+            )
+            self._conn.executemany(
+                'INSERT INTO bands (band, key, doc_id) VALUES (?, ?, ?)',
+                [(band, key, cur.lastrowid) for band, key in enumerate(keys)]
+            )
+            self._conn.commit()
+
+    def forget(self, *urls: str):
+        """Drop indexed items by URL (their story never made it into the table)"""
+        urls = [u for u in urls if u]
+        if not urls:
+            return
+        marks = ','.join('?' * len(urls))
+        with self._lock:
+            ids = [row[0] for row in self._conn.execute(f'SELECT id FROM docs WHERE url IN ({marks})', urls)]
+            if not ids:
+                return
+            id_marks = ','.join('?' * len(ids))
+            self._conn.execute(f'DELETE FROM bands WHERE doc_id IN ({id_marks})', ids)
+            self._conn.execute(f'DELETE FROM duplicates WHERE original_id IN ({id_marks})', ids)
+            self._conn.execute(f'DELETE FROM docs WHERE id IN ({id_marks})', ids)
+            self._conn.commit()
+
+    def report(self, since: Optional[float] = None) -> List[Dict[str, Any]]:
+        """Suppressed duplicates per source (and which source had the original)"""
+        query = '''
+            SELECT d.source, o.source, COUNT(*), AVG(d.similarity)
+            FROM duplicates d JOIN docs o ON o.id = d.original_id
+        '''
+        params: List[Any] = []
+        if since:
+            query += ' WHERE d.created_at >= ?'
+            params.append(since)
+        query += ' GROUP BY d.source, o.source ORDER BY COUNT(*) DESC'
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+            indexed = dict(self._conn.execute('SELECT source, COUNT(*) FROM docs GROUP BY source').fetchall())
+        return [
+            {'source': s, 'original_source': o, 'suppressed': n, 'avg_similarity': round(avg, 3),
+             'indexed': indexed.get(s, 0)}
+            for s, o, n, avg in rows
+        ]
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        return {source: dict(counts) for source, counts in self._stats.items()}
+
+    def print_stats(self):
+        """Print this run's suppression counts to console"""
+        print("\n🧬 Near-duplicate filter:")
+        if not self._stats:
+            print("  No items checked this run")
+        for source, counts in self._stats.items():
+            print(f"  {source}: {counts['suppressed']} suppressed / {counts['checked']} checked "
+                  f"({counts['skipped_short']} too short to check)")
+
+
+# Singleton instance
+_near_dup_index = None
+
+def get_near_dup_index() -> Optional[NearDupIndex]:
+    """Shared index, or None when disabled via NEAR_DUP_ENABLED=false"""
+    global _near_dup_index
+    if not NEAR_DUP_ENABLED:
+        return None
+    if _near_dup_index is None:
+        _near_dup_index = NearDupIndex()
+    return _near_dup_index
@@ -0,0 +1,342 @@
+"""
+Columnar analytics export
+Incrementally writes the stories table and the raw scrape archives to
+Parquet, partitioned Hive-style by source and month:
+
+    exports/stories/source=reddit/month=2026-01/part-<export id>.parquet
+    exports/raw/source=news/month=2026-02/part-<export id>.parquet
+
+Each export only writes what is new since the previous one (stories by
+created_at watermark, raw archives by lines already exported per file),
+tracked in exports/_export_state.json. scan() reads the result back with
+partition pruning for local analysis.
+"""
+import os
+import json
+import uuid
+import shutil
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+from dotenv import load_dotenv
+
+from .raw_archive import ARCHIVE_SOURCES, archive_files, default_archive_dir, read_archive
+
+load_dotenv(override=True)
+
+EXPORT_DIR = Path(os.getenv('PARQUET_EXPORT_DIR', str(Path(__file__).parent.parent / 'exports')))
+
+STATE_FILE = '_export_state.json'
+
+# Stories columns worth analysing (heavy text is reduced to lengths)
+STORY_COLUMNS = (
+    'id,created_at,updated_at,source_platform,is_scraped,status,story_type,title,summary,'
+    'procedure,procedure_type,country_abroad,location_country,location_us_state,facility_name,'
+    'cost_us,cost_abroad,savings_percent,issues,emotional_tags,viral_score,'
+    'insurance_involved,insurance_denied,source_url,subreddit,reddit_score,reddit_comments,'
+    'twitter_likes,twitter_retweets,twitter_username,gofundme_goal,gofundme_raised,'
+    'youtube_channel,youtube_views,youtube_duration,view_count,share_count,'
+    'images,video_url,content'
+)
+
+STORIES_SCHEMA = pa.schema([
+    ('id', pa.string()),
+    ('created_at', pa.timestamp('us', tz='UTC')),
+    ('updated_at', pa.timestamp('us', tz='UTC')),
+    ('is_scraped', pa.bool_()),
+    ('status', pa.string()),
+    ('story_type', pa.string()),
+    ('title', pa.string()),
+    ('summary', pa.string()),
+    ('procedure', pa.string()),
+    ('procedure_type', pa.string()),
+    ('country_abroad', pa.string()),
+    ('location_country', pa.string()),
+    ('location_us_state', pa.string()),
+    ('facility_name', pa.string()),
+    ('cost_us', pa.float64()),
+    ('cost_abroad', pa.float64()),
+    ('savings_percent', pa.float64()),
+    ('issues', pa.list_(pa.string())),
+    ('emotional_tags', pa.list_(pa.string())),
+    ('viral_score', pa.int64()),
+    ('insurance_involved', pa.bool_()),
+    ('insurance_denied', pa.bool_()),
+    ('source_url', pa.string()),
+    ('subreddit', pa.string()),
+    ('reddit_score', pa.int64()),
+    ('reddit_comments', pa.int64()),
+    ('twitter_likes', pa.int64()),
+    ('twitter_retweets', pa.int64()),
+    ('twitter_username', pa.string()),
+    ('gofundme_goal', pa.float64()),
+    ('gofundme_raised', pa.float64()),
+    ('youtube_channel', pa.string()),
+    ('youtube_views', pa.int64()),
+    ('youtube_duration', pa.int64()),
+    ('view_count', pa.int64()),
+    ('share_count', pa.int64()),
+    ('image_count', pa.int64()),
+    ('has_video', pa.bool_()),
+    ('content_length', pa.int64()),
+])
+
+# One shape for items from every scraper; the full record is kept as JSON
+RAW_SCHEMA = pa.schema([
+    ('item_id', pa.string()),
+    ('source_url', pa.string()),
+    ('title', pa.string()),
+    ('search_query', pa.string()),
+    ('subreddit', pa.string()),
+    ('author', pa.string()),
+    ('engagement', pa.int64()),      # reddit score / tweet likes / youtube views / gofundme raised
+    ('num_comments', pa.int64()),
+    ('image_count', pa.int64()),
+    ('has_video', pa.bool_()),
+    ('content_length', pa.int64()),
+    ('published_at', pa.string()),
+    ('archive_file', pa.string()),
+    ('archive_line', pa.int64()),
+    ('record_json', pa.string()),
+])
+
+PARTITION_SCHEMA = pa.schema([('source', pa.string()), ('month', pa.string())])
+
+
+def _load_state(export_dir: Path) -> Dict[str, Any]:
+    path = export_dir / STATE_FILE
+    if path.exists():
+        with open(path, 'r') as f:
+            return json.load(f)
+    return {'stories': {}, 'raw': {}}
+
+
+def _save_state(export_dir: Path, state: Dict[str, Any]):
+    path = export_dir / STATE_FILE
+    tmp = path.with_suffix('.tmp')
+    with open(tmp, 'w') as f:
+        json.dump(state, f, indent=2)
+    tmp.replace(path)
+
+
+def _timestamp(value: Optional[str]) -> Optional[datetime]:
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except ValueError:
+        return None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+def _int(value) -> Optional[int]:
+    try:
+        return int(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def _export_id() -> str:
+    """Unique, sortable part-file id (two exports in the same second must not collide)"""
+    return f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:8]}"
+
+
+def _write_partitions(
+    rows: List[Dict[str, Any]],
+    schema: pa.Schema,
+    export_dir: Path,
+    table: str,
+    export_id: str
+) -> int:
+    """Group rows by (source, month) and write one Parquet part per partition"""
+    groups: Dict[tuple, List[Dict[str, Any]]] = {}
+    for row in rows:
+        key = (row.pop('_source') or 'unknown', row.pop('_month') or 'unknown')
+        groups.setdefault(key, []).append(row)
+
+    for (source, month), group in groups.items():
+        part_dir = export_dir / table / f"source={source}" / f"month={month}"
+        part_dir.mkdir(parents=True, exist_ok=True)
+        pq.write_table(
+            pa.Table.from_pylist(group, schema=schema),
+            part_dir / f"part-{export_id}.parquet",
+            compression='zstd'
+        )
+    return len(groups)
+
+
+def story_row(story: Dict[str, Any]) -> Dict[str, Any]:
+    """Stories table row -> export row (+ partition keys)"""
+    created_at = _timestamp(story.get('created_at'))
+    row = {name: story.get(name) for name in STORIES_SCHEMA.names if name in story}
+    row.update({
+        'created_at': created_at,
+        'updated_at': _timestamp(story.get('updated_at')),
+        'viral_score': _int(story.get('viral_score')),
+        'image_count': len(story.get('images') or []),
+        'has_video': bool(story.get('video_url')),
+        'content_length': len(story.get('content') or ''),
+        '_source': story.get('source_platform') or ('scraped' if story.get('is_scraped') else 'user'),
+        '_month': created_at.strftime('%Y-%m') if created_at else None,
+    })
+    for name in ('reddit_score', 'reddit_comments', 'twitter_likes', 'twitter_retweets',
+                 'youtube_views', 'youtube_duration', 'view_count', 'share_count'):
+        row[name] = _int(story.get(name))
+    for name in ('cost_us', 'cost_abroad', 'savings_percent', 'gofundme_goal', 'gofundme_raised'):
+        value = story.get(name)
+        row[name] = float(value) if value is not None else None
+    return row
+
+
+def export_stories(supabase, export_dir: Path = EXPORT_DIR, full: bool = False, page_size: int = 1000) -> Dict[str, int]:
+    """
+    Export stories created since the last export
+
+    The watermark is the newest created_at exported plus the ids at exactly
+    that timestamp, so rows sharing a timestamp across pages aren't lost.
+    """
+    export_dir.mkdir(parents=True, exist_ok=True)
+    state = _load_state(export_dir)
+    if full:
+        state['stories'] = {}
+        shutil.rmtree(export_dir / 'stories', ignore_errors=True)
+    watermark = state['stories'].get('created_at')
+    boundary_ids = set(state['stories'].get('boundary_ids', []))
+    export_id = _export_id()
+
+    rows = []
+    start = 0
+    while True:
+        query = supabase.table('stories').select(STORY_COLUMNS)
+        if watermark:
+            query = query.gte('created_at', watermark)
+        result = query.order('created_at').order('id').range(start, start + page_size - 1).execute()
+        batch = result.data or []
+        for story in batch:
+            if story.get('created_at') == watermark and story.get('id') in boundary_ids:
+                continue
+            rows.append(story)
+        if len(batch) < page_size:
+            break
+        start += page_size
+
+    if not rows:
+        return {'rows': 0, 'partitions': 0}
+
+    newest = max(r['created_at'] for r in rows if r.get('created_at'))
+    new_boundary = [r['id'] for r in rows if r.get('created_at') == newest]
+    if newest == watermark:
+        new_boundary += list(boundary_ids)
+
+    partitions = _write_partitions([story_row(r) for r in rows], STORIES_SCHEMA, export_dir, 'stories', export_id)
+    state['stories'] = {'created_at': newest, 'boundary_ids': new_boundary, 'last_export': export_id}
+    _save_state(export_dir, state)
+    return {'rows': len(rows), 'partitions': partitions}
+
+
+def raw_row(record: Dict[str, Any], source: str, file_name: str, line: int) -> Dict[str, Any]:
+    """Raw archive record (any scraper) -> export row (+ partition keys)"""
+    engagement = (record.get('score') if source == 'reddit' else
+                  record.get('likes') if source == 'twitter' else
+                  record.get('view_count') if source == 'youtube' else
+                  record.get('raised_amount') if source == 'gofundme' else None)
+    content = record.get('content') or record.get('text') or record.get('transcript') or ''
+    images = record.get('images') or record.get('uploaded_media') or record.get('media_urls') or []
+    day = file_name.split('_raw_', 1)[-1][:8]
+    return {
+        'item_id': str(record['id']) if record.get('id') is not None else None,
+        'source_url': record.get('source_url') or record.get('url'),
+        'title': record.get('title'),
+        'search_query': record.get('search_query'),
+        'subreddit': record.get('subreddit'),
+        'author': record.get('author') or record.get('author_username') or record.get('channel'),
+        'engagement': _int(engagement),
+        'num_comments': _int(record.get('num_comments') or record.get('replies')),
+        'image_count': len(images),
+        'has_video': bool(record.get('has_video') or record.get('video_url') or source == 'youtube'),
+        'content_length': len(content),
+        'published_at': record.get('created_utc') or record.get('created_at') or record.get('publish_date'),
+        'archive_file': file_name,
+        'archive_line': line,
+        'record_json': json.dumps(record, default=str, ensure_ascii=False),
+        '_source': source,
+        '_month': f"{day[:4]}-{day[4:6]}" if day.isdigit() else None,
+    }
+
+
+def export_raw(
+    export_dir: Path = EXPORT_DIR,
+    sources: Iterable[str] = ARCHIVE_SOURCES,
+    full: bool = False
+) -> Dict[str, int]:
+    """Export raw archive lines not yet exported (archives are append-only)"""
+    export_dir.mkdir(parents=True, exist_ok=True)
+    state = _load_state(export_dir)
+    if full:
+        state['raw'] = {}
+        shutil.rmtree(export_dir / 'raw', ignore_errors=True)
+    export_id = _export_id()
+
+    total_rows = total_partitions = 0
+    for source in sources:
+        done: Dict[str, int] = state['raw'].setdefault(source, {})
+        directory = default_archive_dir(source)
+        if not directory.exists():
+            continue
+
+        rows = []
+        for path in archive_files(directory, source):
+            already = done.get(path.name, 0)
+            count = 0
+            for line, record in enumerate(read_archive(path)):
+                count = line + 1
+                if line >= already:
+                    rows.append(raw_row(record, source, path.name, line))
+            done[path.name] = max(already, count)
+
+        if rows:
+            total_partitions += _write_partitions(rows, RAW_SCHEMA, export_dir, 'raw', f"{export_id}_{source}")
+            total_rows += len(rows)
+
+    _save_state(export_dir, state)
+    return {'rows': total_rows, 'partitions': total_partitions}
+
+
+def scan(
+    table: str,
+    columns: Optional[List[str]] = None,
+    source: Optional[str] = None,
+    since_month: Optional[str] = None,
+    filter: Optional[ds.Expression] = None,
+    export_dir: Path = EXPORT_DIR
+) -> pa.Table:
+    """
+    Read an exported table, pruning partitions by source / month
+
+    Example:
+        scan('stories', ['procedure_type', 'country_abroad', 'cost_us'],
+             source='reddit', since_month='2026-01',
+             filter=ds.field('cost_us') > 10000)
+    """
+    path = export_dir / table
+    if not path.exists():
+        schema = STORIES_SCHEMA if table == 'stories' else RAW_SCHEMA
+        empty = pa.Table.from_pylist([], schema=schema)
+        return empty.select(columns) if columns else empty
+
+    dataset = ds.dataset(
+        str(path),
+        format='parquet',
+        partitioning=ds.partitioning(PARTITION_SCHEMA, flavor='hive'),
+    )
+    expression = filter
+    for clause in (
+        ds.field('source') == source if source else None,
+        ds.field('month') >= since_month if since_month else None,
+    ):
+        if clause is not None:
+            expression = clause if expression is None else expression & clause
+    return dataset.to_table(columns=columns, filter=expression)
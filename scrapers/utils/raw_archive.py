@@ -0,0 +1,252 @@
+"""
+Streaming raw archive for scraped items
+Appends one JSON record per line to gzip-compressed NDJSON files as items
+are collected, instead of json.dump-ing the whole run at the end
+
+- Files: <dir>/<source>_raw_<YYYYMMDD>_<seq>.ndjson.gz, rotated when a file
+  passes RAW_ARCHIVE_MAX_MB or the day changes
+- Every record is sync-flushed, so a crash mid-run loses at most the record
+  being written; a new file is always started rather than appending to a
+  possibly truncated one
+- A SQLite index (<dir>/<source>_raw_index.db) maps item id / URL / run to
+  file + line, so items can be replayed into extraction. Writing an item
+  again in the same run (e.g. once its comments arrive) appends the new
+  version and repoints the index, so replay yields only the latest:
+
+    python scripts/replay_raw.py reddit --run 20250101_120000 --extract
+"""
+import os
+import gzip
+import json
+import zlib
+import sqlite3
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+from dotenv import load_dotenv
+
+load_dotenv(override=True)
+
+RAW_ARCHIVE_MAX_BYTES = int(float(os.getenv('RAW_ARCHIVE_MAX_MB', '64')) * 1024 * 1024)
+
+ARCHIVE_SUFFIX = '.ndjson.gz'
+
+SCRAPERS_DIR = Path(__file__).parent.parent
+ARCHIVE_SOURCES = ['reddit', 'twitter', 'gofundme', 'youtube', 'news']
+
+
+def default_archive_dir(source: str) -> Path:
+    """Where each scraper writes its raw archive (YouTube keeps everything on the NAS)"""
+    if source == 'youtube':
+        return Path(os.getenv('NAS_MOUNT_PATH', '/mnt/nas/oasara')) / 'scraped' / 'youtube'
+    return SCRAPERS_DIR / source / 'output'
+
+
+def read_archive(path: Path) -> Iterator[Dict[str, Any]]:
+    """
+    Yield records from one archive file (.ndjson.gz) or legacy dump (.json)
+    A truncated tail (crash mid-write) ends the iteration instead of raising.
+    """
+    path = Path(path)
+    if path.suffix == '.json':
+        with open(path, 'r') as f:
+            yield from json.load(f)
+        return
+
+    try:
+        with gzip.open(path, 'rt', encoding='utf-8') as f:
+            for line in f:
+                if not line.endswith('\n'):
+                    break  # Partial last record
+                yield json.loads(line)
+    except (EOFError, zlib.error, gzip.BadGzipFile):
+        return
+
+
+def archive_files(directory: Path, source: Optional[str] = None, include_legacy: bool = False) -> List[Path]:
+    """Archive files in write order (legacy *_raw_*.json dumps optionally included)"""
+    prefix = f"{source}_raw_" if source else '*_raw_'
+    files = list(Path(directory).glob(f"{prefix}*{ARCHIVE_SUFFIX}"))
+    if include_legacy:
+        files += Path(directory).glob(f"{prefix}*.json")
+    return sorted(files, key=lambda p: p.name)
+
+
+class RawArchive:
+    """Append-only, rotating, indexed NDJSON.gz writer for one source"""
+
+    def __init__(
+        self,
+        directory: Path,
+        source: str,
+        run_id: Optional[str] = None,
+        max_bytes: int = RAW_ARCHIVE_MAX_BYTES
+    ):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.source = source
+        self.run_id = run_id or datetime.now().strftime('%Y%m%d_%H%M%S')
+        self.max_bytes = max_bytes
+
+        self.files: List[Path] = []
+        self.count = 0
+        self.rewrites = 0
+        self._rows: Dict[str, int] = {}   # item id -> index rowid, this run
+        self._raw = None
+        self._gz = None
+        self._path: Optional[Path] = None
+        self._day: Optional[str] = None
+        self._line = 0
+
+        self._index = sqlite3.connect(str(self.directory / f"{source}_raw_index.db"))
+        self._index.execute('PRAGMA journal_mode=WAL')
+        self._index.execute('''
+            CREATE TABLE IF NOT EXISTS items (
+                run_id TEXT NOT NULL,
+                item_id TEXT,
+                source_url TEXT,
+                file TEXT NOT NULL,
+                line INTEGER NOT NULL,
+                written_at TEXT NOT NULL
+            )
+        ''')
+        self._index.execute('CREATE INDEX IF NOT EXISTS idx_items_run ON items(run_id)')
+        self._index.execute('CREATE INDEX IF NOT EXISTS idx_items_url ON items(source_url)')
+        self._index.execute('CREATE INDEX IF NOT EXISTS idx_items_written ON items(written_at)')
+        self._index.commit()
+
+    def __enter__(self) -> 'RawArchive':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _open_next(self):
+        """Start a new file: next free sequence number for today"""
+        self._close_file()
+        self._day = datetime.now().strftime('%Y%m%d')
+        existing = archive_files(self.directory, f"{self.source}")
+        seqs = [
+            int(p.name[:-len(ARCHIVE_SUFFIX)].rsplit('_', 1)[-1])
+            for p in existing if f"_raw_{self._day}_" in p.name
+        ]
+        seq = max(seqs, default=0) + 1
+        self._path = self.directory / f"{self.source}_raw_{self._day}_{seq:03d}{ARCHIVE_SUFFIX}"
+        self._raw = open(self._path, 'xb')
+        self._gz = gzip.GzipFile(filename='', mode='wb', fileobj=self._raw)
+        self._line = 0
+        self.files.append(self._path)
+
+    def _close_file(self):
+        if self._gz:
+            self._gz.close()
+            self._raw.close()
+            self._gz = self._raw = None
+
+    def write(self, record: Dict[str, Any]):
+        """Append one item and index it"""
+        if (self._gz is None
+                or self._raw.tell() >= self.max_bytes
+                or datetime.now().strftime('%Y%m%d') != self._day):
+            self._open_next()
+
+        line = json.dumps(record, default=str, ensure_ascii=False) + '\n'
+        self._gz.write(line.encode('utf-8'))
+        self._gz.flush()  # Z_SYNC_FLUSH - everything so far is readable after a crash
+
+        item_id = str(record['id']) if record.get('id') is not None else None
+        row = self._rows.get(item_id) if item_id else None
+        if row:
+            # Newer version of an item from this run: the old line stays in the file
+            self._index.execute(
+                'UPDATE items SET file = ?, line = ?, written_at = ? WHERE rowid = ?',
+                (self._path.name, self._line, datetime.now().isoformat(), row)
+            )
+            self.rewrites += 1
+        else:
+            cur = self._index.execute(
+                'INSERT INTO items (run_id, item_id, source_url, file, line, written_at) VALUES (?, ?, ?, ?, ?, ?)',
+                (self.run_id, item_id, record.get('source_url') or record.get('url'),
+                 self._path.name, self._line, datetime.now().isoformat())
+            )
+            if item_id:
+                self._rows[item_id] = cur.lastrowid
+            self.count += 1
+        self._index.commit()
+        self._line += 1
+
+    def write_many(self, records: Iterable[Dict[str, Any]]):
+        for record in records:
+            self.write(record)
+
+    def close(self):
+        self._close_file()
+        self._index.close()
+
+    def summary(self) -> str:
+        names = ', '.join(p.name for p in self.files) or 'no files'
+        updated = f", {self.rewrites} updated" if self.rewrites else ''
+        return f"{self.count} items archived{updated} to {self.directory} ({names})"
+
+
+def replay(
+    directory: Path,
+    source: str,
+    run_id: Optional[str] = None,
+    since: Optional[str] = None
+) -> Iterator[Dict[str, Any]]:
+    """
+    Stream archived items back, optionally limited to one run or to items
+    written since an ISO date/time. Goes through the index, so rewritten
+    items come back once (latest version); without an index, unfiltered
+    replay reads every file as is.
+    """
+    directory = Path(directory)
+    index_path = directory / f"{source}_raw_index.db"
+    if not index_path.exists():
+        if not run_id and not since:
+            for path in archive_files(directory, source):
+                yield from read_archive(path)
+        return
+
+    query = 'SELECT file, line FROM items WHERE 1 = 1'
+    params: List[Any] = []
+    if run_id:
+        query += ' AND run_id = ?'
+        params.append(run_id)
+    if since:
+        query += ' AND written_at >= ?'
+        params.append(since)
+
+    conn = sqlite3.connect(str(index_path))
+    try:
+        wanted: Dict[str, set] = {}
+        for file, line in conn.execute(query, params):
+            wanted.setdefault(file, set()).add(line)
+    finally:
+        conn.close()
+
+    for file in sorted(wanted):
+        lines = wanted[file]
+        for i, record in enumerate(read_archive(directory / file)):
+            if i in lines:
+                yield record
+
+
+def list_runs(directory: Path, source: str) -> List[Dict[str, Any]]:
+    """Runs recorded in the index with item counts and time span"""
+    index_path = Path(directory) / f"{source}_raw_index.db"
+    if not index_path.exists():
+        return []
+    conn = sqlite3.connect(str(index_path))
+    try:
+        rows = conn.execute(
+            'SELECT run_id, COUNT(*), MIN(written_at), MAX(written_at), COUNT(DISTINCT file) '
+            'FROM items GROUP BY run_id ORDER BY run_id'
+        ).fetchall()
+    finally:
+        conn.close()
+    return [
+        {'run_id': r[0], 'items': r[1], 'first': r[2], 'last': r[3], 'files': r[4]}
+        for r in rows
+    ]
@@ -22,6 +22,10 @@ from pathlib import Path
 from dotenv import load_dotenv
 from supabase import create_client, Client
 
+from .llm_metrics import get_metrics
+from .near_dup import get_near_dup_index
+from .url_canon import canonicalize, stored_variants, stored_like_patterns
+
 load_dotenv(override=True)
 
 # NAS Configuration
@@ -219,12 +223,47 @@ class StorageClient:
     
     def insert_story(self, story_data: Dict[str, Any]) -> Dict[str, Any]:
         """Insert a scraped story into Supabase"""
-        result = self.supabase.table('stories').insert(story_data).execute()
+        raw_url = story_data.get('source_url')
+        if raw_url:
+            story_data['source_url'] = canonicalize(raw_url)
+        try:
+            result = self.supabase.table('stories').insert(story_data).execute()
+        except Exception:
+            # Extraction indexed this item; without a stored story it mustn't
+            # suppress later copies as near-duplicates
+            near_dup = get_near_dup_index()
+            if near_dup and raw_url:
+                near_dup.forget(raw_url, story_data['source_url'])
+            raise
+
+        # Count stored stories per source for cost-per-story reporting
+        metrics = get_metrics()
+        if metrics and result.data:
+            metrics.record_story_stored(story_data.get('source_platform', 'unknown'))
+
         return result.data[0] if result.data else {}
     
     def story_exists(self, source_url: str) -> bool:
-        """Check if a story from this URL already exists (deduplication)"""
-        result = self.supabase.table('stories').select('id').eq('source_url', source_url).execute()
+        """
+        Check if a story from this URL already exists (deduplication)
+        Any variant of the URL matches (utils/url_canon.py): an exact lookup
+        on the forms rows may have been stored under, then - only on a miss -
+        prefix/ID LIKE patterns for rows stored with a query string or links
+        that lack the subreddit/user.
+        """
+        table = self.supabase.table('stories')
+        result = table.select('id').in_('source_url', stored_variants(source_url)).limit(1).execute()
+        if result.data:
+            return True
+        patterns = stored_like_patterns(source_url)
+        if not patterns:
+            return False
+        # PostgREST or=(): quoted values, backslashes (our LIKE escapes) doubled
+        filters = ','.join(
+            'source_url.like."{}"'.format(p.replace('\\', '\\\\').replace('"', '\\"'))
+            for p in patterns
+        )
+        result = table.select('id').or_(filters).limit(1).execute()
         return len(result.data) > 0
     
     def get_stats(self) -> Dict[str, int]:
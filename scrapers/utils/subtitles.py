@@ -0,0 +1,165 @@
+"""
+Streaming SRT/WebVTT parser for video transcripts
+Reads a subtitle file line by line into timestamped segments instead of
+slurping it and running several regexes per line, and collapses the
+rolling captions of YouTube auto-subs, where each cue repeats the previous
+line before adding a new one (so the text would otherwise appear 2-3x):
+
+    segments = parse_subtitles('/mnt/nas/.../abc.en.srt')
+    # [{'start': 1.2, 'end': 3.9, 'text': 'my bill came to'}, ...]
+    transcript = segments_text(segments)
+    seconds = find_quote(segments, extracted['key_quote'])
+    url = timestamp_url(video_url, seconds)
+
+Collapsing works line by line: a line equal to the previous caption line is
+dropped, and one that starts with the tail of the previous line (by at
+least ROLLING_MIN_OVERLAP words) contributes only its new words. Each
+segment keeps the timing of the cue where its words first appeared.
+"""
+import re
+from html import unescape
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+# 00:01:02,345 --> 00:01:04,000 (SRT) / 01:02.345 --> 01:04.000 align:start (VTT)
+TIMESTAMP_RE = re.compile(
+    r'^\s*(?:(\d+):)?(\d{1,2}):(\d{2})[,.](\d{3})\s*-->\s*(?:(\d+):)?(\d{1,2}):(\d{2})[,.](\d{3})'
+)
+TAG_RE = re.compile(r'<[^>]*>')              # <i>, <font ...>, VTT <c> and <00:00:01.000> word timings
+ANNOTATION_RE = re.compile(r'^[\[(][^\])]*[\])]$')   # [Music], (applause)
+WORD_RE = re.compile(r'\S+')
+NON_WORD_RE = re.compile(r'[^a-z0-9$]')
+
+ROLLING_MIN_OVERLAP = 2
+
+# Pauses at least this long start a new paragraph in segments_text
+PARAGRAPH_GAP = 2.0
+
+
+def cue_times(timing_line: str) -> Tuple[float, float]:
+    """(start, end) seconds of a cue timing line"""
+    h1, m1, s1, ms1, h2, m2, s2, ms2 = TIMESTAMP_RE.match(timing_line).groups()
+    start = int(h1 or 0) * 3600000 + int(m1) * 60000 + int(s1) * 1000 + int(ms1)
+    end = int(h2 or 0) * 3600000 + int(m2) * 60000 + int(s2) * 1000 + int(ms2)
+    return start / 1000, end / 1000
+
+
+def iter_cues(lines: Iterable[str]) -> Iterator[Tuple[str, List[str]]]:
+    """
+    (timing line, cleaned text lines) per cue, from SRT or VTT lines.
+    Timings are parsed later with cue_times, and only for cues that add
+    text - half of a rolling-caption file is repeat cues.
+    """
+    timing = ''
+    text: List[str] = []
+    in_cue = False
+    for raw in lines:
+        if not in_cue:
+            # Anything between cues is an SRT index or a VTT header/NOTE block
+            if '-->' in raw and TIMESTAMP_RE.match(raw):
+                timing = raw
+                text = []
+                in_cue = True
+            continue
+        line = raw.strip()
+        if not line:
+            # Only a truly empty line ends a cue - YouTube VTT pads cues with ' ' lines
+            if raw in ('\n', '\r\n', ''):
+                in_cue = False
+                if text:
+                    yield timing, text
+            continue
+        if '<' in line:
+            line = TAG_RE.sub('', line).strip()
+        if '&' in line:
+            line = unescape(line)
+        if '  ' in line:
+            line = ' '.join(line.split())
+        if line and not (line[0] in '[(' and ANNOTATION_RE.match(line)):
+            text.append(line)
+    if in_cue and text:
+        yield timing, text
+
+
+def _overlap(previous: List[str], words: List[str]) -> int:
+    """Length of the longest tail of previous that words starts with"""
+    first = words[0]
+    limit = len(previous) - ROLLING_MIN_OVERLAP
+    for i, word in enumerate(previous):
+        # Tails are tried longest first; each must start with words[0]
+        if i > limit:
+            break
+        if word == first and previous[i:] == words[:len(previous) - i]:
+            return len(previous) - i
+    return 0
+
+
+def collapse_rolling(cues: Iterable[Tuple[str, List[str]]]) -> Iterator[Dict[str, float]]:
+    """Segments holding only the words each cue adds"""
+    last_line = ''
+    last: List[str] = []
+    for timing, lines in cues:
+        new_words: List[str] = []
+        for line in lines:
+            if line == last_line:
+                continue
+            words = line.split(' ')
+            new_words.extend(words[_overlap(last, words):] if last else words)
+            last_line, last = line, words
+        if new_words:
+            start, end = cue_times(timing)
+            yield {'start': start, 'end': end, 'text': ' '.join(new_words)}
+
+
+def parse_subtitles(path: str, encoding: str = 'utf-8') -> List[Dict[str, float]]:
+    """Timestamped segments of an .srt/.vtt file (rolling captions collapsed)"""
+    with open(path, 'r', encoding=encoding, errors='replace') as f:
+        return list(collapse_rolling(iter_cues(f)))
+
+
+def segments_text(segments: List[Dict[str, float]]) -> str:
+    """Plain transcript; pauses of PARAGRAPH_GAP seconds or more become paragraph breaks"""
+    paragraphs: List[List[str]] = []
+    previous_end = None
+    for segment in segments:
+        if previous_end is None or segment['start'] - previous_end >= PARAGRAPH_GAP:
+            paragraphs.append([])
+        paragraphs[-1].append(segment['text'])
+        previous_end = segment['end']
+    return '\n\n'.join(' '.join(p) for p in paragraphs)
+
+
+def _normalized_words(text: str) -> List[str]:
+    return [NON_WORD_RE.sub('', w.lower()) for w in WORD_RE.findall(text or '')]
+
+
+def find_quote(segments: List[Dict[str, float]], quote: str, probe_words: int = 6) -> Optional[float]:
+    """
+    Start time of the segment where quote begins (matched on its first
+    probe_words words, case and punctuation ignored), or None
+    """
+    probe = [w for w in _normalized_words(quote) if w][:probe_words]
+    if not probe:
+        return None
+    words: List[str] = []
+    owner: List[int] = []  # Segment index of each word
+    for i, segment in enumerate(segments):
+        for word in _normalized_words(segment['text']):
+            if word:
+                words.append(word)
+                owner.append(i)
+    n = len(probe)
+    for i in range(len(words) - n + 1):
+        if words[i:i + n] == probe:
+            return segments[owner[i]]['start']
+    return None
+
+
+def timestamp_url(url: str, seconds: Optional[float]) -> Optional[str]:
+    """Video URL that starts playback at seconds (YouTube t= param, else a media fragment)"""
+    if not url or seconds is None:
+        return None
+    t = int(seconds)
+    if 'youtube.com/watch' in url or 'youtu.be/' in url:
+        return f"{url}{'&' if '?' in url else '?'}t={t}s"
+    return f"{url}#t={t}"
+
@@ -0,0 +1,356 @@
+"""
+URL canonicalization shared by every scraper and the dedup lookup
+The same post/tweet/video/article reaches us under many URL variants
+(x.com vs twitter.com, old./m./amp. hosts, youtu.be, utm_* params, search
+engine redirect wrappers); canonicalize() maps them to one form so nothing
+is fetched or extracted twice
+
+Platform forms match what those scrapers have always stored; news rows
+stored earlier may differ (trailing slash, www., query string), which
+story_exists covers with stored_variants() / stored_like_patterns():
+
+    reddit   https://reddit.com/r/<sub>/comments/<id>/<slug>/
+    twitter  https://twitter.com/<user>/status/<id>
+    youtube  https://www.youtube.com/watch?v=<id>
+    gofundme https://www.gofundme.com/f/<slug>
+    other    https, lowercase host without m./amp. (www. only for WWW_HOSTS),
+             AMP paths, tracking params and fragment removed, remaining
+             params sorted, no trailing slash
+
+platform_id() gives a variant-proof key (reddit:<id>, twitter:<id>, ...)
+for in-run dedup. story_exists looks rows up by stored_variants() (exact
+forms, index-friendly) and falls back to stored_like_patterns().
+"""
+import re
+from typing import List, Optional, Tuple
+from urllib.parse import parse_qsl, unquote, urlencode, urlsplit, urlunsplit
+
+import requests
+
+# Query params that never identify content, on any site
+TRACKING_PARAMS = {
+    'fbclid', 'gclid', 'dclid', 'msclkid', 'yclid', 'igshid', 'mc_cid', 'mc_eid', 'mkt_tok',
+    'ocid', 'cmpid', 'smid', 'smtyp', 'ref_src', 'ref_url', 'share_id', 'ncid', 'sr_share',
+    'taid', 'guccounter', '_ga', '_gl',
+}
+# Generic names (s, t, src, ref, cid, ...) often identify content elsewhere
+# (?s= search, ?cid= article ids), so they are only dropped on hosts where
+# they are known to be tracking
+HOST_TRACKING_PARAMS = {
+    'youtube.com': {'si', 'feature', 'pp', 'ab_channel'},
+    'instagram.com': {'igsh', 'utm_source'},
+    'facebook.com': {'ref', 'sfnsn', 'mibextid', '__tn__', '__cft__'},
+    'tiktok.com': {'_r', '_t', 'is_from_webapp', 'sender_device'},
+    'medium.com': {'source', 'sk'},
+    'substack.com': {'r', 's', 'triedredirect'},
+    'linkedin.com': {'trk', 'trackingid'},
+    'nytimes.com': {'referringsource', 'unlocked_article_code', 'smid'},
+    'washingtonpost.com': {'itid', 's_l', 'pwapi_token'},
+    'apnews.com': {'cid'},
+    'usatoday.com': {'cid'},
+    'msn.com': {'cvid', 'ei', 'ocid'},
+    'statnews.com': {'cid', 'source'},
+}
+TRACKING_PREFIXES = ('utm_', 'pk_', 'hsa_', 'at_', 'ga_', 'oly_', 'vero_')
+
+# Hosts whose article URLs never need a query string
+DROP_ALL_PARAMS = {
+    'kffhealthnews.org', 'npr.org', 'propublica.org', 'cnn.com', 'nbcnews.com',
+    'gofundme.com', 'reddit.com',
+}
+
+# Sites whose own canonical links use www. (everything else is stored bare)
+WWW_HOSTS = {'npr.org', 'propublica.org', 'cnn.com', 'nbcnews.com', 'gofundme.com', 'youtube.com'}
+
+# Mobile / AMP / regional prefixes that serve the same content
+HOST_PREFIXES = ('www.', 'm.', 'mobile.', 'amp.', 'old.', 'new.', 'np.', 'i.')
+
+HOST_ALIASES = {
+    'x.com': 'twitter.com',
+    'fxtwitter.com': 'twitter.com',
+    'vxtwitter.com': 'twitter.com',
+    'nitter.net': 'twitter.com',
+    'youtube-nocookie.com': 'youtube.com',
+    'music.youtube.com': 'youtube.com',
+    'kaiserhealthnews.org': 'kffhealthnews.org',
+    'khn.org': 'kffhealthnews.org',
+}
+
+# Redirect wrappers: host (suffix) -> query param holding the real URL
+REDIRECT_PARAMS = {
+    'duckduckgo.com': 'uddg',
+    'google.com': 'url',
+    'l.facebook.com': 'u',
+    'lm.facebook.com': 'u',
+    'out.reddit.com': 'url',
+    'l.instagram.com': 'u',
+    'href.li': '',
+    'news.google.com': 'url',
+}
+
+# Short-link hosts that need a request to resolve (resolve_url)
+SHORTENER_HOSTS = {
+    't.co', 'bit.ly', 'ow.ly', 'tinyurl.com', 'buff.ly', 'trib.al', 'n.pr', 'nyti.ms',
+    'wapo.st', 'cnn.it', 'nbcnews.to', 'gofund.me', 'dlvr.it', 'ift.tt', 'lnkd.in', 'shorturl.at',
+}
+
+_AMP_CDN = re.compile(r'^[a-z0-9-]+\.cdn\.ampproject\.org$')
+_YT_ID = re.compile(r'^[A-Za-z0-9_-]{11}$')
+_REDDIT_ID = re.compile(r'/comments/([a-z0-9]+)', re.I)
+_TWEET_ID = re.compile(r'/status(?:es)?/(\d+)')
+
+
+def _bare_host(host: str) -> str:
+    host = host.lower().rstrip('.')
+    if host.endswith(':80') or host.endswith(':443'):
+        host = host.rsplit(':', 1)[0]
+    if host in HOST_ALIASES:
+        return HOST_ALIASES[host]
+    changed = True
+    while changed:
+        changed = False
+        for prefix in HOST_PREFIXES:
+            if host.startswith(prefix) and host.count('.') > 1:
+                host = host[len(prefix):]
+                changed = True
+    return HOST_ALIASES.get(host, host)
+
+
+def _host_matches(host: str, domain: str) -> bool:
+    return host == domain or host.endswith('.' + domain)
+
+
+def _unwrap(parts) -> Optional[str]:
+    """Target URL of a known redirect wrapper or AMP cache URL, if this is one"""
+    host = parts.netloc.lower()
+    if _AMP_CDN.match(host):
+        # /c/s/www.npr.org/... (s = https)
+        m = re.match(r'^/(?:[a-z]/)*(s/)?(.+)$', parts.path)
+        if m:
+            return ('https://' if m.group(1) else 'http://') + m.group(2)
+    for domain, param in REDIRECT_PARAMS.items():
+        if _host_matches(host, domain):
+            if not param:
+                return unquote(parts.query) or None
+            if domain == 'google.com' and parts.path not in ('/url', '/search'):
+                return None
+            query = dict(parse_qsl(parts.query))
+            target = query.get(param) or query.get('q')
+            if target and target.startswith(('http://', 'https://')):
+                return target
+    return None
+
+
+def _clean_query(query: str, host: str) -> str:
+    if not query or host in DROP_ALL_PARAMS:
+        return ''
+    host_params = set()
+    for domain, params in HOST_TRACKING_PARAMS.items():
+        if _host_matches(host, domain):
+            host_params |= params
+    kept = [
+        (k, v) for k, v in parse_qsl(query, keep_blank_values=True)
+        if k.lower() not in TRACKING_PARAMS and k.lower() not in host_params
+        and not k.lower().startswith(TRACKING_PREFIXES)
+    ]
+    return urlencode(sorted(kept))
+
+
+def _strip_amp_path(path: str) -> str:
+    for suffix in ('/amp/', '/amp', '.amp.html', '.amp'):
+        if path.endswith(suffix):
+            path = path[:-len(suffix)] + ('.html' if suffix == '.amp.html' else '')
+            break
+    if path.startswith('/amp/'):
+        path = path[4:]
+    return path
+
+
+def _youtube(host: str, parts) -> Optional[str]:
+    video_id = None
+    if host == 'youtu.be':
+        video_id = parts.path.strip('/').split('/')[0]
+    elif host == 'youtube.com':
+        if parts.path == '/watch':
+            video_id = dict(parse_qsl(parts.query)).get('v')
+        else:
+            m = re.match(r'^/(?:shorts|embed|live|v|e)/([^/?#]+)', parts.path)
+            video_id = m.group(1) if m else None
+    if video_id and _YT_ID.match(video_id):
+        return f"https://www.youtube.com/watch?v={video_id}"
+    return None
+
+
+def _twitter(parts) -> Optional[str]:
+    m = re.match(r'^/([^/]+)/status(?:es)?/(\d+)', parts.path)
+    if m:
+        return f"https://twitter.com/{m.group(1)}/status/{m.group(2)}"
+    m = re.match(r'^/i/(?:web/)?status/(\d+)', parts.path)
+    if m:
+        return f"https://twitter.com/i/status/{m.group(1)}"
+    return None
+
+
+def _reddit(host: str, parts) -> Optional[str]:
+    if host == 'redd.it':
+        post_id = parts.path.strip('/')
+        return f"https://reddit.com/comments/{post_id}/" if post_id else None
+    path = parts.path
+    m = re.match(r'^(/r/[^/]+)?/comments/([a-z0-9]+)(/[^/]*)?', path, re.I)
+    if not m:
+        return None
+    sub, post_id, slug = m.group(1) or '', m.group(2), (m.group(3) or '/').rstrip('/')
+    # Drop a trailing /<comment_id>/ (permalinks to a single comment)
+    return f"https://reddit.com{sub}/comments/{post_id}{slug}/"
+
+
+def canonicalize(url: str) -> str:
+    """Canonical form of a URL (no network access; see resolve_url for short links)"""
+    url = (url or '').strip()
+    if not url:
+        return url
+    if url.startswith('//'):
+        url = 'https:' + url
+    elif not re.match(r'^[a-z][a-z0-9+.-]*://', url, re.I):
+        url = 'https://' + url
+
+    for _ in range(3):  # Wrappers can nest (news.google -> amp cdn -> site)
+        parts = urlsplit(url)
+        target = _unwrap(parts)
+        if not target:
+            break
+        url = target
+
+    parts = urlsplit(url)
+    if parts.scheme.lower() not in ('http', 'https'):
+        return url
+    host = _bare_host(parts.netloc)
+
+    if host in ('youtube.com', 'youtu.be'):
+        return _youtube(host, parts) or url
+    if host == 'twitter.com':
+        return _twitter(parts) or f"https://twitter.com{parts.path.rstrip('/')}"
+    if host in ('reddit.com', 'redd.it'):
+        return _reddit(host, parts) or f"https://reddit.com{parts.path}"
+    if host == 'gofundme.com':
+        m = re.match(r'^/f/([^/?#]+)', parts.path)
+        if m:
+            return f"https://www.gofundme.com/f/{m.group(1)}"
+
+    path = _strip_amp_path(re.sub(r'/{2,}', '/', parts.path or '/'))
+    if len(path) > 1:
+        path = path.rstrip('/')
+    query = _clean_query(parts.query, host)
+    netloc = 'www.' + host if host in WWW_HOSTS else host
+    return urlunsplit(('https', netloc, path, query, ''))
+
+
+def platform_id(url: str) -> Tuple[Optional[str], Optional[str]]:
+    """
+    ('reddit' | 'twitter' | 'youtube' | 'gofundme', id) for platform URLs,
+    (None, None) otherwise. Survives every variant canonicalize handles.
+    """
+    canon = canonicalize(url)
+    if canon.startswith('https://reddit.com'):
+        m = _REDDIT_ID.search(canon)
+        return ('reddit', m.group(1).lower()) if m else (None, None)
+    if canon.startswith('https://twitter.com'):
+        m = _TWEET_ID.search(canon)
+        return ('twitter', m.group(1)) if m else (None, None)
+    if canon.startswith('https://www.youtube.com/watch?v='):
+        return 'youtube', canon.rsplit('=', 1)[-1]
+    if canon.startswith('https://www.gofundme.com/f/'):
+        return 'gofundme', canon.rsplit('/', 1)[-1]
+    return None, None
+
+
+def dedup_key(url: str) -> str:
+    """Key for in-run seen-sets: platform id when there is one, else the canonical URL"""
+    platform, item_id = platform_id(url)
+    if platform == 'gofundme':
+        item_id = item_id.lower()  # Campaign slugs are case-insensitive
+    return f"{platform}:{item_id}" if platform else canonicalize(url)
+
+
+def like_escape(text: str) -> str:
+    """Literal text for a LIKE pattern (_ and % in IDs/paths aren't wildcards)"""
+    return text.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+
+
+def stored_variants(url: str) -> List[str]:
+    """
+    Exact source_url values a stored row for this item may have: the
+    canonical form plus the variants scrapers stored before canonicalization
+    (trailing slash, www./bare host, x.com, youtu.be, ...)
+    """
+    canon = canonicalize(url)
+    forms = {canon, (url or '').strip()}
+    platform, item_id = platform_id(url)
+    if platform == 'youtube':
+        forms |= {
+            f"https://youtube.com/watch?v={item_id}",
+            f"https://youtu.be/{item_id}",
+            f"https://www.youtube.com/shorts/{item_id}",
+        }
+        return sorted(f for f in forms if f)
+    if platform == 'twitter':
+        path = urlsplit(canon).path
+        forms |= {f"https://{host}{path}" for host in ('twitter.com', 'www.twitter.com', 'x.com', 'mobile.twitter.com')}
+        return sorted(f for f in forms if f)
+
+    parts = urlsplit(canon)
+    bare = parts.netloc[4:] if parts.netloc.startswith('www.') else parts.netloc
+    hosts = {bare, 'www.' + bare}
+    if platform == 'reddit':
+        hosts.add('old.' + bare)
+    path = parts.path.rstrip('/')
+    query = f"?{parts.query}" if parts.query else ''
+    for host in hosts:
+        forms |= {f"https://{host}{path}{query}", f"https://{host}{path}/{query}"}
+    return sorted(f for f in forms if f)
+
+
+def stored_like_patterns(url: str) -> List[str]:
+    """
+    LIKE patterns for stored variants stored_variants can't spell out: rows
+    saved with a query string (prefix match on the path), and reddit/twitter
+    links that lack the subreddit/user (matched on the ID alone - these need
+    a leading wildcard, so they are only used when the URL carries no more)
+    """
+    canon = canonicalize(url)
+    platform, item_id = platform_id(url)
+    if platform == 'reddit' and re.search(r'^https://reddit\.com(?:/r/[^/]+)?/comments/[a-z0-9]+/$', canon, re.I):
+        return [f"%/comments/{like_escape(item_id)}/%"]
+    if platform == 'twitter' and '/i/status/' in canon:
+        return [f"%/status/{like_escape(item_id)}"]
+    if platform in ('youtube', 'twitter', 'reddit'):
+        return []
+
+    parts = urlsplit(canon)
+    if parts.query:
+        return []
+    bare = parts.netloc[4:] if parts.netloc.startswith('www.') else parts.netloc
+    path = like_escape(parts.path.rstrip('/'))
+    return [
+        f"https://{host}{path}{sep}?%"
+        for host in sorted({bare, 'www.' + bare}) for sep in ('', '/')
+    ]
+
+
+def is_short_link(url: str) -> bool:
+    host = urlsplit(url if '://' in url else 'https://' + url).netloc.lower()
+    return host in SHORTENER_HOSTS
+
+
+def resolve_url(url: str, session: Optional[requests.Session] = None, timeout: int = 10) -> str:
+    """
+    Canonicalize, following short links (t.co, bit.ly, n.pr, ...) with a
+    HEAD request first. Falls back to the unresolved canonical form.
+    """
+    if is_short_link(url):
+        try:
+            resp = (session or requests).head(url, allow_redirects=True, timeout=timeout)
+            url = resp.url or url
+        except requests.RequestException:
+            pass
+    return canonicalize(url)
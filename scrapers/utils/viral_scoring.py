@@ -0,0 +1,217 @@
+"""
+Vectorized viral scoring over the whole stories table
+Same formula as calculate_viral_potential, computed column-wise with NumPy
+
+Weights are configurable (VIRAL_WEIGHTS_PATH JSON file, merged over the
+defaults below) so the catalogue can be re-ranked whenever the formula changes:
+
+    python scripts/rescore_viral.py --weights weights.json
+"""
+import os
+import json
+import copy
+from typing import Any, Dict, List, Optional
+import numpy as np
+from dotenv import load_dotenv
+
+load_dotenv(override=True)
+
+VIRAL_WEIGHTS_PATH = os.getenv('VIRAL_WEIGHTS_PATH')
+
+# Default formula - matches the original hand-tuned calculate_viral_potential
+DEFAULT_VIRAL_WEIGHTS: Dict[str, Any] = {
+    'base': 5,
+    'min': 1,
+    'max': 10,
+    'cost_us': {'threshold': 50000, 'points': 2},
+    'savings': {'threshold': 20000, 'points': 2},
+    'emotional_tags': {'shock': 1, 'anger': 1},
+    'issues': {'bankruptcy': 2, 'denied_coverage': 1, 'surprise_bill': 1},
+    'key_quote': {'min_length': 50, 'points': 1},
+    'images': {'min_count': 1, 'points': 1},
+}
+
+# Ids per PATCH: the id=in.(...) filter travels in the URL (~37 chars per
+# UUID), and ~100 keeps it under the 4-8 KB URL limits of the proxies in
+# front of PostgREST
+WRITE_CHUNK_IDS = 100
+
+# Columns needed from the stories table
+STORY_FEATURE_COLUMNS = 'id,cost_us,cost_abroad,emotional_tags,issues,key_quote,images,viral_score'
+
+
+def load_weights(path: Optional[str] = None) -> Dict[str, Any]:
+    """Defaults merged with an optional JSON weights file (nested dicts merge one level deep)"""
+    weights = copy.deepcopy(DEFAULT_VIRAL_WEIGHTS)
+    path = path or VIRAL_WEIGHTS_PATH
+    if not path:
+        return weights
+
+    with open(path, 'r') as f:
+        overrides = json.load(f)
+    for key, value in overrides.items():
+        if isinstance(value, dict) and isinstance(weights.get(key), dict):
+            weights[key].update(value)
+        else:
+            weights[key] = value
+    return weights
+
+
+def _number(value) -> float:
+    try:
+        return float(value) if value is not None else 0.0
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def story_savings(story: Dict[str, Any]) -> float:
+    """
+    Savings for one story: 'savings_amount' (extraction output) or, for
+    table rows, cost_us - cost_abroad when both are present
+    """
+    savings = _number(story.get('savings_amount'))
+    if savings > 0:
+        return savings
+    cost_us = _number(story.get('cost_us'))
+    cost_abroad = _number(story.get('cost_abroad'))
+    return cost_us - cost_abroad if cost_us > 0 and cost_abroad > 0 else 0.0
+
+
+def build_features(stories: List[Dict[str, Any]], weights: Dict[str, Any]) -> Dict[str, np.ndarray]:
+    """
+    Load story features into columnar arrays
+
+    Savings is derived column-wise exactly like story_savings().
+    """
+    n = len(stories)
+    cost_us = np.fromiter((_number(s.get('cost_us')) for s in stories), dtype=np.float64, count=n)
+    cost_abroad = np.fromiter((_number(s.get('cost_abroad')) for s in stories), dtype=np.float64, count=n)
+    savings_field = np.fromiter((_number(s.get('savings_amount')) for s in stories), dtype=np.float64, count=n)
+    derived = np.where((cost_us > 0) & (cost_abroad > 0), cost_us - cost_abroad, 0.0)
+    savings = np.where(savings_field > 0, savings_field, derived)
+
+    quote_len = np.fromiter((len(s.get('key_quote') or '') for s in stories), dtype=np.int64, count=n)
+    image_count = np.fromiter((len(s.get('images') or []) for s in stories), dtype=np.int64, count=n)
+
+    tag_vocab = list(weights['emotional_tags'])
+    issue_vocab = list(weights['issues'])
+    tags = np.zeros((n, len(tag_vocab)), dtype=np.bool_)
+    issues = np.zeros((n, len(issue_vocab)), dtype=np.bool_)
+    tag_index = {t: j for j, t in enumerate(tag_vocab)}
+    issue_index = {t: j for j, t in enumerate(issue_vocab)}
+    for i, s in enumerate(stories):
+        for tag in s.get('emotional_tags') or []:
+            j = tag_index.get(tag)
+            if j is not None:
+                tags[i, j] = True
+        for issue in s.get('issues') or []:
+            j = issue_index.get(issue)
+            if j is not None:
+                issues[i, j] = True
+
+    return {
+        'cost_us': cost_us,
+        'savings': savings,
+        'quote_len': quote_len,
+        'image_count': image_count,
+        'tags': tags,
+        'issues': issues,
+    }
+
+
+def score_features(features: Dict[str, np.ndarray], weights: Dict[str, Any]) -> np.ndarray:
+    """Compute scores for every row at once"""
+    n = len(features['cost_us'])
+    score = np.full(n, float(weights['base']))
+
+    score += (features['cost_us'] > weights['cost_us']['threshold']) * weights['cost_us']['points']
+    score += (features['savings'] > weights['savings']['threshold']) * weights['savings']['points']
+
+    tag_weights = np.array(list(weights['emotional_tags'].values()), dtype=np.float64)
+    issue_weights = np.array(list(weights['issues'].values()), dtype=np.float64)
+    if tag_weights.size:
+        score += features['tags'] @ tag_weights
+    if issue_weights.size:
+        score += features['issues'] @ issue_weights
+
+    score += (features['quote_len'] > weights['key_quote']['min_length']) * weights['key_quote']['points']
+    score += (features['image_count'] >= weights['images']['min_count']) * weights['images']['points']
+
+    return np.clip(score, weights['min'], weights['max']).astype(np.int64)
+
+
+def score_stories(stories: List[Dict[str, Any]], weights: Optional[Dict[str, Any]] = None) -> np.ndarray:
+    """Score a list of story dicts (extraction output or stories table rows)"""
+    weights = weights or load_weights()
+    if not stories:
+        return np.zeros(0, dtype=np.int64)
+    return score_features(build_features(stories, weights), weights)
+
+
+def fetch_story_features(supabase, page_size: int = 1000, scraped_only: bool = False) -> List[Dict[str, Any]]:
+    """Page through the stories table, pulling only the scoring columns"""
+    rows = []
+    start = 0
+    while True:
+        query = supabase.table('stories').select(STORY_FEATURE_COLUMNS)
+        if scraped_only:
+            query = query.eq('is_scraped', True)
+        result = query.order('id').range(start, start + page_size - 1).execute()
+        batch = result.data or []
+        rows.extend(batch)
+        if len(batch) < page_size:
+            break
+        start += page_size
+    return rows
+
+
+def write_scores(supabase, ids: List[str], scores: np.ndarray, chunk_size: int = WRITE_CHUNK_IDS) -> int:
+    """
+    Bulk write-back: scores are small integers, so group ids by score and
+    issue one UPDATE ... WHERE id IN (...) per score per chunk
+    """
+    ids_arr = np.asarray(ids, dtype=object)
+    updated = 0
+    for value in np.unique(scores):
+        group = ids_arr[scores == value].tolist()
+        for i in range(0, len(group), chunk_size):
+            chunk = group[i:i + chunk_size]
+            supabase.table('stories').update({'viral_score': int(value)}).in_('id', chunk).execute()
+            updated += len(chunk)
+    return updated
+
+
+def rescore_table(
+    supabase,
+    weights: Optional[Dict[str, Any]] = None,
+    scraped_only: bool = False,
+    dry_run: bool = False
+) -> Dict[str, Any]:
+    """
+    Re-rank the whole catalogue: load, score vectorized, write back changed rows
+
+    Returns:
+        Dict with counts and score histogram
+    """
+    weights = weights or load_weights()
+    rows = fetch_story_features(supabase, scraped_only=scraped_only)
+    scores = score_stories(rows, weights)
+
+    current = np.fromiter(
+        (int(r['viral_score']) if r.get('viral_score') is not None else -1 for r in rows),
+        dtype=np.int64, count=len(rows)
+    )
+    changed = scores != current
+    changed_ids = [r['id'] for r, c in zip(rows, changed) if c]
+
+    updated = 0
+    if not dry_run and changed_ids:
+        updated = write_scores(supabase, changed_ids, scores[changed])
+
+    values, counts = np.unique(scores, return_counts=True)
+    return {
+        'stories': len(rows),
+        'changed': int(changed.sum()),
+        'updated': updated,
+        'histogram': {int(v): int(c) for v, c in zip(values, counts)},
+    }
@@ -6,7 +6,8 @@ import os
 import re
 import json
 import time
-import subprocess
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 from typing import List, Dict, Any, Optional
 from pathlib import Path
@@ -19,9 +20,26 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from utils.storage import get_storage
 from utils.ai_extractor import extract_story_data
+from utils.raw_archive import RawArchive
+from utils.url_canon import canonicalize
+from utils.subtitles import parse_subtitles, segments_text, find_quote, timestamp_url
+from processing.transcription import get_transcriber
+from processing.keyframes import KEYFRAME_OCR_ENABLED, get_keyframe_scanner, process_story_video
+from youtube.ytdlp_engine import YtDlpEngine
 
 load_dotenv()
 
+# Transcript-first: fetch info JSON, thumbnail and subtitles only, run
+# relevance + extraction on the transcript, and download the video itself
+# only for stories that get saved
+YOUTUBE_TRANSCRIPT_FIRST = os.getenv('YOUTUBE_TRANSCRIPT_FIRST', 'true').lower() == 'true'
+
+# Tallest rendition downloaded for saved stories (e.g. 480 for a low-bitrate copy)
+YOUTUBE_MEDIA_HEIGHT = int(os.getenv('YOUTUBE_MEDIA_HEIGHT', '1080'))
+
+# Concurrent yt-dlp jobs (searches, metadata and media downloads)
+YOUTUBE_MAX_WORKERS = int(os.getenv('YOUTUBE_MAX_WORKERS', '4'))
+
 # Search queries for YouTube
 SEARCH_QUERIES = [
     # Medical tourism testimonials
@@ -73,180 +91,179 @@ class YouTubeScraper:
         self.transcripts_dir = self.output_dir / 'transcripts'
         self.transcripts_dir.mkdir(exist_ok=True)
         
-        self.whisper_model = os.getenv('WHISPER_MODEL', 'large-v3')  # Use best model on DGX
+        self.metadata_dir = self.output_dir / 'metadata'
+        self.metadata_dir.mkdir(exist_ok=True)
+        self.audio_dir = self.output_dir / 'audio'
+        self.audio_dir.mkdir(exist_ok=True)
+        self.bill_frames_dir = self.output_dir / 'bill_frames'
+        
+        # Shared Whisper service (WHISPER_MODEL, default large-v3 on DGX) - model loads once, on first use
+        self.transcriber = get_transcriber()
+        self.transcript_first = YOUTUBE_TRANSCRIPT_FIRST
+        
+        # In-process yt-dlp: searches and downloads share one worker pool
+        self.engine = YtDlpEngine(max_workers=YOUTUBE_MAX_WORKERS)
+        
+        # Bytes written to the NAS this run (metadata vs audio vs video files)
+        self.nas_stats = {'metadata_bytes': 0, 'audio_bytes': 0, 'video_bytes': 0,
+                          'videos_downloaded': 0, 'videos_skipped': 0}
+        self._stats_lock = threading.Lock()
         
         print(f"📁 Saving all content to NAS: {self.output_dir}")
     
     def _run_ytdlp_search(self, query: str, limit: int = 10) -> List[Dict[str, Any]]:
         """Search YouTube using yt-dlp"""
-        videos = []
+        return self._search_entries(query, self.engine.search(query, limit))
+    
+    def _search_entries(self, query: str, entries: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        return [
+            {
+                'id': video.get('id'),
+                'title': video.get('title'),
+                'url': canonicalize(video.get('url') or f"https://www.youtube.com/watch?v={video.get('id')}"),
+                'duration': video.get('duration'),
+                'view_count': video.get('view_count', 0),
+                'channel': video.get('channel') or video.get('uploader'),
+                'search_query': query,
+            }
+            for video in entries if video.get('id')
+        ]
+    
+    def _media_format(self) -> str:
+        height = YOUTUBE_MEDIA_HEIGHT
+        return (f'bestvideo[height<={height}][ext=mp4]+bestaudio[ext=m4a]'
+                f'/best[height<={height}][ext=mp4]/best[height<={height}]/best')
+    
+    def _add_stats(self, **amounts):
+        with self._stats_lock:
+            for key, value in amounts.items():
+                self.nas_stats[key] += value
+    
+    def _run_ytdlp(self, args: List[str], video_id: str, timeout: int) -> Optional[Dict[str, Any]]:
+        """One download job on the engine pool; its result dict, or None if it failed"""
+        result = self.engine.download(args + [f'https://www.youtube.com/watch?v={video_id}'],
+                                      label=video_id, timeout=timeout)
+        if result['timed_out']:
+            print(f"⏱️ Download timeout for {video_id}")
+            return None
+        if not result['ok']:
+            print(f"Download error for {video_id}: {(result['error'] or '')[:500]}")
+            return None
+        return result
+    
+    def _collect_files(self, video_id: str) -> Dict[str, str]:
+        """Paths of everything yt-dlp has written for this video (it may add suffixes)"""
+        files = {}
+        video_path = self.videos_dir / f"{video_id}.mp4"
+        if video_path.exists():
+            files['video'] = str(video_path)
         
-        try:
-            cmd = [
-                'yt-dlp',
-                '--flat-playlist',
-                '--dump-json',
-                f'ytsearch{limit}:{query}'
-            ]
-            
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                timeout=120
-            )
-            
-            if result.returncode != 0:
-                print(f"yt-dlp error: {result.stderr[:200]}")
-                return []
-            
-            for line in result.stdout.strip().split('\n'):
-                if line:
-                    try:
-                        video = json.loads(line)
-                        videos.append({
-                            'id': video.get('id'),
-                            'title': video.get('title'),
-                            'url': f"https://www.youtube.com/watch?v={video.get('id')}",
-                            'duration': video.get('duration'),
-                            'view_count': video.get('view_count', 0),
-                            'channel': video.get('channel') or video.get('uploader'),
-                            'search_query': query,
-                        })
-                    except json.JSONDecodeError:
-                        continue
-            
-        except subprocess.TimeoutExpired:
-            print(f"Timeout for query: {query}")
-        except FileNotFoundError:
-            print("yt-dlp not installed. Install with: pip install yt-dlp")
-        except Exception as e:
-            print(f"Error running yt-dlp: {e}")
+        for ext in ['.jpg', '.webp', '.png']:
+            thumb_check = self.thumbnails_dir / f"{video_id}{ext}"
+            if thumb_check.exists():
+                files['thumbnail'] = str(thumb_check)
+                break
         
-        return videos
+        for srt_file in self.transcripts_dir.glob(f"{video_id}*.srt"):
+            files['subtitles'] = str(srt_file)
+            break
+        
+        for json_file in self.metadata_dir.glob(f"{video_id}*.json"):
+            files['info'] = str(json_file)
+            break
+        
+        return files
     
-    def _download_video(self, video_id: str) -> Optional[Dict[str, Any]]:
+    def _fetch_metadata(self, video_id: str) -> Optional[Dict[str, str]]:
         """
-        Download FULL VIDEO directly to NAS - no temp files
-        Returns paths to downloaded files
+        Info JSON, thumbnail and English subtitles only (--skip-download):
+        tens of KB per video instead of the full rendition
         """
-        # Organize files by type on NAS
-        video_path = self.videos_dir / f"{video_id}.mp4"
-        thumb_path = self.thumbnails_dir / f"{video_id}.jpg"
-        transcript_path = self.transcripts_dir / f"{video_id}.srt"
-        info_path = self.output_dir / 'metadata' / f"{video_id}.json"
-        info_path.parent.mkdir(exist_ok=True)
+        cmd = [
+            '--skip-download',
+            '--write-info-json',
+            '--write-thumbnail',
+            '--convert-thumbnails', 'jpg',
+            '--write-subs',
+            '--write-auto-sub',
+            '--sub-lang', 'en',
+            '--convert-subs', 'srt',
+            '-o', f'infojson:{self.metadata_dir / video_id}.%(ext)s',
+            '-o', f'thumbnail:{self.thumbnails_dir / video_id}.%(ext)s',
+            '-o', f'subtitle:{self.transcripts_dir / video_id}.%(ext)s',
+        ]
         
-        try:
-            # Download FULL VIDEO directly to NAS
+        print(f"📝 Fetching metadata + subtitles for {video_id}...")
+        if not self._run_ytdlp(cmd, video_id, timeout=120):
+            return None
+        
+        files = self._collect_files(video_id)
+        self._add_stats(metadata_bytes=sum(
+            Path(files[key]).stat().st_size for key in ('thumbnail', 'subtitles', 'info') if key in files
+        ))
+        return files
+    
+    def _download_media(self, video_id: str) -> Optional[str]:
+        """Download the video rendition to NAS; returns its path"""
+        video_path = self.videos_dir / f"{video_id}.mp4"
+        if not video_path.exists():
             cmd = [
-                'yt-dlp',
-                '-f', 'bestvideo[height<=1080][ext=mp4]+bestaudio[ext=m4a]/best[height<=1080][ext=mp4]/best',
+                '-f', self._media_format(),
                 '--merge-output-format', 'mp4',
-                '--write-thumbnail',
-                '--convert-thumbnails', 'jpg',
-                '--write-info-json',
-                '--write-auto-sub',
-                '--sub-lang', 'en',
-                '--convert-subs', 'srt',
-                # Save directly to NAS paths
                 '-o', str(video_path),
-                '--write-thumbnail', '-o', f'thumbnail:{thumb_path}',
-                '--write-info-json', '-o', f'infojson:{info_path}',
-                '--write-subs', '-o', f'subtitle:{transcript_path}',
-                f'https://www.youtube.com/watch?v={video_id}'
             ]
-            
-            print(f"📥 Downloading {video_id} to NAS...")
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                timeout=600  # 10 min for large videos
-            )
-            
-            if result.returncode != 0:
-                print(f"Download error for {video_id}: {result.stderr[:500]}")
+            print(f"📥 Downloading {video_id} to NAS (<= {YOUTUBE_MEDIA_HEIGHT}p)...")
+            result = self._run_ytdlp(cmd, video_id, timeout=600)  # 10 min for large videos
+            if not result or not video_path.exists():
                 return None
-            
-            # Verify files exist on NAS
-            files = {}
-            if video_path.exists():
-                files['video'] = str(video_path)
-                size_mb = video_path.stat().st_size / 1024 / 1024
-                print(f"✅ Video saved: {size_mb:.1f}MB")
-            
-            # Find thumbnail (yt-dlp may add suffix)
-            for ext in ['.jpg', '.webp', '.png']:
-                thumb_check = self.thumbnails_dir / f"{video_id}{ext}"
-                if thumb_check.exists():
-                    files['thumbnail'] = str(thumb_check)
-                    break
-            
-            # Check for subtitles
-            for srt_file in self.transcripts_dir.glob(f"{video_id}*.srt"):
-                files['subtitles'] = str(srt_file)
-                break
-            
-            # Check for info json
-            for json_file in (self.output_dir / 'metadata').glob(f"{video_id}*.json"):
-                files['info'] = str(json_file)
-                break
-            
-            return files
-            
-        except subprocess.TimeoutExpired:
-            print(f"⏱️ Download timeout for {video_id}")
-            return None
-        except Exception as e:
-            print(f"❌ Error downloading {video_id}: {e}")
+            size = video_path.stat().st_size
+            self._add_stats(video_bytes=size, videos_downloaded=1)
+            print(f"✅ Video saved: {size / 1024 / 1024:.1f}MB "
+                  f"({result['speed'] / 1024 / 1024:.1f}MB/s over {result['seconds']:.0f}s)")
+        return str(video_path)
+    
+    def _download_audio(self, video_id: str) -> Optional[str]:
+        """Audio-only download for videos without subtitles (Whisper input)"""
+        for existing in self.audio_dir.glob(f"{video_id}.*"):
+            return str(existing)
+        cmd = [
+            '-f', 'bestaudio[ext=m4a]/bestaudio',
+            '-o', f'{self.audio_dir / video_id}.%(ext)s',
+        ]
+        print(f"🔊 Downloading audio for {video_id} (no subtitles)...")
+        if not self._run_ytdlp(cmd, video_id, timeout=300):
             return None
+        for audio_file in self.audio_dir.glob(f"{video_id}.*"):
+            self._add_stats(audio_bytes=audio_file.stat().st_size)
+            return str(audio_file)
+        return None
     
-    def _transcribe_audio(self, audio_path: str) -> Optional[str]:
+    def _download_video(self, video_id: str) -> Optional[Dict[str, Any]]:
         """
-        Transcribe audio using Whisper
-        Falls back to auto-subs if available
+        Download FULL VIDEO directly to NAS - no temp files
+        Returns paths to downloaded files
         """
-        try:
-            import whisper
-            
-            print(f"Transcribing with Whisper ({self.whisper_model})...")
-            model = whisper.load_model(self.whisper_model)
-            result = model.transcribe(audio_path)
-            
-            return result['text']
-            
-        except ImportError:
-            print("Whisper not installed. Install with: pip install openai-whisper")
-            return None
-        except Exception as e:
-            print(f"Transcription error: {e}")
+        files = self._fetch_metadata(video_id)
+        if files is None:
             return None
+        video_path = self._download_media(video_id)
+        if video_path:
+            files['video'] = video_path
+        return files
+    
+    def _save_transcript(self, video_id: str, text: str) -> str:
+        """Keep Whisper output next to the subtitle files"""
+        path = self.transcripts_dir / f"{video_id}.whisper.txt"
+        path.write_text(text, encoding='utf-8')
+        return str(path)
     
-    def _read_subtitles(self, srt_path: str) -> str:
-        """Read and clean SRT subtitle file"""
+    def _read_subtitles(self, srt_path: str) -> List[Dict[str, Any]]:
+        """Timestamped transcript segments from an SRT/VTT file (rolling auto-captions collapsed)"""
         try:
-            with open(srt_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-            
-            # Remove timestamps and numbers
-            lines = []
-            for line in content.split('\n'):
-                # Skip timestamp lines and numbers
-                if re.match(r'^\d+$', line.strip()):
-                    continue
-                if re.match(r'^\d{2}:\d{2}:\d{2}', line):
-                    continue
-                if line.strip():
-                    # Remove HTML tags
-                    line = re.sub(r'<[^>]+>', '', line)
-                    lines.append(line.strip())
-            
-            return ' '.join(lines)
-            
+            return parse_subtitles(srt_path)
         except Exception as e:
             print(f"Error reading subtitles: {e}")
-            return ''
+            return []
     
     def _get_nas_url(self, file_path: str) -> str:
         """
@@ -291,41 +308,62 @@ class YouTubeScraper:
             print(f"⚠️ Supabase upload failed, using NAS URL: {e}")
             return self._get_nas_url(file_path)
     
-    def process_video(self, video: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    def process_video(self, video: Dict[str, Any], wait: bool = True) -> Optional[Dict[str, Any]]:
         """
         Full video processing pipeline:
-        1. Download audio + thumbnail
-        2. Get transcript (auto-subs or Whisper)
+        1. Download metadata, thumbnail and subtitles (plus the video itself
+           unless transcript-first, where attach_media does it after extraction)
+        2. Get transcript (auto-subs, else Whisper on the video or an
+           audio-only download)
         3. Upload to R2
         4. Return processed data
+        
+        With wait=False a Whisper job is only queued: the record comes back
+        with an empty 'content' and a 'transcription' future for the caller
+        to resolve (see run_full_scrape).
         """
         video_id = video['id']
         
         # Check for duplicate
-        source_url = f"https://www.youtube.com/watch?v={video_id}"
+        source_url = canonicalize(video.get('url') or f"https://www.youtube.com/watch?v={video_id}")
         if self.storage.story_exists(source_url):
             return None
         
         # Download
-        files = self._download_video(video_id)
+        files = self._fetch_metadata(video_id) if self.transcript_first else self._download_video(video_id)
         if not files:
             return None
         
         # Get transcript
         transcript = ''
+        segments = []
         if files.get('subtitles'):
-            transcript = self._read_subtitles(files['subtitles'])
-        
-        if not transcript and files.get('audio'):
-            transcript = self._transcribe_audio(files['audio'])
+            segments = self._read_subtitles(files['subtitles'])
+            transcript = segments_text(segments)
         
+        transcription = None
         if not transcript:
+            files['audio'] = files.get('video') or self._download_audio(video_id)
+            if files['audio']:
+                transcription = self.transcriber.submit(files['audio'])
+        
+        if not transcript and transcription is None:
             print(f"No transcript available for {video_id}")
             return None
         
-        # Get URLs for files (already on NAS, optionally upload to Supabase CDN)
+        # Read video info
+        info = {}
+        if files.get('info'):
+            with open(files['info'], 'r') as f:
+                info = json.load(f)
+        
+        # Get URLs for files (already on NAS, optionally upload to Supabase CDN).
+        # Transcript-first defers the upload too; YouTube's own thumbnail URL
+        # stands in until the story is accepted.
         thumbnail_url = None
-        if files.get('thumbnail'):
+        if self.transcript_first:
+            thumbnail_url = info.get('thumbnail')
+        elif files.get('thumbnail'):
             thumbnail_url = self._upload_to_supabase(files['thumbnail'], video_id, 'thumbnail')
         
         # Video stays on NAS (too large for Supabase), get NAS URL
@@ -336,16 +374,11 @@ class YouTubeScraper:
             video_url = self._get_nas_url(files['video'])
             print(f"📹 Video on NAS: {nas_video_path}")
         
-        # Read video info
-        info = {}
-        if files.get('info'):
-            with open(files['info'], 'r') as f:
-                info = json.load(f)
-        
-        return {
+        record = {
             'id': video_id,
             'title': video.get('title') or info.get('title', ''),
             'content': transcript,
+            'transcript_segments': segments,  # [{start, end, text}] for quote timestamps
             'description': info.get('description', ''),
             'source_url': source_url,
             'source': 'youtube',
@@ -359,8 +392,50 @@ class YouTubeScraper:
             'nas_transcript_path': files.get('subtitles'),
             'youtube_url': source_url,
             'search_query': video.get('search_query', ''),
+            'media_pending': self.transcript_first and not nas_video_path,
             'processed_at': datetime.now().isoformat(),
         }
+        if transcription is None:
+            return record
+        record['transcription'] = transcription
+        return self.finish_transcription(record) if wait else record
+    
+    def finish_transcription(self, record: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Wait for a queued Whisper job and fill in the record's transcript (None if it failed)"""
+        future = record.pop('transcription', None)
+        if future is None:
+            return record
+        try:
+            result = future.result()
+        except Exception as e:
+            print(f"Transcription error for {record['id']}: {e}")
+            return None
+        if not result['text']:
+            print(f"No transcript available for {record['id']}")
+            return None
+        record['content'] = result['text']
+        record['nas_transcript_path'] = self._save_transcript(record['id'], result['text'])
+        return record
+    
+    def attach_media(self, video: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Transcript-first: download the video and upload the thumbnail for a
+        story that passed extraction. Returns the updated video record.
+        """
+        if not video.get('media_pending'):
+            return video
+        
+        video_path = self._download_media(video['id'])
+        if video_path:
+            video['nas_video_path'] = video_path
+            video['video_url'] = self._get_nas_url(video_path)
+            print(f"📹 Video on NAS: {video_path}")
+        
+        if video.get('nas_thumbnail_path'):
+            video['images'] = [self._upload_to_supabase(video['nas_thumbnail_path'], video['id'], 'thumbnail')]
+        
+        video['media_pending'] = False
+        return video
     
     def run_full_scrape(self, videos_per_query: int = 5) -> List[Dict[str, Any]]:
         """Run full YouTube scrape"""
@@ -371,13 +446,12 @@ class YouTubeScraper:
         print("OASARA YOUTUBE SCRAPER - DATA LIBERATION PHASE 3")
         print("=" * 60)
         
-        # Search for videos
-        for query in SEARCH_QUERIES:
-            print(f"\nSearching: '{query}'")
-            videos = self._run_ytdlp_search(query, videos_per_query)
+        # All searches run at once on the yt-dlp engine
+        print(f"\nSearching {len(SEARCH_QUERIES)} queries ({YOUTUBE_MAX_WORKERS} at a time)...")
+        for query, entries in self.engine.search_many(SEARCH_QUERIES, videos_per_query):
+            videos = self._search_entries(query, entries)
             video_queue.extend(videos)
-            print(f"  Found {len(videos)} videos")
-            time.sleep(1)
+            print(f"  '{query}': {len(videos)} videos")
         
         # Deduplicate
         seen_ids = set()
@@ -394,23 +468,44 @@ class YouTubeScraper:
         unique_videos = unique_videos[:100]
         
         print(f"\n{len(unique_videos)} unique videos to process")
+        if self.transcript_first:
+            print("Transcript-first: subtitles now, video download only for saved stories")
         
-        # Process each video
-        for video in tqdm(unique_videos, desc="Processing videos"):
-            processed = self.process_video(video)
+        # Process videos concurrently (the engine caps parallel yt-dlp jobs),
+        # streaming results to the raw archive. Videos without subtitles are
+        # queued on the Whisper service and collected after the loop, so
+        # transcription overlaps the remaining downloads.
+        archive = RawArchive(self.output_dir, 'youtube')
+        awaiting = []
+        with ThreadPoolExecutor(max_workers=YOUTUBE_MAX_WORKERS) as pool:
+            futures = [pool.submit(self.process_video, video, False) for video in unique_videos]
+            for future in tqdm(as_completed(futures), total=len(futures), desc="Processing videos"):
+                try:
+                    processed = future.result()
+                except Exception as e:
+                    print(f"❌ Error processing video: {e}")
+                    continue
+                if processed and 'transcription' in processed:
+                    awaiting.append(processed)
+                elif processed:
+                    all_videos.append(processed)
+                    archive.write(processed)
+        
+        for record in tqdm(awaiting, desc="Whisper transcription", disable=not awaiting):
+            processed = self.finish_transcription(record)
             if processed:
                 all_videos.append(processed)
-            time.sleep(2)  # Rate limiting
+                archive.write(processed)
         
         print(f"\n{'=' * 60}")
         print(f"SCRAPE COMPLETE: {len(all_videos)} videos processed")
         print(f"{'=' * 60}")
         
-        # Save raw data
-        output_file = self.output_dir / f"youtube_raw_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-        with open(output_file, 'w') as f:
-            json.dump(all_videos, f, indent=2, default=str)
-        print(f"Raw data saved to: {output_file}")
+        archive.close()
+        print(f"Raw data: {archive.summary()}")
+        print(f"yt-dlp: {self.engine.summary()}")
+        if awaiting:
+            print(f"Whisper: {self.transcriber.summary()}")
         
         return all_videos
     
@@ -426,7 +521,8 @@ class YouTubeScraper:
                 full_content = f"Title: {video['title']}\n\n"
                 if video.get('description'):
                     full_content += f"Description: {video['description'][:500]}\n\n"
-                full_content += f"Transcript:\n{video['content'][:8000]}"
+                # Full transcript - extract_story_data condenses it to the token budget
+                full_content += f"Transcript:\n{video['content']}"
                 
                 extracted = extract_story_data(
                     content=full_content,
@@ -436,10 +532,20 @@ class YouTubeScraper:
                 )
                 
                 if 'error' in extracted:
+                    if video.get('media_pending'):
+                        self._add_stats(videos_skipped=1)
                     continue
                 
+                # Only accepted stories get the full video
+                if video.get('media_pending'):
+                    video = self.attach_media(video)
+                    extracted['images'] = video.get('images', [])
+                
                 slug = self._generate_slug(extracted.get('title', video['title']))
                 
+                # Link the key quote to the moment it is said
+                quote_time = find_quote(video.get('transcript_segments') or [], extracted.get('key_quote'))
+                
                 story_record = {
                     'title': extracted.get('title', video['title'][:100]),
                     'slug': slug,
@@ -460,13 +566,21 @@ class YouTubeScraper:
                     'issues': extracted.get('issues', []),
                     'viral_score': extracted.get('viral_score', 5),
                     'key_quote': extracted.get('key_quote'),
+                    'key_quote_url': timestamp_url(video['source_url'], quote_time),
                     # Video-specific fields
                     'video_url': video.get('video_url'),  # ACTUAL VIDEO FILE
+                    'nas_video_path': video.get('nas_video_path'),  # Source for web renditions
                     'video_thumbnail_url': video.get('images', [None])[0],
                     'video_transcript': video.get('content', '')[:10000],
                     'media_urls': [video.get('video_url')] if video.get('video_url') else [],
                 }
                 
+                # Bills shown on screen: amounts from scene-change keyframes
+                if KEYFRAME_OCR_ENABLED and video.get('nas_video_path'):
+                    story_record = process_story_video(
+                        story_record, video['nas_video_path'], save_dir=str(self.bill_frames_dir)
+                    )
+                
                 self.storage.insert_story(story_record)
                 saved_count += 1
                 
@@ -476,8 +590,20 @@ class YouTubeScraper:
                 print(f"Error saving video {video['id']}: {e}")
         
         print(f"\n✅ Saved {saved_count} stories to database")
+        self.print_nas_stats()
+        print(f"yt-dlp: {self.engine.summary()}")
+        if KEYFRAME_OCR_ENABLED:
+            print(f"Keyframe OCR: {get_keyframe_scanner().summary()}")
         return saved_count
     
+    def print_nas_stats(self):
+        """NAS write volume this run (shows what transcript-first saves)"""
+        s = self.nas_stats
+        print(f"💾 NAS writes: {s['metadata_bytes'] / 1024:.0f}KB metadata/subtitles, "
+              f"{s['audio_bytes'] / 1024 / 1024:.1f}MB audio, "
+              f"{s['video_bytes'] / 1024 / 1024:.1f}MB video ({s['videos_downloaded']} downloaded"
+              + (f", {s['videos_skipped']} rejected videos never downloaded)" if self.transcript_first else ")"))
+    
     def _generate_slug(self, title: str) -> str:
         """Generate URL-friendly slug"""
         slug = title.lower()
@@ -0,0 +1,200 @@
+"""
+In-process yt-dlp engine
+Runs searches and downloads through yt-dlp's Python API on a worker pool
+instead of one `yt-dlp` subprocess per query/video, so interpreter start-up
+and extractor initialisation are paid once per process and jobs overlap:
+
+    engine = YtDlpEngine(max_workers=4)
+    for query, entries in engine.search_many(SEARCH_QUERIES, limit=5):
+        ...
+    result = engine.download(['-f', 'bestaudio', '-o', out, url], label=video_id, timeout=300)
+    result['ok'], result['bytes'], result['speed']
+
+Jobs take the same argument lists as the yt-dlp CLI (parsed with
+yt_dlp.parse_options, so behaviour matches the command line). Progress
+hooks replace stdout parsing: they count bytes and speed per video and
+enforce each job's timeout by aborting the download once its deadline
+passes. Searches have no progress callbacks; their timeout only bounds how
+long the caller waits (socket_timeout bounds a stalled connection).
+"""
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import yt_dlp
+from yt_dlp.utils import DownloadError
+
+SOCKET_TIMEOUT = 30
+
+
+class JobTimeout(Exception):
+    """Raised from a progress hook to abort a job past its deadline"""
+
+
+class _Progress:
+    """Per-job progress hook and logger: bytes, speed, errors and the deadline check"""
+
+    def __init__(self, label: str, timeout: Optional[float]):
+        self.label = label
+        self.started = time.monotonic()
+        self.deadline = self.started + timeout if timeout else None
+        self.bytes = 0       # Finished files
+        self.partial = 0     # File in progress
+        self.files = 0
+        self.timed_out = False
+        self.errors: List[str] = []
+
+    def _check(self):
+        if self.deadline and time.monotonic() > self.deadline:
+            self.timed_out = True
+            raise JobTimeout(f"{self.label}: timed out after {self.deadline - self.started:.0f}s")
+
+    # yt-dlp logger interface - keeps worker output off the console
+    def debug(self, msg: str):
+        pass
+
+    def info(self, msg: str):
+        pass
+
+    def warning(self, msg: str):
+        pass
+
+    def error(self, msg: str):
+        self.errors.append(msg)
+
+    def download_hook(self, d: Dict[str, Any]):
+        if d['status'] == 'downloading':
+            self.partial = d.get('downloaded_bytes') or 0
+        elif d['status'] == 'finished':
+            self.bytes += d.get('total_bytes') or d.get('downloaded_bytes') or self.partial
+            self.partial = 0
+            self.files += 1
+        self._check()
+
+    def postprocessor_hook(self, d: Dict[str, Any]):
+        self._check()
+
+
+class YtDlpEngine:
+    """Worker pool for yt-dlp jobs with per-job timeouts and throughput stats"""
+
+    def __init__(self, max_workers: int = 4, quiet: bool = True):
+        self.max_workers = max_workers
+        self.quiet = quiet
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='ytdlp')
+        self._lock = threading.Lock()
+        self.stats = {
+            'searches': 0,
+            'downloads': 0,
+            'ok': 0,
+            'failed': 0,
+            'timed_out': 0,
+            'bytes': 0,
+            'download_seconds': 0.0,
+        }
+
+    def _count(self, **amounts):
+        with self._lock:
+            for key, value in amounts.items():
+                self.stats[key] += value
+
+    def _options(self, args: List[str]) -> Tuple[Dict[str, Any], List[str]]:
+        parsed = yt_dlp.parse_options(args)
+        opts = dict(parsed.ydl_opts)
+        opts.setdefault('socket_timeout', SOCKET_TIMEOUT)
+        if self.quiet:
+            opts.update({'quiet': True, 'no_warnings': True, 'noprogress': True})
+        return opts, parsed.urls
+
+    # ---- Searches ---------------------------------------------------------
+
+    def _search(self, query: str, limit: int) -> List[Dict[str, Any]]:
+        opts, _ = self._options(['--flat-playlist'])
+        opts.update({'ignoreerrors': False, 'logger': _Progress(query, None)})
+        with yt_dlp.YoutubeDL(opts) as ydl:
+            info = ydl.extract_info(f'ytsearch{limit}:{query}', download=False)
+        self._count(searches=1)
+        return [entry for entry in (info or {}).get('entries') or [] if entry]
+
+    def search(self, query: str, limit: int = 10, timeout: float = 120) -> List[Dict[str, Any]]:
+        """Flat search entries (id, title, url, duration, view_count, channel, ...)"""
+        return next(self.search_many([query], limit, timeout))[1]
+
+    def search_many(
+        self, queries: Iterable[str], limit: int = 10, timeout: float = 120
+    ) -> Iterator[Tuple[str, List[Dict[str, Any]]]]:
+        """Run every query at once; yields (query, entries) in query order ([] on failure)"""
+        futures = [(query, self._pool.submit(self._search, query, limit)) for query in queries]
+        deadline = time.monotonic() + timeout
+        for query, future in futures:
+            try:
+                yield query, future.result(timeout=max(deadline - time.monotonic(), 0))
+            except FutureTimeout:
+                self._count(timed_out=1)
+                print(f"Timeout for query: {query}")
+                yield query, []
+            except Exception as e:
+                self._count(failed=1)
+                print(f"yt-dlp error for '{query}': {str(e)[:200]}")
+                yield query, []
+
+    # ---- Downloads --------------------------------------------------------
+
+    def _download(self, args: List[str], label: str, timeout: Optional[float]) -> Dict[str, Any]:
+        progress = _Progress(label, timeout)
+        opts, urls = self._options(args)
+        opts.update({
+            'progress_hooks': [progress.download_hook],
+            'postprocessor_hooks': [progress.postprocessor_hook],
+            'logger': progress,
+            'ignoreerrors': False,  # The CLI default would swallow the timeout abort
+        })
+        result = {'label': label, 'ok': False, 'error': None, 'timed_out': False}
+        try:
+            with yt_dlp.YoutubeDL(opts) as ydl:
+                result['ok'] = ydl.download(urls) == 0
+        except (JobTimeout, DownloadError) as e:
+            # Exceptions raised in hooks come back wrapped in a DownloadError
+            result['error'] = str(e)
+        except Exception as e:
+            result['error'] = str(e)
+        result['timed_out'] = progress.timed_out
+        if not result['ok'] and not result['error']:
+            result['error'] = progress.errors[-1] if progress.errors else 'yt-dlp failed'
+
+        elapsed = time.monotonic() - progress.started
+        downloaded = progress.bytes + progress.partial
+        result.update({
+            'bytes': downloaded,
+            'files': progress.files,
+            'seconds': elapsed,
+            'speed': downloaded / elapsed if elapsed > 0 else 0.0,
+        })
+        self._count(
+            downloads=1, ok=int(result['ok']), failed=int(not result['ok'] and not result['timed_out']),
+            timed_out=int(result['timed_out']), bytes=downloaded, download_seconds=elapsed
+        )
+        return result
+
+    def submit(self, args: List[str], label: str = '', timeout: Optional[float] = None):
+        """Queue a download (yt-dlp CLI arguments incl. URL); the future resolves to its result dict"""
+        return self._pool.submit(self._download, args, label or args[-1], timeout)
+
+    def download(self, args: List[str], label: str = '', timeout: Optional[float] = None) -> Dict[str, Any]:
+        """Run one download on the pool and wait for it"""
+        return self.submit(args, label, timeout).result()
+
+    def close(self):
+        self._pool.shutdown(wait=True)
+
+    # ---- Stats ------------------------------------------------------------
+
+    def summary(self) -> str:
+        s = self.stats
+        mb = s['bytes'] / 1024 / 1024
+        # Throughput per download while it ran, not wall-clock across the pool
+        speed = mb / s['download_seconds'] if s['download_seconds'] else 0.0
+        return (f"{s['searches']} searches, {s['downloads']} downloads on {self.max_workers} workers: "
+                f"{s['ok']} ok, {s['failed']} failed, {s['timed_out']} timed out; "
+                f"{mb:.1f}MB at {speed:.1f}MB/s per download")
@@ -25,6 +25,8 @@ interface Story {
   author_location?: string;
   images: string[];
   video_url?: string;
+  video_hls_url?: string;
+  video_poster_url?: string;
   bill_images: string[];
   view_count: number;
   share_count: number;
@@ -382,9 +384,12 @@ const StoryDetail: React.FC = () => {
             <video 
               controls
               preload="metadata"
-              poster={story.images?.[0]}
+              poster={story.video_poster_url || story.images?.[0]}
               className="w-full rounded-xl shadow-lg"
             >
+              {story.video_hls_url && (
+                <source src={story.video_hls_url} type="application/vnd.apple.mpegurl" />
+              )}
               <source src={story.video_url} type="video/mp4" />
               Your browser does not support the video tag.
             </video>
@@ -0,0 +1,10 @@
+-- Web renditions for story videos (scrapers/processing/renditions.py)
+-- video_url is repointed at the faststart MP4; the original download stays on NAS
+
+ALTER TABLE stories ADD COLUMN IF NOT EXISTS video_hls_url TEXT;
+ALTER TABLE stories ADD COLUMN IF NOT EXISTS video_poster_url TEXT;
+ALTER TABLE stories ADD COLUMN IF NOT EXISTS video_renditions JSONB DEFAULT '[]';
+
+COMMENT ON COLUMN stories.video_hls_url IS 'HLS master playlist (adaptive bitrate ladder) for the story video';
+COMMENT ON COLUMN stories.video_poster_url IS 'Poster frame shown before playback';
+COMMENT ON COLUMN stories.video_renditions IS 'HLS rungs: [{height, kbps, playlist}]';
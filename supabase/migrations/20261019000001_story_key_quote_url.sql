@@ -0,0 +1,6 @@
+-- Deep link to the moment a video story's key quote is said
+-- (YouTube ?t=, from subtitle segment timestamps - scrapers/utils/subtitles.py)
+
+ALTER TABLE stories ADD COLUMN IF NOT EXISTS key_quote_url TEXT;
+
+COMMENT ON COLUMN stories.key_quote_url IS 'Video URL starting at the key quote';
@@ -0,0 +1,11 @@
+-- Last rendition attempt per story video (scrapers/orchestrator.py --renditions)
+-- Failed videos (dead URLs, corrupt files) wait RENDITION_RETRY_HOURS before
+-- being picked again instead of blocking the queue
+
+ALTER TABLE stories ADD COLUMN IF NOT EXISTS video_renditions_attempted_at TIMESTAMPTZ;
+
+CREATE INDEX IF NOT EXISTS idx_stories_renditions_pending
+    ON stories (video_renditions_attempted_at NULLS FIRST)
+    WHERE video_url IS NOT NULL AND video_hls_url IS NULL;
+
+COMMENT ON COLUMN stories.video_renditions_attempted_at IS 'When web renditions were last attempted for the story video';